@@ -1,17 +1,27 @@
 from application.issue_flow.contracts import (
+    CrewOutputCache,
+    CrewRunOutput,
+    IssueComment,
+    IssueContext,
     IssueData,
     IssueFlowConfig,
     IssueFlowDependencies,
     IssueFlowResult,
+    PreflightCheckResult,
     PullRequestData,
 )
 from application.issue_flow.use_case import run_issue_flow
 
 __all__ = [
+    "CrewOutputCache",
+    "CrewRunOutput",
+    "IssueComment",
+    "IssueContext",
     "IssueData",
     "IssueFlowConfig",
     "IssueFlowDependencies",
     "IssueFlowResult",
+    "PreflightCheckResult",
     "PullRequestData",
     "run_issue_flow",
 ]
@@ -1,13 +1,27 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, TypedDict
+from typing import Callable, Protocol, TypedDict
 
-from domain.models import ChangeSet
+from domain.models import ChangePreview, ChangeSet, FileChangeStat
+from domain.payload import ContractViolationError
+
+
+class IssueComment(TypedDict):
+    author: str | None
+    body: str
 
 
 class IssueData(TypedDict, total=False):
     title: str
     body: str | None
+    # Campos opcionais preenchidos pelo loader GraphQL (uma unica ida ao GitHub).
+    labels: list[str]
+    comments: list[IssueComment]
+    default_branch: str | None
+    base_branch_exists: bool
+    branch_namespace_blocked: bool
+    issue_branches: list[str] | None
+    open_pull_requests: dict[str, str]
 
 
 class PullRequestData(TypedDict):
@@ -22,6 +36,60 @@ def _noop_observe_step(_: str, __: str, ___: str | None = None) -> None:
     return None
 
 
+def _noop_retrieve_repo_context(_: Path, __: str, ___: str) -> str:
+    return ""
+
+
+def _noop_observe_file_changes(_: list[FileChangeStat]) -> None:
+    return None
+
+
+def _noop_repository_revision(_: Path) -> str | None:
+    return None
+
+
+class CrewOutputCache(Protocol):
+    def build_key(
+        self,
+        issue_title: str,
+        issue_body: str,
+        repository_revision: str,
+        repository_tree_summary: str,
+    ) -> str: ...
+
+    def get(self, cache_key: str) -> str | None: ...
+
+    def put(self, cache_key: str, crew_output: str) -> None: ...
+
+
+@dataclass(frozen=True)
+class PreflightCheckResult:
+    name: str
+    passed: bool
+    detail: str = ""
+
+
+@dataclass(frozen=True)
+class IssueContext:
+    title: str
+    body: str
+    labels: tuple[str, ...] = ()
+    comments: tuple[IssueComment, ...] = ()
+    # None = desconhecido: o flow consulta o remoto via remote_branch_exists.
+    base_branch_exists: bool | None = None
+    issue_branches: frozenset[str] | None = None
+    open_pull_requests: tuple[tuple[str, str], ...] = ()
+
+
+@dataclass(frozen=True)
+class CrewRunOutput:
+    text: str
+    # Chave para gravar a saida aceita (original ou reparada); None quando veio do cache.
+    cache_key: str | None = None
+    # Stream abortado por violacao de contrato: `text` vazio, segue direto para o reparo.
+    contract_error: ContractViolationError | None = None
+
+
 @dataclass(frozen=True)
 class IssueFlowConfig:
     issue_number: int
@@ -30,6 +98,7 @@ class IssueFlowConfig:
     base_branch: str
     repository_directory: Path
     dry_run: bool = False
+    bypass_crew_cache: bool = False
 
 
 @dataclass(frozen=True)
@@ -39,13 +108,22 @@ class IssueFlowDependencies:
     clone_repo: Callable[[str, str, Path], None]
     git_setup: Callable[[Path], None]
     repo_tree_summary: Callable[[Path], str]
-    run_crew: Callable[[str, str, str], str]
+    run_crew: Callable[[str, str, str, str], str]
     parse_payload: Callable[[str], ChangeSet]
-    apply_files: Callable[[Path, dict[str, str]], None]
+    apply_files: Callable[[Path, dict[str, str]], list[FileChangeStat]]
     publish_changes: Callable[[Path, str, str], None]
     remote_branch_exists: Callable[[str, Path], bool]
     observe_change_set: Callable[[ChangeSet], None] = _noop_observe_change_set
     observe_step: Callable[[str, str, str | None], None] = _noop_observe_step
+    retrieve_repo_context: Callable[[Path, str, str], str] = _noop_retrieve_repo_context
+    commit_change_set: Callable[[Path, ChangeSet], list[FileChangeStat]] | None = None
+    observe_file_changes: Callable[[list[FileChangeStat]], None] = _noop_observe_file_changes
+    preview_change_set: Callable[[Path, ChangeSet], ChangePreview] | None = None
+    preflight_checks: tuple[Callable[[IssueFlowConfig], PreflightCheckResult], ...] = ()
+    repository_revision: Callable[[Path], str | None] = _noop_repository_revision
+    crew_output_cache: CrewOutputCache | None = None
+    repair_crew_output: Callable[[str, str], str | None] | None = None
+    read_repository_file: Callable[[Path, str], str | None] | None = None
 
 
 @dataclass(frozen=True)
@@ -57,3 +135,4 @@ class IssueFlowResult:
     pr_title: str | None = None
     pr_url: str | None = None
     error: str | None = None
+    preview: ChangePreview | None = None
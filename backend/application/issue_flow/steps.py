@@ -1,21 +1,100 @@
-from domain.models import ChangeSet
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from typing import Callable
+
+from domain.models import ChangePreview, ChangeSet, FileChangeStat
+from domain.payload import ContractViolationError, apply_patch
+from domain.payload.errors import contract_error as build_contract_error
 
 from application.issue_flow.contracts import (
+    CrewRunOutput,
+    IssueContext,
     IssueFlowConfig,
     IssueFlowDependencies,
     IssueFlowResult,
+    PreflightCheckResult,
 )
 
 
+# Limite de sufixos testados quando a branch gerada pela IA ja existe no remoto.
+MAX_BRANCH_NAME_SUFFIX = 20
+# Comentarios recentes da issue repassados ao crew (cada um truncado).
+MAX_ISSUE_COMMENTS_FOR_CREW = 5
+MAX_ISSUE_COMMENT_CHARS = 1500
+
+
+def _run_preflight_check(
+    check: Callable[[IssueFlowConfig], PreflightCheckResult],
+    config: IssueFlowConfig,
+) -> PreflightCheckResult:
+    try:
+        return check(config)
+    except Exception as error:
+        check_name = getattr(check, "__name__", type(check).__name__)
+        return PreflightCheckResult(name=check_name, passed=False, detail=str(error))
+
+
+def start_preflight_checks(
+    config: IssueFlowConfig,
+    dependencies: IssueFlowDependencies,
+    executor: ThreadPoolExecutor,
+) -> list[Future[PreflightCheckResult]]:
+    # Dispara todas as verificacoes em paralelo; cada uma leva uma copia do contexto (request_id).
+    return [
+        executor.submit(contextvars.copy_context().run, _run_preflight_check, check, config)
+        for check in dependencies.preflight_checks
+    ]
+
+
+def ensure_preflight_passed(preflight_futures: list[Future[PreflightCheckResult]]) -> str:
+    # Aborta antes do crew se qualquer verificacao falhar, listando todas as falhas de uma vez.
+    results = [future.result() for future in preflight_futures]
+    failures = [f"{result.name}: {result.detail}" for result in results if not result.passed]
+    if failures:
+        raise RuntimeError(f"Preflight failed: {'; '.join(failures)}")
+    return f"checks_count={len(results)}"
+
+
 def load_issue_context(
     config: IssueFlowConfig,
     dependencies: IssueFlowDependencies,
-) -> tuple[str, str]:
-    # Busca titulo/corpo da issue no provider (GitHub) e normaliza body vazio.
+) -> IssueContext:
+    # Busca a issue no provider (GitHub) e normaliza body vazio; metadados extras sao opcionais.
     issue_data = dependencies.get_issue(config.issue_number)
-    issue_title = issue_data["title"]
-    issue_body = issue_data.get("body") or ""
-    return issue_title, issue_body
+    issue_branches = issue_data.get("issue_branches")
+    return IssueContext(
+        title=issue_data["title"],
+        body=issue_data.get("body") or "",
+        labels=tuple(issue_data.get("labels", ())),
+        comments=tuple(issue_data.get("comments", ())),
+        base_branch_exists=issue_data.get("base_branch_exists"),
+        issue_branches=frozenset(issue_branches) if issue_branches is not None else None,
+        open_pull_requests=tuple(sorted(issue_data.get("open_pull_requests", {}).items())),
+    )
+
+
+def describe_issue_context(issue_context: IssueContext) -> str:
+    return (
+        f"labels_count={len(issue_context.labels)} "
+        f"comments_count={len(issue_context.comments)} "
+        f"open_pull_requests={len(issue_context.open_pull_requests)}"
+    )
+
+
+def compose_crew_issue_body(issue_context: IssueContext) -> str:
+    # Labels e comentarios recentes entram no corpo enviado ao crew como contexto adicional.
+    sections = [issue_context.body]
+    if issue_context.labels:
+        sections.append(f"Labels: {', '.join(issue_context.labels)}")
+    recent_comments = issue_context.comments[-MAX_ISSUE_COMMENTS_FOR_CREW:]
+    if recent_comments:
+        comment_lines = [
+            f"- @{comment['author'] or 'ghost'}: {comment['body'][:MAX_ISSUE_COMMENT_CHARS]}"
+            for comment in recent_comments
+        ]
+        sections.append("Recent comments:\n" + "\n".join(comment_lines))
+    return "\n\n".join(section for section in sections if section)
 
 
 def prepare_repository(
@@ -36,23 +115,151 @@ def generate_crew_output(
     issue_body: str,
     config: IssueFlowConfig,
     dependencies: IssueFlowDependencies,
-) -> str:
+) -> CrewRunOutput:
     # Resume a arvore de arquivos para contexto da IA e executa o crew multiagente.
     repository_tree_summary = dependencies.repo_tree_summary(config.repository_directory)
-    return dependencies.run_crew(issue_title, issue_body, repository_tree_summary)
+    # Seleciona arquivos/trechos relevantes para a issue, dentro do orcamento de tokens.
+    repository_context = dependencies.retrieve_repo_context(
+        config.repository_directory,
+        issue_title,
+        issue_body,
+    )
+    # Cache por conteudo: mesma issue sobre o mesmo commit (ex.: dry run e depois run real)
+    # reaproveita a saida do crew em vez de pagar o pipeline de novo.
+    crew_output_cache = dependencies.crew_output_cache
+    cache_key = None
+    if crew_output_cache is not None:
+        repository_revision = dependencies.repository_revision(config.repository_directory)
+        if repository_revision:
+            cache_key = crew_output_cache.build_key(
+                issue_title,
+                issue_body,
+                repository_revision,
+                repository_tree_summary,
+            )
+    if cache_key is not None and not config.bypass_crew_cache:
+        cached_crew_output = crew_output_cache.get(cache_key)
+        if cached_crew_output is not None:
+            return CrewRunOutput(text=cached_crew_output)
+
+    # A gravacao no cache fica para parse_change_set: so entra saida aceita pelo contrato
+    # completo (inclusive patches aplicados), ja reparada quando preciso.
+    try:
+        crew_output_text = dependencies.run_crew(
+            issue_title,
+            issue_body,
+            repository_tree_summary,
+            repository_context,
+        )
+    except ContractViolationError as error:
+        # Stream abortado por violacao de contrato: segue direto para o reparo do payload.
+        if dependencies.repair_crew_output is None:
+            raise
+        return CrewRunOutput(text="", cache_key=cache_key, contract_error=error)
+    return CrewRunOutput(text=crew_output_text, cache_key=cache_key)
+
+
+def apply_change_set_patches(
+    config: IssueFlowConfig,
+    dependencies: IssueFlowDependencies,
+    change_set: ChangeSet,
+) -> ChangeSet:
+    # Patches viram conteudo completo sobre o arquivo atual; o restante do fluxo so ve `files`.
+    # Arquivo que tambem veio com conteudo completo usa esse conteudo (fallback sem patch).
+    pending_patches = {
+        path: patch_text
+        for path, patch_text in change_set.patches.items()
+        if path not in change_set.files
+    }
+    if not pending_patches:
+        return replace(change_set, patches={})
+    if dependencies.read_repository_file is None:
+        raise build_contract_error(
+            "patches are not supported in this workflow; send FULL file contents in 'files'"
+        )
+
+    patched_files = {
+        path: apply_patch(
+            path,
+            dependencies.read_repository_file(config.repository_directory, path),
+            patch_text,
+        )
+        for path, patch_text in pending_patches.items()
+    }
+    return replace(change_set, files={**change_set.files, **patched_files}, patches={})
 
 
 def parse_change_set(
-    crew_output_text: str,
+    crew_output: CrewRunOutput,
+    config: IssueFlowConfig,
     dependencies: IssueFlowDependencies,
 ) -> ChangeSet:
     # Converte texto da IA para ChangeSet validado e publica observabilidade do pacote gerado.
-    change_set = dependencies.parse_payload(crew_output_text)
+    # Violacao de contrato passa pelo reparo (local e depois so o Git Integrator), nao pelo crew.
+    crew_output_text = crew_output.text
+    contract_error = crew_output.contract_error
+    original_contract_error = contract_error
+    repair_attempt = 0
+    while True:
+        if contract_error is None:
+            try:
+                change_set = apply_change_set_patches(
+                    config,
+                    dependencies,
+                    dependencies.parse_payload(crew_output_text),
+                )
+                break
+            except ContractViolationError as error:
+                contract_error = error
+                original_contract_error = original_contract_error or error
+        if dependencies.repair_crew_output is None:
+            raise contract_error
+
+        repair_attempt += 1
+        dependencies.observe_step(
+            "repair_payload",
+            "start",
+            detail=f"attempt={repair_attempt}: {contract_error}",
+        )
+        repaired_output_text = dependencies.repair_crew_output(
+            crew_output_text,
+            str(contract_error),
+        )
+        if repaired_output_text is None:
+            # Tentativas esgotadas: registra o ultimo erro e devolve o erro de contrato original.
+            dependencies.observe_step(
+                "repair_payload",
+                "error",
+                detail=f"attempt={repair_attempt}: repair exhausted; last error: {contract_error}",
+            )
+            raise original_contract_error
+        crew_output_text = repaired_output_text
+        contract_error = None
+
+    if repair_attempt > 0:
+        dependencies.observe_step("repair_payload", "success", detail=f"attempt={repair_attempt}")
+    # Cache so recebe saida aceita (patches ja aplicados); reparada, evita novo crew + reparo.
+    if crew_output.cache_key is not None and dependencies.crew_output_cache is not None:
+        dependencies.crew_output_cache.put(crew_output.cache_key, crew_output_text)
     dependencies.observe_change_set(change_set)
     return change_set
 
 
-def build_dry_run_result(change_set: ChangeSet) -> IssueFlowResult:
+def build_change_preview(
+    config: IssueFlowConfig,
+    dependencies: IssueFlowDependencies,
+    change_set: ChangeSet,
+) -> ChangePreview | None:
+    # Diff do ChangeSet contra a base, para revisar o dry run sem publicar nada.
+    if dependencies.preview_change_set is None:
+        return None
+    return dependencies.preview_change_set(config.repository_directory, change_set)
+
+
+def build_dry_run_result(
+    change_set: ChangeSet,
+    preview: ChangePreview | None = None,
+) -> IssueFlowResult:
     # Resposta padrao para execucao sem escrita em repo remoto (sem push/PR).
     return IssueFlowResult(
         status="dry_run",
@@ -61,6 +268,7 @@ def build_dry_run_result(change_set: ChangeSet) -> IssueFlowResult:
         commit=change_set.commit,
         pr_title=change_set.pr_title,
         pr_url=None,
+        preview=preview,
     )
 
 
@@ -81,23 +289,89 @@ def build_success_result(
     )
 
 
+def _branch_exists(
+    branch: str,
+    config: IssueFlowConfig,
+    dependencies: IssueFlowDependencies,
+    issue_context: IssueContext | None,
+) -> bool:
+    # O snapshot do loader e anterior ao crew: so descarta nomes ja ocupados. O nome escolhido
+    # e sempre confirmado no remoto (outro run da mesma issue pode ter publicado nesse meio tempo).
+    if issue_context is not None and issue_context.issue_branches is not None:
+        if branch in issue_context.issue_branches:
+            return True
+    return dependencies.remote_branch_exists(branch, config.repository_directory)
+
+
+def reserve_branch_name(
+    config: IssueFlowConfig,
+    dependencies: IssueFlowDependencies,
+    change_set: ChangeSet,
+    issue_context: IssueContext | None = None,
+) -> ChangeSet:
+    # Detecta colisao da branch gerada antes do push e escolhe um sufixo livre (-2, -3, ...).
+    if not _branch_exists(change_set.branch, config, dependencies, issue_context):
+        return change_set
+
+    for suffix in range(2, MAX_BRANCH_NAME_SUFFIX + 1):
+        candidate_branch = f"{change_set.branch}-{suffix}"
+        if not _branch_exists(candidate_branch, config, dependencies, issue_context):
+            return replace(change_set, branch=candidate_branch)
+
+    raise RuntimeError(f"Branch name collision: no free name available for '{change_set.branch}'")
+
+
 def publish_repository_changes(
     config: IssueFlowConfig,
     dependencies: IssueFlowDependencies,
     change_set: ChangeSet,
-) -> None:
-    # Aplica arquivos no repositorio clonado e publica commit/branch no remoto.
-    dependencies.apply_files(config.repository_directory, change_set.files)
-    dependencies.publish_changes(config.repository_directory, change_set.branch, change_set.commit)
+) -> list[FileChangeStat]:
+    # Quando disponivel, cria o commit direto do ChangeSet (sem tocar o working tree) e publica.
+    if dependencies.commit_change_set is not None:
+        file_changes = dependencies.commit_change_set(config.repository_directory, change_set)
+        dependencies.observe_file_changes(file_changes)
+        return file_changes
+
+    # Caso contrario, aplica arquivos no repositorio clonado e publica commit/branch no remoto.
+    file_changes = dependencies.apply_files(config.repository_directory, change_set.files)
+    dependencies.observe_file_changes(file_changes)
+    if has_file_changes(file_changes):
+        dependencies.publish_changes(
+            config.repository_directory,
+            change_set.branch,
+            change_set.commit,
+        )
+    return file_changes
+
+
+def has_file_changes(file_changes: list[FileChangeStat]) -> bool:
+    return any(file_change.status != "unchanged" for file_change in file_changes)
+
+
+def build_no_changes_result(change_set: ChangeSet) -> IssueFlowResult:
+    # Conteudo gerado identico a base: nada foi commitado, publicado ou aberto como PR.
+    return build_success_result(
+        change_set,
+        message="No file changes to publish: generated content matches the base branch",
+        pr_url=None,
+    )
 
 
 def build_pr_or_branch_result(
     config: IssueFlowConfig,
     dependencies: IssueFlowDependencies,
     change_set: ChangeSet,
+    issue_context: IssueContext | None = None,
 ) -> IssueFlowResult:
+    base_branch_exists = issue_context.base_branch_exists if issue_context is not None else None
+    if base_branch_exists is None:
+        base_branch_exists = dependencies.remote_branch_exists(
+            config.base_branch,
+            config.repository_directory,
+        )
+
     # Se a base nao existir no remoto, finaliza sem PR (somente branch publicada).
-    if not dependencies.remote_branch_exists(config.base_branch, config.repository_directory):
+    if not base_branch_exists:
         return build_success_result(
             change_set,
             message=f"Branch pushed successfully: {change_set.branch}",
@@ -111,8 +385,14 @@ def build_pr_or_branch_result(
         title=change_set.pr_title,
         body=change_set.pr_body,
     )
+    message = "PR created successfully"
+    # A branch reservada e sempre nova (sufixo livre); PRs abertos de outras branches da
+    # mesma issue (snapshot do loader) ficam sinalizados para revisao manual.
+    open_pull_requests = dict(issue_context.open_pull_requests) if issue_context else {}
+    if open_pull_requests:
+        message += f" (other open PRs for this issue: {', '.join(open_pull_requests.values())})"
     return build_success_result(
         change_set,
-        message="PR created successfully",
+        message=message,
         pr_url=pull_request["html_url"],
     )
@@ -1,16 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from application.issue_flow.contracts import (
     IssueFlowConfig,
     IssueFlowDependencies,
     IssueFlowResult,
 )
 from application.issue_flow.steps import (
+    build_change_preview,
     build_dry_run_result,
+    build_no_changes_result,
     build_pr_or_branch_result,
+    compose_crew_issue_body,
+    describe_issue_context,
+    ensure_preflight_passed,
     generate_crew_output,
+    has_file_changes,
     load_issue_context,
     parse_change_set,
     prepare_repository,
     publish_repository_changes,
+    reserve_branch_name,
+    start_preflight_checks,
 )
 
 
@@ -21,20 +31,44 @@ def run_issue_flow(
     raise_on_error: bool = True,
 ) -> IssueFlowResult:
     try:
-        dependencies.observe_step("load_issue", "start")
-        issue_title, issue_body = load_issue_context(config, dependencies)
-        dependencies.observe_step("load_issue", "success")
+        # Preflight roda em paralelo com a leitura da issue e bloqueia antes do clone/crew.
+        with ThreadPoolExecutor(
+            max_workers=max(len(dependencies.preflight_checks), 1),
+            thread_name_prefix="preflight",
+        ) as preflight_executor:
+            dependencies.observe_step("preflight", "start")
+            preflight_futures = start_preflight_checks(config, dependencies, preflight_executor)
+
+            dependencies.observe_step("load_issue", "start")
+            issue_context = load_issue_context(config, dependencies)
+            dependencies.observe_step(
+                "load_issue",
+                "success",
+                detail=describe_issue_context(issue_context),
+            )
+
+            preflight_detail = ensure_preflight_passed(preflight_futures)
+            dependencies.observe_step("preflight", "success", detail=preflight_detail)
 
         dependencies.observe_step("prepare_repo", "start")
         prepare_repository(config, dependencies)
         dependencies.observe_step("prepare_repo", "success")
 
         dependencies.observe_step("run_crew", "start")
-        crew_output_text = generate_crew_output(issue_title, issue_body, config, dependencies)
-        dependencies.observe_step("run_crew", "success")
+        crew_output = generate_crew_output(
+            issue_context.title,
+            compose_crew_issue_body(issue_context),
+            config,
+            dependencies,
+        )
+        dependencies.observe_step(
+            "run_crew",
+            "success",
+            detail="aborted early: contract violation" if crew_output.contract_error else None,
+        )
 
         dependencies.observe_step("validate_payload", "start")
-        change_set = parse_change_set(crew_output_text, dependencies)
+        change_set = parse_change_set(crew_output, config, dependencies)
         dependencies.observe_step(
             "validate_payload",
             "success",
@@ -47,15 +81,25 @@ def run_issue_flow(
                 "success",
                 detail="skipped (dry_run=true)",
             )
+            preview = build_change_preview(config, dependencies, change_set)
             dependencies.observe_step("finalize", "success", detail="dry_run completed")
-            return build_dry_run_result(change_set)
+            return build_dry_run_result(change_set, preview)
 
         dependencies.observe_step("publish_branch", "start")
-        publish_repository_changes(config, dependencies, change_set)
+        change_set = reserve_branch_name(config, dependencies, change_set, issue_context)
+        file_changes = publish_repository_changes(config, dependencies, change_set)
+        if not has_file_changes(file_changes):
+            dependencies.observe_step(
+                "publish_branch",
+                "success",
+                detail="skipped (no file changes)",
+            )
+            dependencies.observe_step("finalize", "success", detail="no file changes")
+            return build_no_changes_result(change_set)
         dependencies.observe_step("publish_branch", "success", detail=change_set.branch)
 
         dependencies.observe_step("finalize", "start")
-        result = build_pr_or_branch_result(config, dependencies, change_set)
+        result = build_pr_or_branch_result(config, dependencies, change_set, issue_context)
         dependencies.observe_step("finalize", "success", detail=result.message)
         return result
     except Exception as error:
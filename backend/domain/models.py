@@ -1,4 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Literal
+
+
+FileChangeStatus = Literal["created", "modified", "unchanged"]
 
 
 @dataclass(frozen=True)
@@ -8,3 +12,27 @@ class ChangeSet:
     commit: str
     pr_title: str
     pr_body: str
+    # Patches {path: unified diff ou blocos SEARCH/REPLACE} ainda nao aplicados sobre o checkout.
+    patches: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class FileChangeStat:
+    path: str
+    status: FileChangeStatus
+    size_bytes: int
+
+
+@dataclass(frozen=True)
+class FileDiffStat:
+    path: str
+    status: FileChangeStatus
+    additions: int
+    deletions: int
+
+
+@dataclass(frozen=True)
+class ChangePreview:
+    diff: str
+    files: tuple[FileDiffStat, ...]
+    truncated: bool = False
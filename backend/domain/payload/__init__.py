@@ -1,10 +1,15 @@
 from domain.payload.errors import CONTRACT_ERROR_PREFIX, ContractViolationError
 from domain.payload.extractor import extract_first_json_object
 from domain.payload.parser import parse_payload
+from domain.payload.patch_engine import apply_patch
+from domain.payload.stream_scanner import IncrementalPayloadScanner, PayloadScanEvent
 
 __all__ = [
+    "apply_patch",
     "CONTRACT_ERROR_PREFIX",
     "ContractViolationError",
     "extract_first_json_object",
+    "IncrementalPayloadScanner",
     "parse_payload",
+    "PayloadScanEvent",
 ]
@@ -0,0 +1,6 @@
+# Convencao de branch pedida ao Git Integrator: `feature/issue-<n>-slug`.
+GENERATED_BRANCH_NAMESPACE = "feature"
+
+
+def issue_branch_prefix(issue_number: int) -> str:
+    return f"{GENERATED_BRANCH_NAMESPACE}/issue-{issue_number}-"
@@ -4,6 +4,7 @@ from domain.payload.extractor import extract_first_json_object
 from domain.payload.validators import (
     validate_files_map,
     validate_non_empty_string_field,
+    validate_patches_map,
     validate_required_keys,
 )
 
@@ -19,8 +20,10 @@ def parse_payload(text: str) -> ChangeSet:
     # Garante existencia das chaves obrigatorias do contrato de integracao.
     validate_required_keys(payload_data)
 
+    # Patches opcionais (formato validado aqui, aplicados depois sobre o checkout).
+    patches_map = validate_patches_map(payload_data.get("patches", {}))
     # Valida mapa de arquivos (tipo, conteudo e politica de path).
-    files_map = validate_files_map(payload_data["files"])
+    files_map = validate_files_map(payload_data.get("files", {}), allow_empty=bool(patches_map))
     # Valida campos textuais obrigatorios de metadados do git/PR.
     branch = validate_non_empty_string_field(payload_data, "branch")
     commit = validate_non_empty_string_field(payload_data, "commit")
@@ -34,4 +37,5 @@ def parse_payload(text: str) -> ChangeSet:
         commit=commit,
         pr_title=pr_title,
         pr_body=pr_body,
+        patches=patches_map,
     )
@@ -0,0 +1,281 @@
+import re
+from dataclasses import dataclass
+
+from domain.payload.errors import contract_error
+
+
+# Linhas de contexto que podem ser descartadas nas bordas de um hunk (como o fuzz do GNU patch).
+MAX_CONTEXT_FUZZ = 2
+
+_SEARCH_MARKER_PATTERN = re.compile(r"^<{5,9} ?SEARCH\s*$")
+_DIVIDER_MARKER_PATTERN = re.compile(r"^={5,9}\s*$")
+_REPLACE_MARKER_PATTERN = re.compile(r"^>{5,9} ?REPLACE\s*$")
+_HUNK_HEADER_PATTERN = re.compile(r"^@@ -(\d+)(?:,\d+)? \+\d+(?:,\d+)? @@")
+
+
+@dataclass(frozen=True)
+class PatchHunk:
+    old_lines: tuple[str, ...]
+    new_lines: tuple[str, ...]
+    # Inicio esperado (0-based) no arquivo original; None para blocos SEARCH/REPLACE.
+    old_start: int | None = None
+    leading_context: int = 0
+    trailing_context: int = 0
+
+
+def _split_lines(text: str) -> tuple[list[str], list[str]]:
+    # Quebra so em "\n" (splitlines tambem quebra em \x0c, \x1c-\x1e, \x85, \u2028...) e
+    # devolve o terminador de cada linha ("\n", "\r\n" ou "" na ultima sem quebra).
+    raw_lines = text.split("\n")
+    lines: list[str] = []
+    endings: list[str] = []
+    for raw_line in raw_lines[:-1]:
+        if raw_line.endswith("\r"):
+            lines.append(raw_line[:-1])
+            endings.append("\r\n")
+        else:
+            lines.append(raw_line)
+            endings.append("\n")
+    if raw_lines[-1]:
+        lines.append(raw_lines[-1])
+        endings.append("")
+    return lines, endings
+
+
+def _strip_code_fence(patch_text: str) -> list[str]:
+    lines, _endings = _split_lines(patch_text)
+    if lines and lines[0].startswith("```"):
+        lines = lines[1:]
+    if lines and lines[-1].startswith("```"):
+        lines = lines[:-1]
+    return lines
+
+
+def _parse_search_replace(path: str, lines: list[str]) -> list[PatchHunk]:
+    hunks: list[PatchHunk] = []
+    section = None
+    search_lines: list[str] = []
+    replace_lines: list[str] = []
+    for line in lines:
+        if section is None:
+            if _SEARCH_MARKER_PATTERN.match(line):
+                section, search_lines, replace_lines = "search", [], []
+        elif section == "search":
+            if _DIVIDER_MARKER_PATTERN.match(line):
+                section = "replace"
+            else:
+                search_lines.append(line)
+        elif _REPLACE_MARKER_PATTERN.match(line):
+            hunks.append(PatchHunk(old_lines=tuple(search_lines), new_lines=tuple(replace_lines)))
+            section = None
+        else:
+            replace_lines.append(line)
+    if section is not None:
+        raise contract_error(f"patch for '{path}' has an unterminated SEARCH/REPLACE block")
+    return hunks
+
+
+def _close_hunk(hunk_lines: list[tuple[str, str]], old_start: int) -> PatchHunk:
+    leading_context = 0
+    while leading_context < len(hunk_lines) and hunk_lines[leading_context][0] == " ":
+        leading_context += 1
+    trailing_context = 0
+    while (
+        trailing_context < len(hunk_lines) - leading_context
+        and hunk_lines[-1 - trailing_context][0] == " "
+    ):
+        trailing_context += 1
+    old_lines = tuple(text for kind, text in hunk_lines if kind in " -")
+    return PatchHunk(
+        old_lines=old_lines,
+        new_lines=tuple(text for kind, text in hunk_lines if kind in " +"),
+        # "@@ -N,0" insere apos a linha N; nos demais N e a primeira linha (1-based) do hunk.
+        old_start=old_start if old_lines == () else max(old_start - 1, 0),
+        leading_context=leading_context,
+        trailing_context=trailing_context,
+    )
+
+
+def _parse_unified_diff(lines: list[str]) -> list[PatchHunk]:
+    hunks: list[PatchHunk] = []
+    hunk_lines: list[tuple[str, str]] | None = None
+    old_start = 0
+    for line in lines:
+        header_match = _HUNK_HEADER_PATTERN.match(line)
+        if header_match:
+            if hunk_lines is not None:
+                hunks.append(_close_hunk(hunk_lines, old_start))
+            hunk_lines = []
+            old_start = int(header_match.group(1))
+        elif hunk_lines is None or line.startswith("\\"):
+            # Cabecalhos antes do primeiro hunk e "\ No newline at end of file".
+            continue
+        elif line[:1] in {" ", "-", "+"}:
+            hunk_lines.append((line[0], line[1:]))
+        else:
+            # Linha de contexto vazia costuma perder o espaco inicial na geracao.
+            hunk_lines.append((" ", line))
+    if hunk_lines is not None:
+        hunks.append(_close_hunk(hunk_lines, old_start))
+    return hunks
+
+
+def parse_patch(path: str, patch_text: str) -> list[PatchHunk]:
+    lines = _strip_code_fence(patch_text)
+    if any(_SEARCH_MARKER_PATTERN.match(line) for line in lines):
+        hunks = _parse_search_replace(path, lines)
+    elif any(_HUNK_HEADER_PATTERN.match(line) for line in lines):
+        hunks = _parse_unified_diff(lines)
+    else:
+        raise contract_error(
+            f"patch for '{path}' must be a unified diff (@@ hunks) or SEARCH/REPLACE blocks"
+        )
+    if not hunks:
+        raise contract_error(f"patch for '{path}' contains no hunks")
+    return hunks
+
+
+def _leading_whitespace(line: str) -> str:
+    return line[: len(line) - len(line.lstrip())]
+
+
+def _reindent(
+    new_lines: tuple[str, ...],
+    matched_lines: list[str],
+    old_lines: tuple[str, ...],
+) -> list[str]:
+    # Match ignorando indentacao: aplica ao trecho novo o mesmo deslocamento do arquivo real.
+    for matched_line, old_line in zip(matched_lines, old_lines):
+        if old_line.strip():
+            file_indent = _leading_whitespace(matched_line)
+            patch_indent = _leading_whitespace(old_line)
+            break
+    else:
+        return list(new_lines)
+
+    reindented_lines = []
+    for new_line in new_lines:
+        if new_line.strip() and new_line.startswith(patch_indent):
+            new_line = file_indent + new_line[len(patch_indent) :]
+        reindented_lines.append(new_line)
+    return reindented_lines
+
+
+def _find_block(
+    lines: list[str],
+    old_lines: tuple[str, ...],
+    expected_start: int,
+    cursor: int,
+) -> tuple[int, str] | None:
+    # Exato, depois sem espacos a direita, depois sem indentacao; preferindo o trecho
+    # apos o hunk anterior e mais proximo da posicao esperada.
+    block_size = len(old_lines)
+    for mode, normalize in (
+        ("exact", lambda line: line),
+        ("rstrip", str.rstrip),
+        ("strip", str.strip),
+    ):
+        expected_block = [normalize(line) for line in old_lines]
+        normalized_lines = [normalize(line) for line in lines]
+        candidates = [
+            start
+            for start in range(len(lines) - block_size + 1)
+            if normalized_lines[start] == expected_block[0]
+            and normalized_lines[start : start + block_size] == expected_block
+        ]
+        if candidates:
+            best_start = min(
+                candidates,
+                key=lambda start: (start < cursor, abs(start - expected_start)),
+            )
+            return best_start, mode
+    return None
+
+
+def _apply_hunk(
+    lines: list[str],
+    hunk: PatchHunk,
+    expected_start: int,
+    cursor: int,
+) -> tuple[int, int, list[str], int] | None:
+    # Retorna (inicio, fim, linhas novas, linhas de contexto final descartadas pelo fuzz).
+    for fuzz in range(MAX_CONTEXT_FUZZ + 1):
+        leading_trim = min(fuzz, hunk.leading_context)
+        trailing_trim = min(fuzz, hunk.trailing_context)
+        if fuzz and not (leading_trim or trailing_trim):
+            break
+        old_lines = hunk.old_lines[leading_trim : len(hunk.old_lines) - trailing_trim]
+        new_lines = hunk.new_lines[leading_trim : len(hunk.new_lines) - trailing_trim]
+        if not old_lines:
+            break
+        found_block = _find_block(lines, old_lines, expected_start + leading_trim, cursor)
+        if found_block is None:
+            continue
+        block_start, match_mode = found_block
+        block_end = block_start + len(old_lines)
+        replacement_lines = (
+            _reindent(new_lines, lines[block_start:block_end], old_lines)
+            if match_mode == "strip"
+            else list(new_lines)
+        )
+        return block_start, block_end, replacement_lines, trailing_trim
+    return None
+
+
+def apply_patch(path: str, original_content: str | None, patch_text: str) -> str:
+    # Aplica os hunks em ordem sobre o conteudo atual; falha vira erro de contrato (reparavel).
+    hunks = parse_patch(path, patch_text)
+    if original_content is None and any(hunk.old_lines for hunk in hunks):
+        raise contract_error(
+            f"patch for '{path}' edits a file that does not exist; "
+            "send its FULL content in 'files' instead"
+        )
+
+    lines, endings = _split_lines(original_content or "")
+    # Linhas novas herdam o terminador do trecho que substituem; o resto do arquivo fica intacto.
+    default_newline = next((ending for ending in endings if ending), "\n")
+    cursor = 0
+    line_offset = 0
+    for hunk_number, hunk in enumerate(hunks, start=1):
+        expected_start = cursor if hunk.old_start is None else hunk.old_start + line_offset
+        if not hunk.old_lines:
+            if hunk.old_start is None and lines:
+                raise contract_error(
+                    f"patch for '{path}': empty SEARCH block is only allowed for new files"
+                )
+            insert_at = min(max(expected_start, 0), len(lines))
+            new_endings = [default_newline] * len(hunk.new_lines)
+            if insert_at == len(lines) and endings and endings[-1] == "" and new_endings:
+                # Insercao apos a ultima linha sem quebra: a quebra final continua ausente.
+                endings[-1] = default_newline
+                new_endings[-1] = ""
+            lines[insert_at:insert_at] = hunk.new_lines
+            endings[insert_at:insert_at] = new_endings
+            cursor = insert_at + len(hunk.new_lines)
+            line_offset += len(hunk.new_lines)
+            continue
+
+        applied_hunk = _apply_hunk(lines, hunk, expected_start, cursor)
+        if applied_hunk is None:
+            raise contract_error(
+                f"patch for '{path}' does not apply: hunk {hunk_number} "
+                f"(starting {hunk.old_lines[0].strip()[:80]!r}) not found in the current file; "
+                "copy the original lines verbatim or send the FULL content in 'files'"
+            )
+        block_start, block_end, replacement_lines, trailing_trim = applied_hunk
+        block_endings = endings[block_start:block_end]
+        block_newline = next((ending for ending in block_endings if ending), default_newline)
+        new_endings = [block_newline] * len(replacement_lines)
+        if block_endings[-1] == "" and new_endings:
+            new_endings[-1] = ""
+        elif block_endings[-1] == "" and block_start > 0:
+            # Bloco final removido: a linha anterior passa a ser a ultima, sem quebra.
+            endings[block_start - 1] = ""
+        lines[block_start:block_end] = replacement_lines
+        endings[block_start:block_end] = new_endings
+        cursor = block_start + len(replacement_lines)
+        if hunk.old_start is not None:
+            # Deslocamento real (inclui hunk achado longe do esperado) posiciona os proximos.
+            line_offset = cursor + trailing_trim - hunk.old_start - len(hunk.old_lines)
+
+    return "".join(line + ending for line, ending in zip(lines, endings))
@@ -0,0 +1,186 @@
+import json
+from dataclasses import dataclass, field
+
+from domain.payload.errors import contract_error
+from domain.payload.path_policy import validate_file_path
+
+
+# Campos curtos de metadados cujo valor vale reportar assim que chega.
+SCANNED_METADATA_FIELDS = {"branch", "commit", "pr_title"}
+# Mapas {path: texto}: conteudo completo ou patch.
+SCANNED_FILE_MAP_FIELDS = {"files", "patches"}
+_WHITESPACE = " \t\r\n"
+
+
+@dataclass(frozen=True)
+class PayloadScanEvent:
+    kind: str
+    name: str | None = None
+    value: str | None = None
+    size: int | None = None
+
+
+@dataclass
+class _Frame:
+    container: str
+    role: str = "other"
+    state: str = "key"
+    key: str | None = None
+
+
+@dataclass
+class _StringState:
+    purpose: str
+    capture: bool
+    raw_chars: list[str] = field(default_factory=list)
+    length: int = 0
+    escaped: bool = False
+
+
+class IncrementalPayloadScanner:
+    # Reconhece a estrutura {files, patches, branch, commit, ...} conforme o texto chega em pedacos.
+    # Viola o contrato cedo (path fora do escopo, conteudo nao textual) sem esperar o JSON inteiro.
+    def __init__(self) -> None:
+        self._stack: list[_Frame] = []
+        self._string: _StringState | None = None
+        self.completed = False
+        self.files_count = 0
+
+    def feed(self, text_chunk: str) -> list[PayloadScanEvent]:
+        events: list[PayloadScanEvent] = []
+        for character in text_chunk:
+            if self.completed:
+                break
+            self._consume(character, events)
+        return events
+
+    def _reset(self) -> None:
+        # Texto que nao e JSON (prosa com "{"): volta a procurar o inicio do objeto.
+        self._stack.clear()
+        self._string = None
+
+    def _consume(self, character: str, events: list[PayloadScanEvent]) -> None:
+        if self._string is not None:
+            self._consume_string(character, events)
+            return
+        if not self._stack:
+            if character == "{":
+                self._stack.append(_Frame(container="{", role="root"))
+            return
+        if character in _WHITESPACE:
+            return
+
+        frame = self._stack[-1]
+        if frame.state == "scalar":
+            if character not in ",}]":
+                return
+            frame.state = "comma"
+
+        if frame.state == "key":
+            if character == '"':
+                self._string = _StringState(purpose="key", capture=True)
+            elif character == "}":
+                self._pop(events)
+            else:
+                self._reset()
+        elif frame.state == "colon":
+            if character == ":":
+                frame.state = "value"
+            else:
+                self._reset()
+        elif frame.state == "value":
+            if frame.container == "[" and character == "]":
+                self._pop(events)
+            else:
+                self._start_value(frame, character)
+        elif frame.state == "comma":
+            if character == ",":
+                frame.state = "key" if frame.container == "{" else "value"
+            elif (frame.container, character) in {("{", "}"), ("[", "]")}:
+                self._pop(events)
+            else:
+                self._reset()
+
+    def _start_value(self, frame: _Frame, character: str) -> None:
+        if frame.role in SCANNED_FILE_MAP_FIELDS and character != '"':
+            if frame.role == "patches":
+                raise contract_error(f"patch for '{frame.key}' must be a non-empty string")
+            raise contract_error(f"file content for '{frame.key}' must be a string")
+        if frame.role == "root" and frame.key in SCANNED_FILE_MAP_FIELDS and character != "{":
+            raise contract_error(
+                f"field '{frame.key}' must be an object map: {{path: "
+                + ("patch}" if frame.key == "patches" else "content}")
+            )
+
+        if character == '"':
+            capture = frame.role == "root" and frame.key in SCANNED_METADATA_FIELDS
+            self._string = _StringState(purpose="value", capture=capture)
+        elif character == "{":
+            child_role = (
+                frame.key
+                if frame.role == "root" and frame.key in SCANNED_FILE_MAP_FIELDS
+                else "other"
+            )
+            self._stack.append(_Frame(container="{", role=child_role))
+        elif character == "[":
+            self._stack.append(_Frame(container="[", state="value"))
+        else:
+            frame.state = "scalar"
+
+    def _consume_string(self, character: str, events: list[PayloadScanEvent]) -> None:
+        string_state = self._string
+        if string_state.escaped:
+            string_state.escaped = False
+        elif character == "\\":
+            string_state.escaped = True
+        elif character == '"':
+            self._string = None
+            self._finish_string(string_state, events)
+            return
+
+        string_state.length += 1
+        if string_state.capture:
+            string_state.raw_chars.append(character)
+
+    def _finish_string(self, string_state: _StringState, events: list[PayloadScanEvent]) -> None:
+        frame = self._stack[-1]
+        raw_value = "".join(string_state.raw_chars)
+        try:
+            value = json.loads(f'"{raw_value}"')
+        except ValueError:
+            value = raw_value
+
+        if string_state.purpose == "key":
+            frame.key = value
+            frame.state = "colon"
+            if frame.role in SCANNED_FILE_MAP_FIELDS:
+                validate_file_path(value)
+                events.append(PayloadScanEvent(kind="file_started", name=value, value=frame.role))
+            return
+
+        frame.state = "comma"
+        if frame.role in SCANNED_FILE_MAP_FIELDS:
+            self.files_count += 1
+            events.append(
+                PayloadScanEvent(
+                    kind="file_completed",
+                    name=frame.key,
+                    value=frame.role,
+                    size=string_state.length,
+                )
+            )
+        elif string_state.capture:
+            events.append(PayloadScanEvent(kind="field", name=frame.key, value=value))
+
+    def _pop(self, events: list[PayloadScanEvent]) -> None:
+        self._stack.pop()
+        if self._stack:
+            self._stack[-1].state = "comma"
+            return
+        # "files" pode vir vazio quando as mudancas chegam em "patches": so checa no fim.
+        if self.files_count == 0:
+            raise contract_error(
+                "field 'files' must contain at least one file change (or use 'patches')"
+            )
+        self.completed = True
+        events.append(PayloadScanEvent(kind="completed", size=self.files_count))
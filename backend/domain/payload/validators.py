@@ -1,6 +1,7 @@
 from typing import Any
 
 from domain.payload.errors import contract_error
+from domain.payload.patch_engine import parse_patch
 from domain.payload.path_policy import validate_file_path
 
 
@@ -11,11 +12,14 @@ REQUIRED_PAYLOAD_KEYS = {"files", "branch", "commit", "pr_title", "pr_body"}
 def validate_required_keys(payload_data: dict[str, Any]) -> None:
     # Calcula quais chaves obrigatorias estao faltando no payload.
     missing_keys = REQUIRED_PAYLOAD_KEYS - payload_data.keys()
+    # Com "patches" presente, "files" (conteudo completo) passa a ser opcional.
+    if "patches" in payload_data:
+        missing_keys.discard("files")
     if missing_keys:
         # Erro de contrato com mensagem objetiva para diagnostico rapido.
         raise contract_error(
             "missing required keys: "
-            f"{sorted(missing_keys)}; expected keys: files, branch, commit, pr_title, pr_body"
+            f"{sorted(missing_keys)}; expected keys: files (and/or patches), branch, commit, pr_title, pr_body"
         )
 
 
@@ -29,14 +33,16 @@ def validate_non_empty_string_field(payload_data: dict[str, Any], field_name: st
     return value
 
 
-def validate_files_map(files_value: Any) -> dict[str, str]:
+def validate_files_map(files_value: Any, *, allow_empty: bool = False) -> dict[str, str]:
     # O campo "files" precisa ser um objeto JSON no formato {path: content}.
     if not isinstance(files_value, dict):
         raise contract_error("field 'files' must be an object map: {path: content}")
 
-    # Nao permite payload sem alteracoes de arquivo.
-    if not files_value:
-        raise contract_error("field 'files' must contain at least one file change")
+    # Nao permite payload sem alteracoes de arquivo (salvo quando vierem em "patches").
+    if not files_value and not allow_empty:
+        raise contract_error(
+            "field 'files' must contain at least one file change (or use 'patches')"
+        )
 
     # Mapa final validado e tipado.
     validated_files: dict[str, str] = {}
@@ -56,3 +62,23 @@ def validate_files_map(files_value: Any) -> dict[str, str]:
         validated_files[raw_path] = raw_content
 
     return validated_files
+
+
+def validate_patches_map(patches_value: Any) -> dict[str, str]:
+    # Campo opcional "patches": {path: unified diff ou blocos SEARCH/REPLACE}.
+    if not isinstance(patches_value, dict):
+        raise contract_error("field 'patches' must be an object map: {path: patch}")
+
+    validated_patches: dict[str, str] = {}
+    for raw_path, raw_patch in patches_value.items():
+        if not isinstance(raw_path, str):
+            raise contract_error("all file paths in 'patches' must be strings")
+        validate_file_path(raw_path)
+        if not isinstance(raw_patch, str) or not raw_patch.strip():
+            raise contract_error(f"patch for '{raw_path}' must be a non-empty string")
+
+        # Valida o formato ja no parse; a aplicacao depende do conteudo atual do arquivo.
+        parse_patch(raw_path, raw_patch)
+        validated_patches[raw_path] = raw_patch
+
+    return validated_patches
@@ -0,0 +1,9 @@
+import math
+
+
+# Aproximacao usada para orcamentos de prompt: ~4 caracteres por token em texto/codigo.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
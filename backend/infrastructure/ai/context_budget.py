@@ -0,0 +1,192 @@
+import hashlib
+import logging
+import os
+import re
+from typing import Callable
+
+from crewai import Crew, Task
+from crewai.tasks.task_output import TaskOutput
+
+from domain.tokens import estimate_tokens
+from infrastructure.observability.logging_utils import log_event
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTEXT_TOKEN_BUDGET = 12000
+# Mesmo separador que o CrewAI usa ao juntar as saidas das tasks de contexto.
+CONTEXT_DIVIDER = "\n\n----------\n\n"
+
+# Bloco de codigo cercado por ``` (opcionalmente com linguagem) e o trecho de texto anterior.
+_CODE_BLOCK_PATTERN = re.compile(r"(?P<lead>[^\n]*\n?)(?P<block>```[^\n]*\n.*?```)", re.DOTALL)
+_FILE_PATH_PATTERN = re.compile(r"((?:backend|frontend)/[\w./-]+\.\w+)")
+# Bloco SEARCH/REPLACE ou diff: edita so um trecho, entao nao substitui versoes anteriores.
+_PARTIAL_EDIT_PATTERN = re.compile(r"^(?:<{5,9} ?SEARCH|@@ -\d)", re.MULTILINE)
+# Linha anterior que declara o bloco como conteudo completo do arquivo.
+_FULL_CONTENT_PATTERN = re.compile(r"\bfull(?: final)? (?:file )?contents?\b", re.IGNORECASE)
+# Bloco posterior sem marcacao so substitui o anterior se tiver ao menos esta fracao das linhas.
+SUPERSEDING_MIN_LINE_RATIO = 0.5
+
+
+def resolve_context_token_budget() -> int:
+    return int(os.getenv("CREW_CONTEXT_TOKEN_BUDGET", str(DEFAULT_CONTEXT_TOKEN_BUDGET)))
+
+
+def _block_digest(block: str) -> str:
+    return hashlib.sha256(block.encode("utf-8")).hexdigest()[:12]
+
+
+def _block_line_count(block: str) -> int:
+    return block.count("\n") - 1
+
+
+def _file_blocks(output_text: str) -> list[tuple[str | None, re.Match[str]]]:
+    # Associa cada bloco de codigo ao path citado na linha anterior (quando houver).
+    blocks = []
+    for match in _CODE_BLOCK_PATTERN.finditer(output_text):
+        path_match = _FILE_PATH_PATTERN.search(match.group("lead"))
+        blocks.append((path_match.group(1) if path_match else None, match))
+    return blocks
+
+
+def _replace_blocks(
+    output_text: str,
+    should_elide: Callable[[str | None, str], bool],
+    placeholder: Callable[[str | None, str], str],
+) -> str:
+    compacted_parts = []
+    last_end = 0
+    for path, match in _file_blocks(output_text):
+        if not should_elide(path, match.group("block")):
+            continue
+        block_start = match.start("block")
+        compacted_parts.append(output_text[last_end:block_start])
+        compacted_parts.append(placeholder(path, match.group("block")))
+        last_end = match.end("block")
+    compacted_parts.append(output_text[last_end:])
+    return "".join(compacted_parts)
+
+
+def _full_replacements(outputs: list[str]) -> dict[str, list[tuple[int, bool]]]:
+    # Por path: (linhas, marcado como conteudo completo) de cada bloco que nao e edicao parcial.
+    replacements: dict[str, list[tuple[int, bool]]] = {}
+    for output_text in outputs:
+        for path, match in _file_blocks(output_text):
+            block = match.group("block")
+            if path is None or _PARTIAL_EDIT_PATTERN.search(block):
+                continue
+            replacements.setdefault(path, []).append(
+                (_block_line_count(block), bool(_FULL_CONTENT_PATTERN.search(match.group("lead"))))
+            )
+    return replacements
+
+
+def drop_superseded_files(outputs: list[str]) -> list[str]:
+    # Arquivo reescrito por inteiro numa task posterior: a versao anterior vira referencia por
+    # hash. Trecho curto citado depois (ex.: snippet do QA) nao conta como reescrita.
+    compacted_outputs = []
+    for index, output_text in enumerate(outputs):
+        later_replacements = _full_replacements(outputs[index + 1 :])
+
+        def is_superseded(path: str | None, block: str) -> bool:
+            if path is None:
+                return False
+            line_count = _block_line_count(block)
+            return any(
+                marked_full or later_line_count >= line_count * SUPERSEDING_MIN_LINE_RATIO
+                for later_line_count, marked_full in later_replacements.get(path, [])
+            )
+
+        compacted_outputs.append(
+            _replace_blocks(
+                output_text,
+                is_superseded,
+                lambda path, block: (
+                    f"[{path}: superseded by a later proposal, sha256 {_block_digest(block)}]"
+                ),
+            )
+        )
+    return compacted_outputs
+
+
+def elide_code_blocks(output_text: str) -> str:
+    # Mantem rationale/notas e troca o corpo dos arquivos por tamanho + hash.
+    return _replace_blocks(
+        output_text,
+        lambda _path, _block: True,
+        lambda path, block: (
+            f"[{path or 'code'} elided: {_block_line_count(block)} lines, "
+            f"sha256 {_block_digest(block)}]"
+        ),
+    )
+
+
+def compact_context_outputs(
+    outputs: list[str],
+    token_budget: int,
+    *,
+    keep_file_bodies: bool = False,
+) -> list[str]:
+    def total_tokens(candidate_outputs: list[str]) -> int:
+        return estimate_tokens(CONTEXT_DIVIDER.join(candidate_outputs))
+
+    if token_budget <= 0 or total_tokens(outputs) <= token_budget:
+        return outputs
+
+    compacted_outputs = drop_superseded_files(outputs)
+    if keep_file_bodies:
+        return compacted_outputs
+    # Ainda acima do orcamento: compacta das saidas mais antigas para as mais novas;
+    # a ultima (a proposta mais recente) fica sempre integra.
+    for index in range(len(compacted_outputs) - 1):
+        if total_tokens(compacted_outputs) <= token_budget:
+            break
+        compacted_outputs[index] = elide_code_blocks(compacted_outputs[index])
+    return compacted_outputs
+
+
+class BudgetedCrew(Crew):
+    # Crew cujo contexto encadeado entre tasks respeita um orcamento de tokens.
+    context_token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET
+    # Task final executada fora do crew, com streaming direto do LLM (ver crew_runner).
+    streamed_final_task: Task | None = None
+
+    def _get_context(self, task: Task, task_outputs: list[TaskOutput]) -> str:
+        if not task.context:
+            return ""
+        if isinstance(task.context, list):
+            outputs = [
+                context_task.output.raw for context_task in task.context if context_task.output
+            ]
+        else:
+            outputs = [task_output.raw for task_output in task_outputs]
+
+        # A task final monta o JSON: so perde copias de arquivo reescritas depois.
+        compacted_outputs = compact_context_outputs(
+            outputs,
+            self.context_token_budget,
+            keep_file_bodies=task is self.tasks[-1] and self.streamed_final_task is None,
+        )
+        context = CONTEXT_DIVIDER.join(compacted_outputs)
+        context_tokens = estimate_tokens(context)
+        log_event(
+            logger,
+            logging.WARNING if context_tokens > self.context_token_budget > 0 else logging.INFO,
+            "ai.crew.task_prompt_tokens",
+            agent=task.agent.role if task.agent else None,
+            description_tokens=estimate_tokens(task.description),
+            context_tokens_raw=estimate_tokens(CONTEXT_DIVIDER.join(outputs)),
+            context_tokens=context_tokens,
+            context_token_budget=self.context_token_budget,
+        )
+        return context
+
+
+def log_task_completion_tokens(task_output: TaskOutput) -> None:
+    log_event(
+        logger,
+        logging.INFO,
+        "ai.crew.task_completion_tokens",
+        agent=task_output.agent,
+        completion_tokens=estimate_tokens(task_output.raw),
+    )
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from infrastructure.ai.crew_flow import resolve_agent_model, resolve_prompt_version
+from infrastructure.observability.logging_utils import log_event
+from infrastructure.repo.git_index import resolve_repo_cache_dir
+from infrastructure.storage.atomic_file import write_cache_file
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+class CrewOutputCache:
+    # Saida bruta do crew em disco, indexada por hash do conteudo; eviction por TTL e tamanho.
+    def __init__(
+        self,
+        cache_dir: Path,
+        *,
+        model: str,
+        prompt_version: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.model = model
+        self.prompt_version = prompt_version
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def build_key(
+        self,
+        issue_title: str,
+        issue_body: str,
+        repository_revision: str,
+        repository_tree_summary: str,
+    ) -> str:
+        key_fields = [
+            self.prompt_version,
+            self.model,
+            repository_revision,
+            issue_title,
+            issue_body,
+            repository_tree_summary,
+        ]
+        return hashlib.sha256("\0".join(key_fields).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, cache_key: str) -> Path:
+        return self.cache_dir / f"{cache_key}.json"
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def get(self, cache_key: str) -> str | None:
+        entry_path = self._entry_path(cache_key)
+        try:
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            entry = None
+        else:
+            # JSON valido mas fora do formato (ex.: outra versao): descarta como miss.
+            try:
+                created_at = float(entry["created_at"])
+                if not isinstance(entry["output"], str):
+                    raise TypeError("cached output must be a string")
+            except (KeyError, TypeError, ValueError):
+                entry_path.unlink(missing_ok=True)
+                entry = None
+            else:
+                if time.time() - created_at > self.ttl_seconds:
+                    entry_path.unlink(missing_ok=True)
+                    self._count("evictions")
+                    entry = None
+
+        if entry is None:
+            self._count("misses")
+            log_event(logger, logging.INFO, "ai.crew_cache.miss", cache_key=cache_key[:12])
+            return None
+
+        # mtime marca o ultimo uso: a eviction por tamanho remove primeiro os menos usados.
+        # Outro run pode ter removido a entrada depois da leitura: o conteudo lido ainda vale.
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        self._count("hits")
+        log_event(logger, logging.INFO, "ai.crew_cache.hit", cache_key=cache_key[:12])
+        return entry["output"]
+
+    def put(self, cache_key: str, crew_output: str) -> None:
+        entry = {"created_at": time.time(), "output": crew_output}
+        write_cache_file(self._entry_path(cache_key), json.dumps(entry, ensure_ascii=False))
+        self._count("stores")
+        self._evict()
+
+    def _evict(self) -> None:
+        now = time.time()
+        entries = []
+        for entry_path in self.cache_dir.glob("*.json"):
+            try:
+                entry_stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+        entries.sort()
+
+        total_bytes = sum(size_bytes for _mtime, size_bytes, _path in entries)
+        evicted_count = 0
+        for mtime, size_bytes, entry_path in entries:
+            # mtime nunca e anterior ao created_at: entrada parada alem do TTL ja expirou.
+            if total_bytes <= self.max_bytes and now - mtime <= self.ttl_seconds:
+                continue
+            entry_path.unlink(missing_ok=True)
+            total_bytes -= size_bytes
+            evicted_count += 1
+        if evicted_count:
+            self._count("evictions", evicted_count)
+            log_event(
+                logger,
+                logging.INFO,
+                "ai.crew_cache.evicted",
+                evicted_count=evicted_count,
+                total_bytes=total_bytes,
+            )
+
+    def metrics(self) -> dict[str, int | float]:
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": sum(1 for _ in self.cache_dir.glob("*.json")),
+        }
+
+
+def resolve_crew_cache_enabled() -> bool:
+    return os.getenv("CREW_CACHE_ENABLED", "true").strip().lower() not in {"0", "false", "no"}
+
+
+@lru_cache(maxsize=1)
+def get_crew_output_cache() -> CrewOutputCache:
+    raw_cache_dir = os.getenv("CREW_CACHE_DIR", "").strip()
+    cache_dir = Path(raw_cache_dir) if raw_cache_dir else resolve_repo_cache_dir("crew")
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return CrewOutputCache(
+        cache_dir,
+        model=resolve_agent_model(),
+        prompt_version=resolve_prompt_version(),
+        max_bytes=int(os.getenv("CREW_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+        ttl_seconds=float(os.getenv("CREW_CACHE_TTL_SECONDS", str(DEFAULT_TTL_SECONDS))),
+    )
+
+
+def build_crew_output_cache() -> CrewOutputCache | None:
+    if not resolve_crew_cache_enabled():
+        return None
+    return get_crew_output_cache()
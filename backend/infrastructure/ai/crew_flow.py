@@ -1,14 +1,179 @@
+import logging
 import os
 
 from crewai import Agent, Crew, Task
 
+from infrastructure.ai.context_budget import (
+    BudgetedCrew,
+    log_task_completion_tokens,
+    resolve_context_token_budget,
+)
+from infrastructure.ai.scope_classifier import classify_issue_scope
+from infrastructure.observability.logging_utils import log_event
 
-def _resolve_agent_model() -> str:
+
+logger = logging.getLogger(__name__)
+
+# Versao dos prompts abaixo: entra na chave do cache do crew. Incremente ao alterar tasks/agentes.
+PROMPT_TEMPLATE_VERSION = "4"
+
+CREW_EXECUTION_PARALLEL = "parallel"
+CREW_EXECUTION_SEQUENTIAL = "sequential"
+DEFAULT_CREW_EXECUTION_MODE = CREW_EXECUTION_PARALLEL
+
+CREW_TOPOLOGY_ADAPTIVE = "adaptive"
+CREW_TOPOLOGY_FULL = "full"
+DEFAULT_CREW_TOPOLOGY = CREW_TOPOLOGY_ADAPTIVE
+# Escopo (vocabulario de classify_change_scope) -> pasta unica editada no pipeline reduzido.
+REDUCED_SCOPE_ROOTS = {"backend_only": "backend/", "frontend_only": "frontend/"}
+GIT_INTEGRATOR_ROLE = "Git Integrator"
+
+
+def resolve_agent_model() -> str:
     return os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
 
-def build_crew(issue_title: str, issue_body: str, repo_tree: str) -> Crew:
-    agent_model = _resolve_agent_model()
+def resolve_crew_execution_mode() -> str:
+    execution_mode = os.getenv("CREW_EXECUTION_MODE", DEFAULT_CREW_EXECUTION_MODE).strip().lower()
+    if execution_mode not in {CREW_EXECUTION_PARALLEL, CREW_EXECUTION_SEQUENTIAL}:
+        raise RuntimeError(f"Unsupported CREW_EXECUTION_MODE: {execution_mode}")
+    return execution_mode
+
+
+def resolve_crew_topology() -> str:
+    crew_topology = os.getenv("CREW_TOPOLOGY", DEFAULT_CREW_TOPOLOGY).strip().lower()
+    if crew_topology not in {CREW_TOPOLOGY_ADAPTIVE, CREW_TOPOLOGY_FULL}:
+        raise RuntimeError(f"Unsupported CREW_TOPOLOGY: {crew_topology}")
+    return crew_topology
+
+
+def resolve_prompt_version() -> str:
+    # Modo, topologia e orcamento mudam o que cada task recebe de contexto, logo tambem a saida.
+    return ":".join(
+        [
+            PROMPT_TEMPLATE_VERSION,
+            resolve_crew_execution_mode(),
+            resolve_crew_topology(),
+            str(resolve_context_token_budget()),
+        ]
+    )
+
+
+def resolve_crew_scope(issue_title: str, issue_body: str, repository_context: str) -> str:
+    if resolve_crew_topology() == CREW_TOPOLOGY_FULL:
+        return "fullstack"
+    change_scope = classify_issue_scope(issue_title, issue_body, repository_context)
+    return change_scope if change_scope in REDUCED_SCOPE_ROOTS else "fullstack"
+
+
+# Edicao parcial aceita nas propostas: evita regenerar arquivos grandes inteiros.
+EDIT_FORMAT_HINT = (
+    "for small edits to large existing files, SEARCH/REPLACE blocks with lines copied "
+    "verbatim from the current file are enough"
+)
+
+GIT_TASK_DESCRIPTION = """
+Generate the final repository output as a single JSON object.
+
+Required JSON keys:
+- files: object map {repository-relative path -> FULL final file content}
+  (use {} when every change is in `patches`)
+- patches (optional): object map {repository-relative path -> edit of an EXISTING file}
+  as one or more blocks:
+  <<<<<<< SEARCH
+  lines copied verbatim from the current file
+  =======
+  replacement lines
+  >>>>>>> REPLACE
+  (a unified diff with @@ hunks is also accepted)
+- branch: string (`feature/issue-<n>-slug`)
+- commit: string (Conventional Commit message)
+- pr_title: string
+- pr_body: string (goal, what changed, how to test)
+
+Hard rules:
+- Return JSON only.
+- No markdown, no code fences, no explanations.
+- Include every file that must be created/updated, in `files` or in `patches`.
+- New files always go in `files`; prefer `patches` for small edits to large existing files.
+- All file paths in `files` and `patches` must start with `backend/` or `frontend/`.
+"""
+GIT_TASK_EXPECTED_OUTPUT = (
+    'Pure JSON: {"files": {...}, "patches": {...}, "branch": "...", "commit": "...", '
+    '"pr_title": "...", "pr_body": "..."}'
+)
+# Trecho da saida anterior repetido no prompt de reparo (o restante e truncado).
+MAX_REPAIR_PREVIOUS_OUTPUT_CHARS = 4000
+
+
+def build_git_integrator(agent_model: str) -> Agent:
+    return Agent(
+        role=GIT_INTEGRATOR_ROLE,
+        goal="Produce a single valid JSON output for repository changes and PR metadata.",
+        backstory="You enforce strict output formatting and complete file coverage.",
+        llm=agent_model,
+        verbose=True,
+    )
+
+
+def build_repair_crew(previous_output: str, error_message: str, upstream_context: str) -> Crew:
+    # Reparo direcionado: so o Git Integrator roda de novo, com o erro e as saidas ja obtidas.
+    git_integrator = build_git_integrator(resolve_agent_model())
+    repair_task = Task(
+        description=GIT_TASK_DESCRIPTION
+        + f"""
+Your previous output was rejected by the contract validator:
+{error_message}
+
+Fix exactly that problem and return the complete corrected JSON.
+
+Previous output (may be truncated):
+{previous_output[:MAX_REPAIR_PREVIOUS_OUTPUT_CHARS]}
+
+Upstream proposals (source of the file contents):
+{upstream_context or "(not available: use the previous output)"}
+""",
+        expected_output=GIT_TASK_EXPECTED_OUTPUT,
+        agent=git_integrator,
+    )
+    return Crew(agents=[git_integrator], tasks=[repair_task], verbose=True)
+
+
+def _format_repository_context(repository_context: str) -> str:
+    if not repository_context.strip():
+        return ""
+    return f"""
+Relevant repository files (ranked for this issue, read before editing):
+{repository_context}
+"""
+
+
+def build_crew(
+    issue_title: str,
+    issue_body: str,
+    repo_tree: str,
+    repository_context: str = "",
+    *,
+    stream_git_task: bool = False,
+) -> Crew:
+    agent_model = resolve_agent_model()
+    # Issue de um lado so: pipeline reduzido (um dev, QA acumulando a integracao, git integrator).
+    change_scope = resolve_crew_scope(issue_title, issue_body, repository_context)
+    reduced_scope_root = REDUCED_SCOPE_ROOTS.get(change_scope)
+    # Em modo paralelo backend e frontend rodam juntos; o frontend nao ve a proposta do backend.
+    run_dev_tasks_in_parallel = (
+        reduced_scope_root is None
+        and resolve_crew_execution_mode() == CREW_EXECUTION_PARALLEL
+    )
+    repository_context_section = _format_repository_context(repository_context)
+    issue_section = f"""
+Issue:
+Title: {issue_title}
+Description: {issue_body}
+
+Repo tree (summary):
+{repo_tree}
+"""
 
     backend_dev = Agent(
         role="Backend Dev",
@@ -42,23 +207,10 @@ def build_crew(issue_title: str, issue_body: str, repo_tree: str) -> Crew:
         verbose=True,
     )
 
-    git_integrator = Agent(
-        role="Git Integrator",
-        goal="Produce a single valid JSON output for repository changes and PR metadata.",
-        backstory="You enforce strict output formatting and complete file coverage.",
-        llm=agent_model,
-        verbose=True,
-    )
+    git_integrator = build_git_integrator(agent_model)
 
     backend_task = Task(
-        description=f"""
-Issue:
-Title: {issue_title}
-Description: {issue_body}
-
-Repo tree (summary):
-{repo_tree}
-
+        description=f"""{issue_section}{repository_context_section}
 Role responsibilities:
 - Implement backend logic only.
 - Keep changes minimal and coherent with existing architecture.
@@ -68,18 +220,32 @@ Scope guardrail:
 - If frontend changes are required, describe them but do not edit frontend files.
 
 Expected output:
-1) Backend files to create/update with FULL final content
+1) Backend files to create/update with FULL final content ({EDIT_FORMAT_HINT})
 2) Short rationale (1-3 lines)
 3) Integration notes for frontend consumer when relevant
 """,
         expected_output="Backend-only implementation proposal with full file contents and integration notes.",
         agent=backend_dev,
+        async_execution=run_dev_tasks_in_parallel,
     )
 
     frontend_task = Task(
-        description="""
+        description=(
+            f"""{issue_section}
+Implement frontend updates required by the issue.
+The backend is implemented in parallel: rely on the API contract below.
+"""
+            if run_dev_tasks_in_parallel
+            else f"""{issue_section}
+Implement frontend updates required by the issue.
+No backend changes are planned: rely on the existing API contract below.
+"""
+            if change_scope == "frontend_only"
+            else """
 Implement frontend updates required by the issue and backend proposal.
-
+"""
+        )
+        + """
 Role responsibilities:
 - Implement UI/client behavior in frontend.
 - Ensure request/response typing and user feedback states.
@@ -102,10 +268,13 @@ Contract expectations for request/response:
 - Request: `{owner, repo, issue_number, base_branch?, dry_run?}`
 - Success response: `{status, message, branch?, commit?, pr_title?, pr_url?}`
 - Error response (FastAPI): `{detail: string}`
-""",
+"""
+        + repository_context_section,
         expected_output="Frontend-only implementation proposal with full file contents and explicit API handling.",
         agent=frontend_dev,
-        context=[backend_task],
+        async_execution=run_dev_tasks_in_parallel,
+        # Tarefas async nao podem depender de outra async logo antes: o contrato fixo do prompt basta.
+        context=[] if run_dev_tasks_in_parallel or reduced_scope_root else [backend_task],
     )
 
     integration_task = Task(
@@ -126,9 +295,19 @@ Mandatory integration checks:
 - JSON field naming and type consistency end-to-end
 
 Output constraints:
-- List required edits with FULL final contents for each file.
+- List required edits with FULL final contents for each file ("""
+        + EDIT_FORMAT_HINT
+        + """).
 - Explicitly call out any contract changes or compatibility notes.
-""",
+"""
+        + (
+            """
+Backend and frontend proposals were produced in parallel without seeing each other:
+treat every field, path and error shape they disagree on as a mismatch to resolve.
+"""
+            if run_dev_tasks_in_parallel
+            else ""
+        ),
         expected_output="Integrated fullstack proposal with contract-safe backend/frontend changes.",
         agent=integration_engineer,
         context=[backend_task, frontend_task],
@@ -160,42 +339,75 @@ Output:
         context=[backend_task, frontend_task, integration_task],
     )
 
-    git_task = Task(
-        description="""
-Generate the final repository output as a single JSON object.
+    if reduced_scope_root is None:
+        crew_agents = [backend_dev, frontend_dev, integration_engineer, qa_reviewer]
+        crew_tasks = [backend_task, frontend_task, integration_task, qa_task]
+    else:
+        dev_agent, dev_task = (
+            (backend_dev, backend_task)
+            if change_scope == "backend_only"
+            else (frontend_dev, frontend_task)
+        )
+        review_task = Task(
+            description=f"""
+Review the proposal end-to-end, apply the integration checks and enforce guardrails.
+This issue was classified as {change_scope}: only files under `{reduced_scope_root}` may change.
+
+Integration checks (no separate integration step runs for this issue):
+- Existing API contract stays compatible (`/workflow/run`, request/response fields, `detail` errors).
+- Environment variable names and usage stay consistent.
 
-Required JSON keys:
-- files: object map {repository-relative path -> FULL final file content}
-- branch: string (`feature/issue-<n>-slug`)
-- commit: string (Conventional Commit message)
-- pr_title: string
-- pr_body: string (goal, what changed, how to test)
+Reject (FAIL) if any condition happens:
+- Any edit outside `{reduced_scope_root}`.
+- The change breaks the existing API contract or error handling.
+- Final delivery cannot be represented as pure JSON files map.
 
-Hard rules:
-- Return JSON only.
-- No markdown, no code fences, no explanations.
-- Include every file that must be created/updated.
-- All file paths in `files` must start with `backend/` or `frontend/`.
+Output:
+- PASS or FAIL
+- If FAIL: required fixes as files with FULL final contents ({EDIT_FORMAT_HINT})
+- If PASS: concise verification checklist
 """,
-        expected_output='Pure JSON: {"files": {...}, "branch": "...", "commit": "...", "pr_title": "...", "pr_body": "..."}',
+            expected_output="PASS/FAIL with corrected full file contents or validation checklist.",
+            agent=qa_reviewer,
+            context=[dev_task],
+        )
+        crew_agents = [dev_agent, qa_reviewer]
+        crew_tasks = [dev_task, review_task]
+
+    git_task = Task(
+        description=GIT_TASK_DESCRIPTION
+        + (
+            f"- This issue is {change_scope}: every path must start with `{reduced_scope_root}`.\n"
+            if reduced_scope_root
+            else ""
+        ),
+        expected_output=GIT_TASK_EXPECTED_OUTPUT,
         agent=git_integrator,
-        context=[backend_task, frontend_task, integration_task, qa_task],
+        context=list(crew_tasks),
     )
 
-    return Crew(
-        agents=[
-            backend_dev,
-            frontend_dev,
-            integration_engineer,
-            qa_reviewer,
-            git_integrator,
-        ],
-        tasks=[
-            backend_task,
-            frontend_task,
-            integration_task,
-            qa_task,
-            git_task,
-        ],
+    log_event(
+        logger,
+        logging.INFO,
+        "ai.crew.topology",
+        change_scope=change_scope,
+        agents=[agent.role for agent in crew_agents] + [git_integrator.role],
+        parallel_dev_tasks=run_dev_tasks_in_parallel,
+    )
+    if stream_git_task:
+        # O JSON final e gerado fora do crew, em streaming cancelavel (ver crew_runner).
+        return BudgetedCrew(
+            agents=crew_agents,
+            tasks=crew_tasks,
+            verbose=True,
+            streamed_final_task=git_task,
+            context_token_budget=resolve_context_token_budget(),
+            task_callback=log_task_completion_tokens,
+        )
+    return BudgetedCrew(
+        agents=[*crew_agents, git_integrator],
+        tasks=[*crew_tasks, git_task],
         verbose=True,
+        context_token_budget=resolve_context_token_budget(),
+        task_callback=log_task_completion_tokens,
     )
@@ -1,7 +1,266 @@
-from infrastructure.ai.crew_flow import build_crew
+import logging
+import os
 
+from crewai import Crew, Task
+from crewai.agent.utils import format_task_with_context
+from crewai.llms.providers.openai.completion import OpenAICompletion
+from crewai.types.usage_metrics import UsageMetrics
+from crewai.utilities.agent_utils import format_message_for_llm
+from crewai.utilities.prompts import Prompts
+
+from domain.payload import ContractViolationError, IncrementalPayloadScanner
+from domain.tokens import estimate_tokens
+from infrastructure.ai.context_budget import (
+    CONTEXT_DIVIDER,
+    BudgetedCrew,
+    compact_context_outputs,
+    resolve_context_token_budget,
+)
+from infrastructure.ai.crew_flow import build_crew, build_repair_crew
+from infrastructure.ai.payload_repair import repair_payload_locally
+from infrastructure.observability.logging_utils import log_event
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPAIR_MAX_ATTEMPTS = 2
+
+
+def resolve_crew_streaming() -> bool:
+    return os.getenv("CREW_STREAMING", "true").strip().lower() not in {"0", "false", "no"}
+
+
+def resolve_repair_max_attempts() -> int:
+    return int(os.getenv("CREW_REPAIR_MAX_ATTEMPTS", str(DEFAULT_REPAIR_MAX_ATTEMPTS)))
+
+
+def _final_task_messages(final_task: Task, upstream_context: str) -> list[dict[str, str]]:
+    # Prompt montado pela API do CrewAI (templates e i18n do agente), como no executor do crew.
+    agent = final_task.agent
+    task_prompt = format_task_with_context(final_task.prompt(), upstream_context, agent.i18n)
+    agent_prompt = Prompts(
+        agent=agent,
+        has_tools=False,
+        i18n=agent.i18n,
+        use_system_prompt=agent.use_system_prompt,
+        system_template=agent.system_template,
+        prompt_template=agent.prompt_template,
+        response_template=agent.response_template,
+    ).task_execution()
+
+    def render(template: str) -> str:
+        # Mesmas substituicoes do executor; o Git Integrator nao tem tools.
+        return (
+            template.replace("{input}", task_prompt)
+            .replace("{tool_names}", "")
+            .replace("{tools}", "")
+        )
+
+    if "system" in agent_prompt:
+        return [
+            format_message_for_llm(render(agent_prompt["system"]), role="system"),
+            format_message_for_llm(render(agent_prompt["user"])),
+        ]
+    return [format_message_for_llm(render(agent_prompt["prompt"]))]
+
+
+class _FinalTaskScan:
+    # Alimenta o scanner incremental e publica os eventos ai.crew.stream.* (chegam ao SSE).
+    def __init__(self) -> None:
+        self.payload_scanner = IncrementalPayloadScanner()
+        self.output_parts: list[str] = []
+        self.streamed_chars = 0
+
+    def feed(self, content: str) -> None:
+        self.output_parts.append(content)
+        self.streamed_chars += len(content)
+        try:
+            scan_events = self.payload_scanner.feed(content)
+        except ContractViolationError as error:
+            log_event(
+                logger,
+                logging.ERROR,
+                "ai.crew.stream.aborted",
+                streamed_chars=self.streamed_chars,
+                error=str(error),
+            )
+            raise
+        for scan_event in scan_events:
+            log_event(
+                logger,
+                logging.INFO,
+                f"ai.crew.stream.{scan_event.kind}",
+                name=scan_event.name,
+                value=scan_event.value,
+                size=scan_event.size,
+                streamed_chars=self.streamed_chars,
+            )
+
+    def output(self) -> str:
+        return "".join(self.output_parts)
+
+
+def _stream_openai_completion(
+    llm: OpenAICompletion,
+    messages: list[dict[str, str]],
+    final_task_scan: _FinalTaskScan,
+) -> UsageMetrics | None:
+    # Mesmo cliente e parametros do LLM do agente (chave, base_url, headers, temperatura...),
+    # mas o stream e iterado aqui: violacao de contrato fecha a resposta HTTP e o provider
+    # para de gerar (economiza os tokens restantes e a espera por eles).
+    completion_params = llm._prepare_completion_params(messages)
+    completion_params.update(stream=True, stream_options={"include_usage": True})
+    usage_metrics = None
+    # O context manager fecha a conexao em qualquer saida, inclusive no abort.
+    with llm.client.chat.completions.create(**completion_params) as completion_stream:
+        for chunk in completion_stream:
+            if chunk.usage is not None:
+                usage_metrics = UsageMetrics(
+                    prompt_tokens=chunk.usage.prompt_tokens,
+                    completion_tokens=chunk.usage.completion_tokens,
+                    total_tokens=chunk.usage.total_tokens,
+                    successful_requests=1,
+                )
+            if chunk.choices and chunk.choices[0].delta.content:
+                final_task_scan.feed(chunk.choices[0].delta.content)
+    return usage_metrics
+
+
+def _stream_final_task(issue_crew: BudgetedCrew, upstream_outputs: list[str]) -> str:
+    # Chamada final do Git Integrator fora do crew, pelo LLM do proprio agente.
+    final_task = issue_crew.streamed_final_task
+    llm = final_task.agent.llm
+    upstream_context = CONTEXT_DIVIDER.join(
+        compact_context_outputs(
+            upstream_outputs,
+            issue_crew.context_token_budget,
+            keep_file_bodies=True,
+        )
+    )
+    log_event(
+        logger,
+        logging.INFO,
+        "ai.crew.task_prompt_tokens",
+        agent=final_task.agent.role,
+        description_tokens=estimate_tokens(final_task.description),
+        context_tokens=estimate_tokens(upstream_context),
+        context_token_budget=issue_crew.context_token_budget,
+    )
+
+    messages = _final_task_messages(final_task, upstream_context)
+    final_task_scan = _FinalTaskScan()
+    log_event(logger, logging.INFO, "ai.crew.stream.started", agent=final_task.agent.role)
+    if isinstance(llm, OpenAICompletion) and llm.api == "completions":
+        usage_metrics = _stream_openai_completion(llm, messages, final_task_scan)
+    else:
+        # Outros providers: chamada normal do LLM do agente; o scanner valida a resposta inteira.
+        final_task_scan.feed(
+            str(llm.call(messages, from_task=final_task, from_agent=final_task.agent))
+        )
+        usage_metrics = llm.get_token_usage_summary()
+    # Tokens da task final entram no total do crew (evento ai.crew.usage).
+    if usage_metrics is not None:
+        if issue_crew.usage_metrics is None:
+            issue_crew.usage_metrics = UsageMetrics()
+        issue_crew.usage_metrics.add_usage_metrics(usage_metrics)
+    return final_task_scan.output()
+
+
+class CrewSession:
+    # Estado de um run: guarda as saidas das tasks anteriores ao Git Integrator para o reparo.
+    def __init__(self, *, max_repair_attempts: int = DEFAULT_REPAIR_MAX_ATTEMPTS) -> None:
+        self.max_repair_attempts = max_repair_attempts
+        self.upstream_outputs: list[str] = []
+        self.local_repair_tried = False
+        self.repair_attempts = 0
+
+    def run(
+        self,
+        issue_title: str,
+        issue_body: str,
+        repository_tree_summary: str,
+        repository_context: str = "",
+    ) -> str:
+        stream_git_task = resolve_crew_streaming()
+        issue_crew = build_crew(
+            issue_title,
+            issue_body,
+            repository_tree_summary,
+            repository_context,
+            stream_git_task=stream_git_task,
+        )
+        crew_result = issue_crew.kickoff()
+        # Saidas anteriores ao Git Integrator: contexto da task final e do reparo.
+        upstream_tasks = issue_crew.tasks if stream_git_task else issue_crew.tasks[:-1]
+        self.upstream_outputs = [
+            task.output.raw for task in upstream_tasks if task.output is not None
+        ]
+        if not stream_git_task:
+            _log_usage_metrics(issue_crew)
+            return str(crew_result)
+        try:
+            return _stream_final_task(issue_crew, self.upstream_outputs)
+        finally:
+            # Inclui a task final em streaming (abortada: so as tasks do crew).
+            _log_usage_metrics(issue_crew)
+
+    def repair(self, crew_output_text: str, error_message: str) -> str | None:
+        # 1) reparo local (cercas, JSON malformado), uma vez; 2) novo prompt so ao Git Integrator.
+        if not self.local_repair_tried:
+            self.local_repair_tried = True
+            repaired_text = repair_payload_locally(crew_output_text)
+            if repaired_text is not None and repaired_text != crew_output_text:
+                log_event(logger, logging.INFO, "ai.crew.repair.local", error=error_message)
+                return repaired_text
+
+        if self.repair_attempts >= self.max_repair_attempts:
+            log_event(
+                logger,
+                logging.ERROR,
+                "ai.crew.repair.exhausted",
+                attempts=self.repair_attempts,
+                error=error_message,
+            )
+            return None
+
+        self.repair_attempts += 1
+        upstream_context = CONTEXT_DIVIDER.join(
+            compact_context_outputs(
+                self.upstream_outputs,
+                resolve_context_token_budget(),
+                keep_file_bodies=True,
+            )
+        )
+        log_event(
+            logger,
+            logging.WARNING,
+            "ai.crew.repair.reprompt",
+            attempt=self.repair_attempts,
+            max_attempts=self.max_repair_attempts,
+            upstream_outputs_count=len(self.upstream_outputs),
+            error=error_message,
+        )
+        repair_crew = build_repair_crew(crew_output_text, error_message, upstream_context)
+        repaired_output = str(repair_crew.kickoff())
+        _log_usage_metrics(repair_crew)
+        return repaired_output
+
+
+def _log_usage_metrics(crew: Crew) -> None:
+    # Contagem real do provider (agregada); as estimativas por task saem em ai.crew.task_*.
+    usage_metrics = crew.usage_metrics
+    if usage_metrics is not None:
+        log_event(
+            logger,
+            logging.INFO,
+            "ai.crew.usage",
+            prompt_tokens=usage_metrics.prompt_tokens,
+            completion_tokens=usage_metrics.completion_tokens,
+            total_tokens=usage_metrics.total_tokens,
+            successful_requests=usage_metrics.successful_requests,
+        )
+
+
+def build_crew_session() -> CrewSession:
+    return CrewSession(max_repair_attempts=resolve_repair_max_attempts())
 
-def run_crew(issue_title: str, issue_body: str, repository_tree_summary: str) -> str:
-    issue_crew = build_crew(issue_title, issue_body, repository_tree_summary)
-    crew_result = issue_crew.kickoff()
-    return str(crew_result)
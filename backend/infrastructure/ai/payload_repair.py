@@ -0,0 +1,19 @@
+import re
+
+from json_repair import repair_json
+
+
+_FENCED_BLOCK_PATTERN = re.compile(r"```(?:json)?\s*\n?(.*?)```", re.DOTALL)
+
+
+def repair_payload_locally(crew_output_text: str) -> str | None:
+    # Reparo sem LLM: remove cercas de codigo e corrige JSON malformado (virgulas, aspas, fechamentos).
+    fenced_block = _FENCED_BLOCK_PATTERN.search(crew_output_text)
+    candidate_text = fenced_block.group(1) if fenced_block else crew_output_text
+    json_start = candidate_text.find("{")
+    if json_start < 0:
+        return None
+    repaired_text = repair_json(candidate_text[json_start:])
+    if not isinstance(repaired_text, str) or repaired_text.strip() in {"", '""', "{}"}:
+        return None
+    return repaired_text
@@ -0,0 +1,78 @@
+import re
+
+from infrastructure.observability.workflow_observer import classify_change_scope
+
+
+BACKEND_KEYWORDS = frozenset(
+    {
+        "api",
+        "backend",
+        "database",
+        "endpoint",
+        "fastapi",
+        "migration",
+        "pydantic",
+        "python",
+        "server",
+        "sql",
+        "webhook",
+    }
+)
+FRONTEND_KEYWORDS = frozenset(
+    {
+        "button",
+        "component",
+        "css",
+        "frontend",
+        "layout",
+        "modal",
+        "page",
+        "react",
+        "screen",
+        "tsx",
+        "ui",
+        "ux",
+        "vite",
+    }
+)
+# Termos de contrato entre as camadas: nunca reduzem o pipeline.
+FULLSTACK_KEYWORDS = frozenset({"contract", "cors", "fullstack", "integration"})
+
+_WORD_PATTERN = re.compile(r"[a-z][a-z0-9]*")
+_MENTIONED_PATH_PATTERN = re.compile(r"\b((?:backend|frontend)/[\w./-]+)")
+_CONTEXT_HEADER_PATTERN = re.compile(r"^### (\S+) \(score ", re.MULTILINE)
+
+
+def _classify_issue_text(issue_text: str) -> str:
+    lowered_text = issue_text.lower()
+    words = set(_WORD_PATTERN.findall(lowered_text))
+    if words & FULLSTACK_KEYWORDS:
+        return "fullstack"
+    mentioned_paths = {path: "" for path in _MENTIONED_PATH_PATTERN.findall(lowered_text)}
+    path_scope = classify_change_scope(mentioned_paths)
+    if path_scope != "unknown":
+        return path_scope
+
+    has_backend = bool(words & BACKEND_KEYWORDS)
+    has_frontend = bool(words & FRONTEND_KEYWORDS)
+    if has_backend and has_frontend:
+        return "fullstack"
+    if has_backend:
+        return "backend_only"
+    if has_frontend:
+        return "frontend_only"
+    return "unknown"
+
+
+def classify_issue_scope(issue_title: str, issue_body: str, repository_context: str) -> str:
+    # Heuristica barata (sem LLM) com o mesmo vocabulario de classify_change_scope.
+    text_scope = _classify_issue_text(f"{issue_title}\n{issue_body}")
+    retrieved_paths = {path: "" for path in _CONTEXT_HEADER_PATTERN.findall(repository_context)}
+    context_scope = classify_change_scope(retrieved_paths)
+
+    if text_scope == "unknown":
+        return context_scope
+    if text_scope == "fullstack" or context_scope in {"unknown", "fullstack", text_scope}:
+        return text_scope
+    # Texto aponta um lado e todos os arquivos recuperados o outro: na duvida, pipeline completo.
+    return "fullstack"
@@ -0,0 +1,197 @@
+import logging
+import shutil
+import threading
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+from domain.models import ChangePreview, ChangeSet, FileChangeStat
+from domain.payload.errors import contract_error
+from infrastructure.github.github_client import GitHubClient
+from infrastructure.observability.logging_utils import log_event
+from infrastructure.repo.change_preview import build_change_preview
+from infrastructure.repo.plumbing_publish import DEFAULT_FILE_MODE, classify_against_head
+from infrastructure.repo.search_index import (
+    build_path_index,
+    format_context,
+    rank_documents,
+    resolve_context_limits,
+    tokenize,
+)
+from infrastructure.repo.tree_summary import build_tree_summary, resolve_tree_token_budget
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RemoteTreeEntry:
+    path: str
+    mode: str
+    blob_sha: str
+    size_bytes: int
+
+
+class GitDataRepository:
+    # Workflow sem clone: arvore via Trees API, blobs sob demanda e commit via Git Data API.
+    def __init__(
+        self,
+        client: GitHubClient,
+        *,
+        base_branch: str,
+        git_author_name: str,
+        git_author_email: str,
+    ) -> None:
+        self.client = client
+        self.base_branch = base_branch
+        self.author = {"name": git_author_name, "email": git_author_email}
+        self._lock = threading.Lock()
+        self._base_commit_sha: str | None = None
+        self._base_tree_sha: str | None = None
+        self._entries: dict[str, RemoteTreeEntry] = {}
+
+    def prepare(self, owner: str, repo: str, repo_dir: Path) -> None:
+        # Mesmo contrato de clone_repo: o diretorio so recebe os blobs usados como contexto.
+        if repo_dir.exists():
+            shutil.rmtree(repo_dir)
+        repo_dir.mkdir(parents=True)
+
+        base_commit_sha = self.client.get_branch_head(self.base_branch)
+        if base_commit_sha is None:
+            raise RuntimeError(
+                f"Base branch '{self.base_branch}' not found in {owner}/{repo}"
+            )
+        base_tree_sha = self.client.get_commit_tree_sha(base_commit_sha)
+        tree = self.client.get_tree(base_tree_sha)
+        entries = {
+            str(item["path"]): RemoteTreeEntry(
+                path=str(item["path"]),
+                mode=str(item["mode"]),
+                blob_sha=str(item["sha"]),
+                size_bytes=int(item.get("size") or 0),
+            )
+            for item in tree.get("tree", [])
+            if item.get("type") == "blob"
+        }
+        with self._lock:
+            self._base_commit_sha = base_commit_sha
+            self._base_tree_sha = base_tree_sha
+            self._entries = entries
+        log_event(
+            logger,
+            logging.WARNING if tree.get("truncated") else logging.INFO,
+            "github.git_data.prepared",
+            commit=base_commit_sha,
+            files_count=len(entries),
+            truncated=bool(tree.get("truncated")),
+        )
+
+    def git_setup(self, _repo_dir: Path) -> None:
+        # Sem repositorio local: o autor vai direto no payload do commit.
+        return None
+
+    def _require_base(self) -> tuple[str, str]:
+        if self._base_commit_sha is None or self._base_tree_sha is None:
+            raise RuntimeError("Repository was not prepared: base tree is unknown")
+        return self._base_commit_sha, self._base_tree_sha
+
+    def base_commit_sha(self, _repo_dir: Path) -> str | None:
+        return self._base_commit_sha
+
+    def tree_summary(self, _repo_dir: Path) -> str:
+        self._require_base()
+        return build_tree_summary(list(self._entries), resolve_tree_token_budget())
+
+    def _materialize(self, repo_dir: Path, entry: RemoteTreeEntry) -> None:
+        target_file_path = repo_dir / entry.path
+        target_file_path.parent.mkdir(parents=True, exist_ok=True)
+        target_file_path.write_bytes(self.client.get_blob(entry.blob_sha))
+
+    def retrieve_context(self, repo_dir: Path, issue_title: str, issue_body: str) -> str:
+        token_budget, top_k, max_file_bytes = resolve_context_limits()
+        if token_budget <= 0 or top_k <= 0:
+            return ""
+
+        # Ranqueia so pelos paths e baixa apenas os blobs dos arquivos selecionados.
+        query_terms = tokenize(f"{issue_title}\n{issue_body}")
+        hits = rank_documents(build_path_index(list(self._entries)), query_terms, top_k)
+        fetched_count = 0
+        for hit in hits:
+            entry = self._entries[hit.path]
+            if entry.size_bytes <= max_file_bytes:
+                self._materialize(repo_dir, entry)
+                fetched_count += 1
+        repository_context = format_context(
+            repo_dir,
+            hits,
+            query_terms,
+            token_budget,
+            max_file_bytes,
+        )
+        log_event(
+            logger,
+            logging.INFO,
+            "repo.context.retrieved",
+            hits_count=len(hits),
+            paths=[hit.path for hit in hits],
+            fetched_blobs_count=fetched_count,
+        )
+        return repository_context
+
+    def read_file(self, _repo_dir: Path, path: str) -> str | None:
+        self._require_base()
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        try:
+            return self.client.get_blob(entry.blob_sha).decode("utf-8")
+        except UnicodeDecodeError as error:
+            raise contract_error(
+                f"patch for '{path}' targets a file that is not UTF-8 text; "
+                "send its FULL content in 'files' instead"
+            ) from error
+
+    def _write_base_files(self, paths: list[str], base_dir: Path) -> None:
+        for path in paths:
+            entry = self._entries.get(path)
+            if entry is not None:
+                self._materialize(base_dir, entry)
+
+    def preview_change_set(self, _repo_dir: Path, change_set: ChangeSet) -> ChangePreview:
+        self._require_base()
+        return build_change_preview(
+            change_set.files,
+            partial(self._write_base_files, sorted(change_set.files)),
+        )
+
+    def commit_change_set(self, _repo_dir: Path, change_set: ChangeSet) -> list[FileChangeStat]:
+        base_commit_sha, base_tree_sha = self._require_base()
+        existing_blobs = {
+            path: (self._entries[path].mode, self._entries[path].blob_sha)
+            for path in change_set.files
+            if path in self._entries
+        }
+        file_changes = classify_against_head(change_set.files, existing_blobs)
+        changed_paths = [
+            file_change.path for file_change in file_changes if file_change.status != "unchanged"
+        ]
+        if not changed_paths:
+            return file_changes
+
+        tree_entries = []
+        for path in changed_paths:
+            blob_sha = self.client.create_blob(change_set.files[path].encode("utf-8"))
+            mode = existing_blobs[path][0] if path in existing_blobs else DEFAULT_FILE_MODE
+            tree_entries.append({"path": path, "mode": mode, "type": "blob", "sha": blob_sha})
+        tree_sha = self.client.create_tree(base_tree_sha, tree_entries)
+        commit_sha = self.client.create_commit(
+            message=change_set.commit,
+            tree_sha=tree_sha,
+            parent_sha=base_commit_sha,
+            author=self.author,
+        )
+        self.client.create_branch_ref(change_set.branch, commit_sha)
+        return file_changes
+
+    def branch_exists(self, branch: str, _repo_dir: Path) -> bool:
+        return self.client.get_branch_head(branch) is not None
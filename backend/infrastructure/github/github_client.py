@@ -1,48 +1,230 @@
+import asyncio
+import base64
 import logging
+import os
+from typing import Any
 
-import requests
+import httpx
 
+from infrastructure.github.http_pool import get_client_pool, token_fingerprint
+from infrastructure.github.rate_limit import get_rate_limit_scheduler
+from infrastructure.github.response_cache import (
+    CachedResponse,
+    build_cache_key,
+    get_response_cache,
+)
 from infrastructure.observability.logging_utils import log_event, safe_message
 
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_GITHUB_API_URL = "https://api.github.com"
 
-class GitHubClient:
-    def __init__(self, *, token: str, owner: str, repo: str) -> None:
+
+def resolve_github_api_url() -> str:
+    # Permite apontar para GitHub Enterprise ou para um servidor fake em testes locais.
+    return os.getenv("GITHUB_API_URL", DEFAULT_GITHUB_API_URL).rstrip("/")
+
+
+def resolve_graphql_url(api_url: str) -> str:
+    # GitHub Enterprise expoe REST em /api/v3 e GraphQL em /api/graphql.
+    if api_url.endswith("/api/v3"):
+        return f"{api_url.removesuffix('/v3')}/graphql"
+    return f"{api_url}/graphql"
+
+
+def _error_details(response: httpx.Response) -> str:
+    error_details = response.text
+    try:
+        error_payload = response.json()
+        api_message = error_payload.get("message", "")
+        api_errors = error_payload.get("errors", "")
+        error_details = f"{api_message} | errors={api_errors}"
+    except ValueError:
+        pass
+    return safe_message(error_details)
+
+
+class AsyncGitHubClient:
+    def __init__(
+        self,
+        *,
+        token: str,
+        owner: str,
+        repo: str,
+        api_url: str | None = None,
+    ) -> None:
         self.token = token
         self.owner = owner
         self.repo = repo
-        self.base = f"https://api.github.com/repos/{self.owner}/{self.repo}"
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Authorization": f"Bearer {self.token}",
-                "Accept": "application/vnd.github+json",
-                "X-GitHub-Api-Version": "2022-11-28",
-            }
+        self.api_url = (api_url or resolve_github_api_url()).rstrip("/")
+        self.base = f"/repos/{self.owner}/{self.repo}"
+        self.http_client = get_client_pool().client_for(token, self.api_url)
+        self.response_cache = get_response_cache()
+        self.rate_limit_scheduler = get_rate_limit_scheduler()
+        self.quota_key = f"{token_fingerprint(token)}@{self.api_url}"
+        # GraphQL tem cota propria (pontos por hora), contabilizada separada da REST.
+        self.graphql_quota_key = f"{self.quota_key}/graphql"
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        idempotent: bool | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        return await self._send(
+            method,
+            f"{self.base}{path}",
+            quota_key=self.quota_key,
+            idempotent=idempotent,
+            **kwargs,
         )
 
-    def get_issue(self, number: int) -> dict[str, object]:
-        log_event(logger, logging.INFO, "github.issue.get", issue_number=number)
-        response = self.session.get(f"{self.base}/issues/{number}")
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        quota_key: str,
+        idempotent: bool | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        attempt = 0
+        while True:
+            await self.rate_limit_scheduler.wait_for_quota(quota_key)
+            try:
+                async with self.rate_limit_scheduler.concurrency_slot(quota_key):
+                    response = await self.http_client.request(method, url, **kwargs)
+            except httpx.TransportError as error:
+                retry_delay = self.rate_limit_scheduler.retry_delay(
+                    method,
+                    attempt,
+                    error=error,
+                    idempotent=idempotent,
+                )
+                if retry_delay is None:
+                    raise
+                retry_reason = type(error).__name__
+            else:
+                self.rate_limit_scheduler.record_response(quota_key, response)
+                retry_delay = self.rate_limit_scheduler.retry_delay(
+                    method,
+                    attempt,
+                    response=response,
+                    idempotent=idempotent,
+                )
+                if retry_delay is None:
+                    return response
+                retry_reason = str(response.status_code)
+
+            attempt += 1
+            log_event(
+                logger,
+                logging.WARNING,
+                "github.request.retry",
+                method=method,
+                path=url,
+                attempt=attempt,
+                reason=retry_reason,
+                delay_seconds=f"{retry_delay:.2f}",
+            )
+            await asyncio.sleep(retry_delay)
+
+    async def graphql(self, query: str, variables: dict[str, object]) -> dict[str, Any]:
+        # Consultas GraphQL sao leituras: POST retentavel como um GET.
+        response = await self._send(
+            "POST",
+            resolve_graphql_url(self.api_url),
+            quota_key=self.graphql_quota_key,
+            idempotent=True,
+            json={"query": query, "variables": variables},
+        )
+        if response.status_code >= 400:
+            raise RuntimeError(
+                safe_message(
+                    f"GitHub GraphQL request failed ({response.status_code}): "
+                    f"{_error_details(response)}"
+                )
+            )
+        payload = response.json()
+        if payload.get("errors"):
+            error_messages = "; ".join(str(error.get("message")) for error in payload["errors"])
+            raise RuntimeError(safe_message(f"GitHub GraphQL query failed: {error_messages}"))
+        return payload["data"]
+
+    async def get_repository_access(self) -> tuple[dict[str, object], list[str] | None]:
+        # Metadados do repo + escopos do token (header so existe para tokens classicos/OAuth).
+        log_event(logger, logging.INFO, "github.repository.get")
+        response = await self._request("GET", "")
+        if response.status_code >= 400:
+            raise RuntimeError(
+                safe_message(
+                    f"GitHub repository lookup failed ({response.status_code}): "
+                    f"{_error_details(response)}"
+                )
+            )
+        raw_scopes = response.headers.get("X-OAuth-Scopes")
+        scopes = None
+        if raw_scopes is not None:
+            scopes = [scope.strip() for scope in raw_scopes.split(",") if scope.strip()]
+        return response.json(), scopes
+
+    async def list_branches_with_prefix(self, prefix: str) -> list[str]:
+        matching_refs = await self._git_data_request("GET", f"matching-refs/heads/{prefix}")
+        return [str(ref["ref"]).removeprefix("refs/heads/") for ref in matching_refs]
+
+    async def _get_json_conditional(self, path: str) -> Any:
+        # GET condicional: 304 nao consome rate limit e devolve o payload ja decodificado do cache.
+        cache_key = build_cache_key(token_fingerprint(self.token), f"{self.api_url}{self.base}{path}")
+        cached_response = self.response_cache.get(cache_key)
+        request_headers = cached_response.conditional_headers() if cached_response else {}
+        response = await self._request("GET", path, headers=request_headers)
+        if response.status_code == 304 and cached_response is not None:
+            log_event(logger, logging.INFO, "github.response_cache.hit", path=path)
+            return cached_response.payload
+
         response.raise_for_status()
-        return response.json()
+        payload = response.json()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self.response_cache.put(
+                cache_key,
+                CachedResponse(etag=etag, last_modified=last_modified, payload=payload),
+            )
+        log_event(logger, logging.INFO, "github.response_cache.miss", path=path)
+        return payload
 
-    def create_pr(self, head: str, base: str, title: str, body: str) -> dict[str, object]:
+    async def get_issue(self, number: int) -> dict[str, object]:
+        log_event(logger, logging.INFO, "github.issue.get", issue_number=number)
+        return await self._get_json_conditional(f"/issues/{number}")
+
+    async def _find_open_pull_request(self, *, head: str, base: str) -> dict[str, object] | None:
+        response = await self._request(
+            "GET",
+            "/pulls",
+            params={"head": f"{self.owner}:{head}", "base": base, "state": "open"},
+        )
+        if response.status_code >= 400:
+            return None
+        pull_requests = response.json()
+        return pull_requests[0] if pull_requests else None
+
+    async def create_pr(self, head: str, base: str, title: str, body: str) -> dict[str, object]:
         log_event(logger, logging.INFO, "github.pr.create", head=head, base=base, title=title)
         payload = {"title": title, "head": head, "base": base, "body": body}
-        response = self.session.post(f"{self.base}/pulls", json=payload)
+        # Retentar o POST e seguro: um PR ja criado pela tentativa anterior e recuperado abaixo.
+        response = await self._request("POST", "/pulls", json=payload, idempotent=True)
+        if response.status_code == 422 and "already exists" in response.text:
+            # Retentativa apos falha de rede pode encontrar o PR ja criado: reaproveita o existente.
+            existing_pull_request = await self._find_open_pull_request(head=head, base=base)
+            if existing_pull_request is not None:
+                log_event(logger, logging.INFO, "github.pr.already_exists", head=head, base=base)
+                return existing_pull_request
         if response.status_code >= 400:
-            error_details = response.text
-            try:
-                error_payload = response.json()
-                api_message = error_payload.get("message", "")
-                api_errors = error_payload.get("errors", "")
-                error_details = f"{api_message} | errors={api_errors}"
-            except ValueError:
-                pass
-            safe_error_details = safe_message(error_details)
+            safe_error_details = _error_details(response)
             log_event(
                 logger,
                 logging.ERROR,
@@ -56,3 +238,145 @@ class GitHubClient:
                 )
             )
         return response.json()
+
+    async def _git_data_request(self, method: str, path: str, **kwargs: Any) -> Any:
+        response = await self._request(method, f"/git/{path}", **kwargs)
+        if response.status_code >= 400:
+            safe_error_details = _error_details(response)
+            log_event(
+                logger,
+                logging.ERROR,
+                "github.git_data.failed",
+                method=method,
+                path=path,
+                status_code=response.status_code,
+                details=safe_error_details,
+            )
+            raise RuntimeError(
+                safe_message(
+                    f"GitHub Git Data request failed ({response.status_code}): "
+                    f"{method} {path}: {safe_error_details}"
+                )
+            )
+        return response.json()
+
+    async def get_branch_head(self, branch: str) -> str | None:
+        # 404 significa branch inexistente; outros erros sobem normalmente.
+        response = await self._request("GET", f"/git/ref/heads/{branch}")
+        if response.status_code == 404:
+            return None
+        if response.status_code >= 400:
+            raise RuntimeError(
+                safe_message(
+                    f"GitHub ref lookup failed ({response.status_code}): {_error_details(response)}"
+                )
+            )
+        return response.json()["object"]["sha"]
+
+    async def get_commit_tree_sha(self, commit_sha: str) -> str:
+        return (await self._git_data_request("GET", f"commits/{commit_sha}"))["tree"]["sha"]
+
+    async def get_tree(self, tree_sha: str) -> dict[str, object]:
+        log_event(logger, logging.INFO, "github.tree.get", tree_sha=tree_sha)
+        return await self._git_data_request("GET", f"trees/{tree_sha}", params={"recursive": "1"})
+
+    async def get_blob(self, blob_sha: str) -> bytes:
+        blob = await self._git_data_request("GET", f"blobs/{blob_sha}")
+        if blob.get("encoding") == "base64":
+            return base64.b64decode(blob["content"])
+        return str(blob["content"]).encode("utf-8")
+
+    async def create_blob(self, data: bytes) -> str:
+        payload = {"content": base64.b64encode(data).decode("ascii"), "encoding": "base64"}
+        return (await self._git_data_request("POST", "blobs", json=payload))["sha"]
+
+    async def create_tree(self, base_tree_sha: str, entries: list[dict[str, str]]) -> str:
+        payload = {"base_tree": base_tree_sha, "tree": entries}
+        return (await self._git_data_request("POST", "trees", json=payload))["sha"]
+
+    async def create_commit(
+        self,
+        *,
+        message: str,
+        tree_sha: str,
+        parent_sha: str,
+        author: dict[str, str] | None = None,
+    ) -> str:
+        payload: dict[str, object] = {"message": message, "tree": tree_sha, "parents": [parent_sha]}
+        if author:
+            payload["author"] = author
+        return (await self._git_data_request("POST", "commits", json=payload))["sha"]
+
+    async def create_branch_ref(self, branch: str, commit_sha: str) -> None:
+        log_event(logger, logging.INFO, "github.ref.create", branch=branch, commit=commit_sha)
+        payload = {"ref": f"refs/heads/{branch}", "sha": commit_sha}
+        await self._git_data_request("POST", "refs", json=payload)
+
+
+class GitHubClient:
+    # Fachada sincrona para o flow: cada chamada roda no loop compartilhado do pool async.
+    def __init__(
+        self,
+        *,
+        token: str,
+        owner: str,
+        repo: str,
+        api_url: str | None = None,
+    ) -> None:
+        self.async_client = AsyncGitHubClient(token=token, owner=owner, repo=repo, api_url=api_url)
+        self._pool = get_client_pool()
+
+    def get_repository_access(self) -> tuple[dict[str, object], list[str] | None]:
+        return self._pool.run(self.async_client.get_repository_access())
+
+    def list_branches_with_prefix(self, prefix: str) -> list[str]:
+        return self._pool.run(self.async_client.list_branches_with_prefix(prefix))
+
+    def get_issue(self, number: int) -> dict[str, object]:
+        return self._pool.run(self.async_client.get_issue(number))
+
+    def graphql(self, query: str, variables: dict[str, object]) -> dict[str, Any]:
+        return self._pool.run(self.async_client.graphql(query, variables))
+
+    def create_pr(self, head: str, base: str, title: str, body: str) -> dict[str, object]:
+        return self._pool.run(
+            self.async_client.create_pr(head=head, base=base, title=title, body=body)
+        )
+
+    def get_branch_head(self, branch: str) -> str | None:
+        return self._pool.run(self.async_client.get_branch_head(branch))
+
+    def get_commit_tree_sha(self, commit_sha: str) -> str:
+        return self._pool.run(self.async_client.get_commit_tree_sha(commit_sha))
+
+    def get_tree(self, tree_sha: str) -> dict[str, object]:
+        return self._pool.run(self.async_client.get_tree(tree_sha))
+
+    def get_blob(self, blob_sha: str) -> bytes:
+        return self._pool.run(self.async_client.get_blob(blob_sha))
+
+    def create_blob(self, data: bytes) -> str:
+        return self._pool.run(self.async_client.create_blob(data))
+
+    def create_tree(self, base_tree_sha: str, entries: list[dict[str, str]]) -> str:
+        return self._pool.run(self.async_client.create_tree(base_tree_sha, entries))
+
+    def create_commit(
+        self,
+        *,
+        message: str,
+        tree_sha: str,
+        parent_sha: str,
+        author: dict[str, str] | None = None,
+    ) -> str:
+        return self._pool.run(
+            self.async_client.create_commit(
+                message=message,
+                tree_sha=tree_sha,
+                parent_sha=parent_sha,
+                author=author,
+            )
+        )
+
+    def create_branch_ref(self, branch: str, commit_sha: str) -> None:
+        self._pool.run(self.async_client.create_branch_ref(branch, commit_sha))
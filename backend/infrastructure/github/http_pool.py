@@ -0,0 +1,153 @@
+import asyncio
+import contextvars
+import hashlib
+import importlib.util
+import logging
+import os
+import threading
+from collections.abc import Coroutine
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, TypeVar
+
+import httpx
+
+from infrastructure.observability.logging_utils import log_event
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+DEFAULT_READ_TIMEOUT_SECONDS = 30.0
+DEFAULT_POOL_TIMEOUT_SECONDS = 10.0
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+
+_ResultT = TypeVar("_ResultT")
+
+
+def resolve_http_timeout() -> httpx.Timeout:
+    connect_timeout = float(
+        os.getenv("GITHUB_HTTP_CONNECT_TIMEOUT_SECONDS", str(DEFAULT_CONNECT_TIMEOUT_SECONDS))
+    )
+    read_timeout = float(
+        os.getenv("GITHUB_HTTP_READ_TIMEOUT_SECONDS", str(DEFAULT_READ_TIMEOUT_SECONDS))
+    )
+    return httpx.Timeout(
+        read_timeout,
+        connect=connect_timeout,
+        pool=DEFAULT_POOL_TIMEOUT_SECONDS,
+    )
+
+
+def resolve_http2_enabled() -> bool:
+    # HTTP/2 exige o pacote opcional `h2`; sem ele o pool segue em HTTP/1.1 com keep-alive.
+    http2_requested = os.getenv("GITHUB_HTTP2", "true").strip().lower() not in {"0", "false", "no"}
+    return http2_requested and importlib.util.find_spec("h2") is not None
+
+
+def token_fingerprint(token: str) -> str:
+    # O pool e indexado por hash do token: o segredo nao fica exposto como chave.
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+
+class _EventLoopThread:
+    # Loop asyncio dedicado: clientes sincronos (flow em thread) compartilham as conexoes async.
+    def __init__(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="github-http-loop",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def run(self, coroutine: Coroutine[Any, Any, _ResultT]) -> _ResultT:
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Synchronous GitHub call made from the HTTP event loop thread")
+
+        # Propaga o contexto (request_id) para os logs emitidos dentro da corrotina.
+        context = contextvars.copy_context()
+        result_future: Future[_ResultT] = Future()
+
+        def _transfer_result(task: asyncio.Task[_ResultT]) -> None:
+            if task.cancelled():
+                result_future.cancel()
+            elif task.exception() is not None:
+                result_future.set_exception(task.exception())
+            else:
+                result_future.set_result(task.result())
+
+        def _start_task() -> None:
+            task = self._loop.create_task(coroutine, context=context)
+            task.add_done_callback(_transfer_result)
+
+        self._loop.call_soon_threadsafe(_start_task)
+        return result_future.result()
+
+
+class AsyncClientPool:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._event_loop_thread: _EventLoopThread | None = None
+        self._clients: dict[tuple[str, str], httpx.AsyncClient] = {}
+
+    def _event_loop(self) -> _EventLoopThread:
+        with self._lock:
+            if self._event_loop_thread is None:
+                self._event_loop_thread = _EventLoopThread()
+            return self._event_loop_thread
+
+    def run(self, coroutine: Coroutine[Any, Any, _ResultT]) -> _ResultT:
+        return self._event_loop().run(coroutine)
+
+    def client_for(self, token: str, api_url: str) -> httpx.AsyncClient:
+        # Um AsyncClient (e seu pool de conexoes) por token/host, reaproveitado entre requests.
+        pool_key = (token_fingerprint(token), api_url)
+        with self._lock:
+            client = self._clients.get(pool_key)
+            if client is None:
+                http2_enabled = resolve_http2_enabled()
+                client = httpx.AsyncClient(
+                    base_url=api_url,
+                    headers={
+                        "Authorization": f"Bearer {token}",
+                        "Accept": "application/vnd.github+json",
+                        "X-GitHub-Api-Version": "2022-11-28",
+                    },
+                    http2=http2_enabled,
+                    timeout=resolve_http_timeout(),
+                    limits=httpx.Limits(
+                        max_connections=DEFAULT_MAX_CONNECTIONS,
+                        max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+                    ),
+                )
+                self._clients[pool_key] = client
+                log_event(
+                    logger,
+                    logging.INFO,
+                    "github.http_pool.client_created",
+                    host=api_url,
+                    http2=http2_enabled,
+                    clients_count=len(self._clients),
+                )
+            return client
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            event_loop_thread = self._event_loop_thread
+        if event_loop_thread is None:
+            return
+        for client in clients:
+            event_loop_thread.run(client.aclose())
+
+
+@lru_cache(maxsize=1)
+def get_client_pool() -> AsyncClientPool:
+    return AsyncClientPool()
@@ -0,0 +1,170 @@
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from application.issue_flow import IssueData
+from domain.payload.branch_policy import GENERATED_BRANCH_NAMESPACE, issue_branch_prefix
+from infrastructure.github.github_client import GitHubClient
+from infrastructure.observability.logging_utils import log_event
+
+
+logger = logging.getLogger(__name__)
+
+ISSUE_LOADER_GRAPHQL = "graphql"
+ISSUE_LOADER_REST = "rest"
+DEFAULT_ISSUE_LOADER = ISSUE_LOADER_GRAPHQL
+MAX_ISSUE_LABELS = 20
+MAX_ISSUE_COMMENTS = 10
+MAX_ISSUE_BRANCHES = 50
+
+# Issue, labels, comentarios, branch default/base, ref que bloquearia o namespace gerado e
+# PRs abertos das branches da issue.
+ISSUE_CONTEXT_QUERY = """
+query IssueContext(
+  $owner: String!
+  $name: String!
+  $number: Int!
+  $baseRef: String!
+  $namespaceRef: String!
+  $branchNamespace: String!
+  $branchQuery: String!
+  $labelsLimit: Int!
+  $commentsLimit: Int!
+  $branchesLimit: Int!
+) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef { name }
+    baseRef: ref(qualifiedName: $baseRef) { name }
+    namespaceRef: ref(qualifiedName: $namespaceRef) { name }
+    issue(number: $number) {
+      title
+      body
+      labels(first: $labelsLimit) { nodes { name } }
+      comments(last: $commentsLimit) { nodes { author { login } body } }
+    }
+    issueBranches: refs(refPrefix: $branchNamespace, query: $branchQuery, first: $branchesLimit) {
+      pageInfo { hasNextPage }
+      nodes {
+        name
+        associatedPullRequests(states: OPEN, first: 1) { nodes { url } }
+      }
+    }
+  }
+}
+"""
+
+
+def resolve_issue_loader() -> str:
+    return os.getenv("GITHUB_ISSUE_LOADER", DEFAULT_ISSUE_LOADER).strip().lower()
+
+
+def _nodes(connection: dict[str, Any] | None) -> list[dict[str, Any]]:
+    if not connection:
+        return []
+    return [node for node in connection.get("nodes") or [] if node]
+
+
+def to_issue_data(repository: dict[str, Any], issue_number: int) -> IssueData:
+    issue = repository.get("issue")
+    if issue is None:
+        raise RuntimeError(f"Issue #{issue_number} not found")
+
+    issue_prefix = issue_branch_prefix(issue_number)
+    issue_branches: list[str] = []
+    open_pull_requests: dict[str, str] = {}
+    branch_connection = repository.get("issueBranches") or {}
+    for ref in _nodes(branch_connection):
+        # O filtro `query` do GitHub e aproximado: mantem so as branches com o prefixo exato.
+        branch = f"{GENERATED_BRANCH_NAMESPACE}/{ref['name']}"
+        if not branch.startswith(issue_prefix):
+            continue
+        issue_branches.append(branch)
+        pull_requests = _nodes(ref.get("associatedPullRequests"))
+        if pull_requests:
+            open_pull_requests[branch] = pull_requests[0]["url"]
+    has_more_branches = bool((branch_connection.get("pageInfo") or {}).get("hasNextPage"))
+
+    default_branch_ref = repository.get("defaultBranchRef")
+    return {
+        "title": issue["title"],
+        "body": issue.get("body"),
+        "labels": [label["name"] for label in _nodes(issue.get("labels"))],
+        "comments": [
+            {
+                "author": (comment.get("author") or {}).get("login"),
+                "body": comment.get("body") or "",
+            }
+            for comment in _nodes(issue.get("comments"))
+        ],
+        "default_branch": default_branch_ref["name"] if default_branch_ref else None,
+        "base_branch_exists": repository.get("baseRef") is not None,
+        "branch_namespace_blocked": repository.get("namespaceRef") is not None,
+        # Lista paginada incompleta nao serve como snapshot: o flow volta a consultar o remoto.
+        "issue_branches": None if has_more_branches else issue_branches,
+        "open_pull_requests": open_pull_requests,
+    }
+
+
+class GraphQLIssueLoader:
+    # Uma unica consulta substitui get_issue + checagem da base + busca de PR existente.
+    # O snapshot e compartilhado com o preflight do mesmo run (uma consulta por issue).
+    def __init__(self, client: GitHubClient, *, base_branch: str) -> None:
+        self.client = client
+        self.base_branch = base_branch
+        self._lock = threading.Lock()
+        self._snapshots: dict[int, Future[IssueData]] = {}
+
+    def get_issue(self, number: int) -> IssueData:
+        with self._lock:
+            snapshot = self._snapshots.get(number)
+            owns_query = snapshot is None
+            if snapshot is None:
+                snapshot = self._snapshots[number] = Future()
+        if owns_query:
+            try:
+                snapshot.set_result(self._query_issue(number))
+            except Exception as error:
+                snapshot.set_exception(error)
+        return snapshot.result()
+
+    def _query_issue(self, number: int) -> IssueData:
+        log_event(logger, logging.INFO, "github.issue.graphql", issue_number=number)
+        data = self.client.graphql(
+            ISSUE_CONTEXT_QUERY,
+            {
+                "owner": self.client.async_client.owner,
+                "name": self.client.async_client.repo,
+                "number": number,
+                "baseRef": f"refs/heads/{self.base_branch}",
+                "namespaceRef": f"refs/heads/{GENERATED_BRANCH_NAMESPACE}",
+                "branchNamespace": f"refs/heads/{GENERATED_BRANCH_NAMESPACE}/",
+                "branchQuery": issue_branch_prefix(number).removeprefix(
+                    f"{GENERATED_BRANCH_NAMESPACE}/"
+                ),
+                "labelsLimit": MAX_ISSUE_LABELS,
+                "commentsLimit": MAX_ISSUE_COMMENTS,
+                "branchesLimit": MAX_ISSUE_BRANCHES,
+            },
+        )
+        repository = data.get("repository")
+        if repository is None:
+            raise RuntimeError("Repository not found or not accessible with the provided token")
+        return to_issue_data(repository, number)
+
+
+def build_get_issue(github_client: GitHubClient, *, base_branch: str) -> Callable[[int], IssueData]:
+    issue_loader = resolve_issue_loader()
+    if issue_loader == ISSUE_LOADER_GRAPHQL:
+        return GraphQLIssueLoader(github_client, base_branch=base_branch).get_issue
+    if issue_loader == ISSUE_LOADER_REST:
+        return github_client.get_issue
+    raise RuntimeError(f"Unsupported GITHUB_ISSUE_LOADER: {issue_loader}")
+
+
+def issue_snapshot_loader(get_issue: Callable[[int], IssueData]) -> Callable[[int], IssueData] | None:
+    # So o loader GraphQL traz base/branches da issue; no REST o preflight consulta o GitHub.
+    if isinstance(getattr(get_issue, "__self__", None), GraphQLIssueLoader):
+        return get_issue
+    return None
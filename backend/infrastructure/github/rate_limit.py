@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+import httpx
+
+from infrastructure.observability.logging_utils import log_event
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE_SECONDS = 1.0
+DEFAULT_MAX_WAIT_SECONDS = 60.0
+DEFAULT_QUOTA_RESERVE = 10
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class QuotaState:
+    limit: int
+    remaining: int
+    reset_at: float
+
+
+def _is_rate_limited(response: httpx.Response) -> bool:
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    # 403 de rate limit: cota primaria zerada ou limite secundario (abuse detection).
+    if response.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in response.headers:
+        return True
+    return "rate limit" in response.text.lower()
+
+
+class RateLimitScheduler:
+    # Estado de cota por token/host compartilhado entre todos os clientes do processo.
+    def __init__(
+        self,
+        *,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base_seconds: float = DEFAULT_BACKOFF_BASE_SECONDS,
+        max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+        quota_reserve: int = DEFAULT_QUOTA_RESERVE,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.quota_reserve = quota_reserve
+        self.max_concurrent_requests = max_concurrent_requests
+        self._lock = threading.Lock()
+        self._quota_by_key: dict[str, QuotaState] = {}
+        self._blocked_until_by_key: dict[str, float] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def concurrency_slot(self, quota_key: str) -> asyncio.Semaphore:
+        # Limita chamadas simultaneas por token: rajadas paralelas disparam o limite secundario.
+        with self._lock:
+            semaphore = self._semaphores.get(quota_key)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+                self._semaphores[quota_key] = semaphore
+            return semaphore
+
+    def _delay_before_request(self, quota_key: str) -> float:
+        now = time.time()
+        with self._lock:
+            blocked_until = self._blocked_until_by_key.get(quota_key, 0.0)
+            quota = self._quota_by_key.get(quota_key)
+        delay_seconds = max(blocked_until - now, 0.0)
+        if quota is not None and quota.remaining <= self.quota_reserve and quota.reset_at > now:
+            delay_seconds = max(delay_seconds, quota.reset_at - now)
+        return delay_seconds
+
+    async def wait_for_quota(self, quota_key: str) -> None:
+        delay_seconds = self._delay_before_request(quota_key)
+        if delay_seconds <= 0:
+            return
+        if delay_seconds > self.max_wait_seconds:
+            # Espera longa demais: segue e deixa o GitHub responder (erro explicito ao caller).
+            log_event(
+                logger,
+                logging.WARNING,
+                "github.rate_limit.wait_skipped",
+                delay_seconds=f"{delay_seconds:.1f}",
+                max_wait_seconds=self.max_wait_seconds,
+            )
+            return
+        log_event(
+            logger,
+            logging.WARNING,
+            "github.rate_limit.waiting",
+            delay_seconds=f"{delay_seconds:.1f}",
+        )
+        await asyncio.sleep(delay_seconds)
+
+    def record_response(self, quota_key: str, response: httpx.Response) -> None:
+        headers = response.headers
+        if "X-RateLimit-Remaining" in headers:
+            quota = QuotaState(
+                limit=int(headers.get("X-RateLimit-Limit", "0")),
+                remaining=int(headers["X-RateLimit-Remaining"]),
+                reset_at=float(headers.get("X-RateLimit-Reset", "0")),
+            )
+            with self._lock:
+                self._quota_by_key[quota_key] = quota
+            log_event(
+                logger,
+                logging.WARNING if quota.remaining <= self.quota_reserve else logging.INFO,
+                "github.rate_limit.quota",
+                resource=headers.get("X-RateLimit-Resource"),
+                limit=quota.limit,
+                remaining=quota.remaining,
+                reset_in_seconds=max(int(quota.reset_at - time.time()), 0),
+            )
+        if _is_rate_limited(response):
+            retry_after_seconds = self._rate_limit_delay(response)
+            with self._lock:
+                self._blocked_until_by_key[quota_key] = time.time() + retry_after_seconds
+
+    def _rate_limit_delay(self, response: httpx.Response) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        reset_at = response.headers.get("X-RateLimit-Reset")
+        if response.headers.get("X-RateLimit-Remaining") == "0" and reset_at:
+            return max(float(reset_at) - time.time(), 0.0) + 1.0
+        # Limite secundario sem header: a documentacao do GitHub pede ao menos 1 minuto.
+        return 60.0
+
+    def _backoff_delay(self, attempt: int) -> float:
+        # Backoff exponencial com jitter "full": evita que workflows paralelos retentem juntos.
+        return random.uniform(0, self.backoff_base_seconds * (2**attempt))
+
+    def retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        *,
+        response: httpx.Response | None = None,
+        error: Exception | None = None,
+        idempotent: bool | None = None,
+    ) -> float | None:
+        if attempt >= self.max_retries:
+            return None
+        if response is not None and _is_rate_limited(response):
+            # Requisicao recusada por limite nao foi processada: seguro retentar qualquer metodo.
+            delay_seconds = self._rate_limit_delay(response)
+            return delay_seconds if delay_seconds <= self.max_wait_seconds else None
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        if not idempotent:
+            return None
+        if error is not None and isinstance(error, httpx.TransportError):
+            return self._backoff_delay(attempt)
+        if response is not None and response.status_code in RETRYABLE_STATUS_CODES:
+            return self._backoff_delay(attempt)
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_rate_limit_scheduler() -> RateLimitScheduler:
+    return RateLimitScheduler(
+        max_retries=int(os.getenv("GITHUB_MAX_RETRIES", str(DEFAULT_MAX_RETRIES))),
+        backoff_base_seconds=float(
+            os.getenv("GITHUB_RETRY_BACKOFF_SECONDS", str(DEFAULT_BACKOFF_BASE_SECONDS))
+        ),
+        max_wait_seconds=float(
+            os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS", str(DEFAULT_MAX_WAIT_SECONDS))
+        ),
+        quota_reserve=int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", str(DEFAULT_QUOTA_RESERVE))),
+        max_concurrent_requests=int(
+            os.getenv("GITHUB_MAX_CONCURRENT_REQUESTS", str(DEFAULT_MAX_CONCURRENT_REQUESTS))
+        ),
+    )
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from infrastructure.observability.logging_utils import log_event
+from infrastructure.storage.atomic_file import write_cache_file
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: str | None
+    last_modified: str | None
+    payload: Any
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def build_cache_key(token_fingerprint: str, url: str) -> str:
+    # Tokens diferentes podem enxergar conteudos diferentes: o token entra na chave.
+    return hashlib.sha256(f"{token_fingerprint}\0{url}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    # LRU em memoria com espelho opcional em disco (sobrevive a restart do processo).
+    # O disco respeita o mesmo max_entries, pela ordem de uso (mtime).
+    def __init__(self, *, max_entries: int = DEFAULT_MAX_ENTRIES, disk_dir: Path | None = None) -> None:
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    def _disk_path(self, cache_key: str) -> Path | None:
+        if self.disk_dir is None:
+            return None
+        return self.disk_dir / f"{cache_key}.json"
+
+    def _load_from_disk(self, cache_key: str) -> CachedResponse | None:
+        disk_path = self._disk_path(cache_key)
+        if disk_path is None or not disk_path.exists():
+            return None
+        try:
+            entry = CachedResponse(**json.loads(disk_path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+        # mtime marca o ultimo uso; a entrada pode ter sido removida por outro processo.
+        try:
+            os.utime(disk_path)
+        except OSError:
+            pass
+        return entry
+
+    def _evict_disk(self) -> None:
+        disk_entries = []
+        for disk_path in self.disk_dir.glob("*.json"):
+            try:
+                disk_entries.append((disk_path.stat().st_mtime, disk_path))
+            except OSError:
+                continue
+        if len(disk_entries) <= self.max_entries:
+            return
+        disk_entries.sort()
+        evicted_entries = disk_entries[: len(disk_entries) - self.max_entries]
+        for _mtime, disk_path in evicted_entries:
+            disk_path.unlink(missing_ok=True)
+        log_event(
+            logger,
+            logging.INFO,
+            "github.response_cache.disk_evicted",
+            evicted_count=len(evicted_entries),
+        )
+
+    def _remember_locked(self, cache_key: str, entry: CachedResponse) -> None:
+        self._entries[cache_key] = entry
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, cache_key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                return entry
+        entry = self._load_from_disk(cache_key)
+        if entry is not None:
+            with self._lock:
+                self._remember_locked(cache_key, entry)
+        return entry
+
+    def put(self, cache_key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._remember_locked(cache_key, entry)
+        disk_path = self._disk_path(cache_key)
+        if disk_path is not None:
+            write_cache_file(disk_path, json.dumps(asdict(entry), ensure_ascii=False))
+            self._evict_disk()
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCache:
+    max_entries = int(os.getenv("GITHUB_RESPONSE_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES)))
+    raw_disk_dir = os.getenv("GITHUB_RESPONSE_CACHE_DIR", "").strip()
+    if raw_disk_dir:
+        Path(raw_disk_dir).mkdir(parents=True, exist_ok=True)
+    response_cache = ResponseCache(
+        max_entries=max_entries,
+        disk_dir=Path(raw_disk_dir) if raw_disk_dir else None,
+    )
+    log_event(
+        logger,
+        logging.INFO,
+        "github.response_cache.configured",
+        max_entries=max_entries,
+        disk_dir=raw_disk_dir or None,
+    )
+    return response_cache
@@ -4,25 +4,49 @@ import time
 import uuid
 import asyncio
 import json
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from queue import Empty
 from typing import Any
 
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import Response, StreamingResponse
 
+from infrastructure.ai.crew_cache import build_crew_output_cache
+from infrastructure.github.http_pool import get_client_pool
 from infrastructure.http.errors import to_http_exception
-from infrastructure.http.schemas import RunWorkflowRequest, RunWorkflowResponse
+from infrastructure.http.schemas import RunWorkflowRequest, RunWorkflowResponse, WebhookResponse
+from infrastructure.http.webhooks import start_webhook_dispatcher_from_env, verify_signature
 from infrastructure.http.workflow_service import execute_workflow
 from infrastructure.observability.context import reset_request_id, set_request_id
 from infrastructure.observability.event_stream import subscribe_request_events
 from infrastructure.observability.logging_utils import configure_logging, log_event
+from infrastructure.repo.mirror_cache import start_mirror_refresher_from_env
+from infrastructure.repo.symbol_outline import shutdown_outline_pool
 
 
 configure_logging()
 logger = logging.getLogger(__name__)
-app = FastAPI(title="POC AI PR Bot API")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    mirror_refresher = start_mirror_refresher_from_env()
+    webhook_dispatcher = start_webhook_dispatcher_from_env(execute_workflow)
+    app.state.webhook_dispatcher = webhook_dispatcher
+    try:
+        yield
+    finally:
+        if webhook_dispatcher is not None:
+            webhook_dispatcher.close()
+        if mirror_refresher is not None:
+            mirror_refresher.stop()
+        get_client_pool().close()
+        shutdown_outline_pool()
+
+
+app = FastAPI(title="POC AI PR Bot API", lifespan=lifespan)
 
 
 def _resolve_cors_origins() -> list[str]:
@@ -86,6 +110,14 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics/crew-cache")
+def crew_cache_metrics() -> dict[str, Any]:
+    crew_output_cache = build_crew_output_cache()
+    if crew_output_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **crew_output_cache.metrics()}
+
+
 @app.get("/workflow/stream/{request_id}")
 async def stream_workflow_logs(request_id: str, request: Request) -> StreamingResponse:
     event_queue, history, unsubscribe = subscribe_request_events(request_id)
@@ -130,3 +162,50 @@ def run_workflow(payload: RunWorkflowRequest, request: Request) -> RunWorkflowRe
     finally:
         if token is not None:
             reset_request_id(token)
+
+
+@app.post(
+    "/webhooks/github",
+    response_model=WebhookResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def github_webhook(request: Request) -> WebhookResponse:
+    webhook_dispatcher = getattr(request.app.state, "webhook_dispatcher", None)
+    if webhook_dispatcher is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="GitHub webhook is not configured",
+        )
+
+    # A assinatura e calculada sobre o corpo bruto, antes de qualquer parse.
+    body = await request.body()
+    if not verify_signature(
+        webhook_dispatcher.secret,
+        body,
+        request.headers.get("X-Hub-Signature-256"),
+    ):
+        log_event(logger, logging.WARNING, "webhook.signature_invalid")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid signature")
+
+    event_name = request.headers.get("X-GitHub-Event", "")
+    if event_name == "ping":
+        return WebhookResponse(status="pong")
+    try:
+        payload = json.loads(body)
+        if not isinstance(payload, dict):
+            raise TypeError("webhook payload must be a JSON object")
+        run_request = webhook_dispatcher.event_filter.to_run_request(event_name, payload)
+    except (ValueError, KeyError, TypeError, AttributeError) as error:
+        # AttributeError: objetos aninhados (issue, repository, label) com tipo inesperado.
+        log_event(logger, logging.WARNING, "webhook.payload_invalid", error=str(error))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid payload")
+    if run_request is None:
+        log_event(logger, logging.INFO, "webhook.event_ignored", event=event_name)
+        return WebhookResponse(status="ignored")
+
+    # So agenda: o run acontece no executor apos o debounce, fora do ciclo da resposta.
+    coalesced = webhook_dispatcher.coalescer.schedule(run_request)
+    return WebhookResponse(
+        status="coalesced" if coalesced else "scheduled",
+        issue_number=run_request.issue_number,
+    )
@@ -1,7 +1,7 @@
 from pathlib import Path
 
 from application.issue_flow import IssueFlowConfig, IssueFlowResult
-from infrastructure.http.schemas import RunWorkflowRequest, RunWorkflowResponse
+from infrastructure.http.schemas import DiffStatEntry, RunWorkflowRequest, RunWorkflowResponse
 
 
 def to_issue_flow_config(
@@ -16,10 +16,12 @@ def to_issue_flow_config(
         base_branch=payload.base_branch,
         repository_directory=repository_directory,
         dry_run=payload.dry_run,
+        bypass_crew_cache=payload.bypass_crew_cache,
     )
 
 
 def to_run_workflow_response(result: IssueFlowResult) -> RunWorkflowResponse:
+    preview = result.preview
     return RunWorkflowResponse(
         status=result.status,
         message=result.message,
@@ -27,4 +29,17 @@ def to_run_workflow_response(result: IssueFlowResult) -> RunWorkflowResponse:
         commit=result.commit,
         pr_title=result.pr_title,
         pr_url=result.pr_url,
+        diff=preview.diff if preview else None,
+        diffstat=[
+            DiffStatEntry(
+                path=file_stat.path,
+                status=file_stat.status,
+                additions=file_stat.additions,
+                deletions=file_stat.deletions,
+            )
+            for file_stat in preview.files
+        ]
+        if preview
+        else None,
+        diff_truncated=preview.truncated if preview else False,
     )
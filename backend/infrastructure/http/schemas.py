@@ -7,6 +7,14 @@ class RunWorkflowRequest(BaseModel):
     issue_number: int = Field(..., gt=0)
     base_branch: str = Field(default="main", min_length=1)
     dry_run: bool = False
+    bypass_crew_cache: bool = False
+
+
+class DiffStatEntry(BaseModel):
+    path: str
+    status: str
+    additions: int
+    deletions: int
 
 
 class RunWorkflowResponse(BaseModel):
@@ -16,3 +24,11 @@ class RunWorkflowResponse(BaseModel):
     commit: str | None = None
     pr_title: str | None = None
     pr_url: str | None = None
+    diff: str | None = None
+    diffstat: list[DiffStatEntry] | None = None
+    diff_truncated: bool = False
+
+
+class WebhookResponse(BaseModel):
+    status: str
+    issue_number: int | None = None
@@ -0,0 +1,225 @@
+import hashlib
+import hmac
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from infrastructure.http.schemas import RunWorkflowRequest
+from infrastructure.observability.context import reset_request_id, set_request_id
+from infrastructure.observability.logging_utils import log_event
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE_SECONDS = 30.0
+DEFAULT_MAX_CONCURRENT_RUNS = 2
+DEFAULT_TRIGGER_ACTIONS = "opened,labeled"
+SIGNATURE_PREFIX = "sha256="
+
+IssueRunKey = tuple[str, str, int]
+
+
+def verify_signature(secret: str, body: bytes, signature_header: str | None) -> bool:
+    # X-Hub-Signature-256: HMAC-SHA256 do corpo bruto com o segredo do webhook.
+    if not signature_header or not signature_header.startswith(SIGNATURE_PREFIX):
+        return False
+    expected_signature = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected_signature, signature_header.removeprefix(SIGNATURE_PREFIX))
+
+
+def _parse_csv(raw_value: str) -> frozenset[str]:
+    return frozenset(item.strip().lower() for item in raw_value.split(",") if item.strip())
+
+
+class IssueEventFilter:
+    def __init__(
+        self,
+        *,
+        trigger_actions: frozenset[str],
+        trigger_label: str | None = None,
+        dry_run: bool = False,
+    ) -> None:
+        self.trigger_actions = trigger_actions
+        self.trigger_label = trigger_label
+        self.dry_run = dry_run
+
+    def to_run_request(self, event_name: str, payload: dict[str, Any]) -> RunWorkflowRequest | None:
+        # Somente eventos `issues` com acao configurada (e label gatilho, se definida) disparam run.
+        if event_name != "issues" or payload.get("action") not in self.trigger_actions:
+            return None
+        issue = payload.get("issue") or {}
+        if issue.get("pull_request") is not None or issue.get("state") == "closed":
+            return None
+        if self.trigger_label is not None:
+            issue_labels = {str(label.get("name", "")).lower() for label in issue.get("labels", [])}
+            if self.trigger_label not in issue_labels:
+                return None
+            added_label = str((payload.get("label") or {}).get("name", "")).lower()
+            if payload["action"] == "labeled" and added_label != self.trigger_label:
+                return None
+
+        repository = payload.get("repository") or {}
+        return RunWorkflowRequest(
+            owner=repository["owner"]["login"],
+            repo=repository["name"],
+            issue_number=issue["number"],
+            base_branch=repository.get("default_branch") or "main",
+            dry_run=self.dry_run,
+        )
+
+
+class WebhookRunCoalescer:
+    # Debounce por issue: rajadas de eventos viram um unico run, disparado apos o silencio.
+    def __init__(
+        self,
+        run_workflow: Callable[[RunWorkflowRequest], object],
+        *,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+        max_concurrent_runs: int = DEFAULT_MAX_CONCURRENT_RUNS,
+    ) -> None:
+        self.run_workflow = run_workflow
+        self.debounce_seconds = debounce_seconds
+        self._lock = threading.Lock()
+        self._timers: dict[IssueRunKey, threading.Timer] = {}
+        self._running: set[IssueRunKey] = set()
+        self._rerun_after_current: dict[IssueRunKey, RunWorkflowRequest] = {}
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_runs,
+            thread_name_prefix="webhook-run",
+        )
+
+    def schedule(self, run_request: RunWorkflowRequest) -> bool:
+        # Retorna True quando o evento foi absorvido por um run ainda pendente.
+        run_key = (run_request.owner, run_request.repo, run_request.issue_number)
+        timer = threading.Timer(self.debounce_seconds, self._fire, args=(run_key, run_request))
+        timer.daemon = True
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Webhook dispatcher is closed")
+            previous_timer = self._timers.pop(run_key, None)
+            if previous_timer is not None:
+                previous_timer.cancel()
+            coalesced = previous_timer is not None or run_key in self._rerun_after_current
+            self._rerun_after_current.pop(run_key, None)
+            self._timers[run_key] = timer
+            timer.start()
+        log_event(
+            logger,
+            logging.INFO,
+            "webhook.run.coalesced" if coalesced else "webhook.run.scheduled",
+            owner=run_request.owner,
+            repo=run_request.repo,
+            issue_number=run_request.issue_number,
+            debounce_seconds=self.debounce_seconds,
+        )
+        return coalesced
+
+    def _fire(self, run_key: IssueRunKey, run_request: RunWorkflowRequest) -> None:
+        with self._lock:
+            if self._timers.get(run_key) is not threading.current_thread() or self._closed:
+                return
+            del self._timers[run_key]
+            if run_key in self._running:
+                # Run da mesma issue em andamento: reexecuta uma vez ao final, com o ultimo evento.
+                self._rerun_after_current[run_key] = run_request
+                return
+            self._running.add(run_key)
+            self._executor.submit(self._run, run_key, run_request)
+
+    def _run(self, run_key: IssueRunKey, run_request: RunWorkflowRequest) -> None:
+        request_id = str(uuid.uuid4())
+        token = set_request_id(request_id)
+        try:
+            log_event(
+                logger,
+                logging.INFO,
+                "webhook.run.start",
+                issue_number=run_request.issue_number,
+                request_id=request_id,
+            )
+            self.run_workflow(run_request)
+            log_event(logger, logging.INFO, "webhook.run.end", issue_number=run_request.issue_number)
+        except Exception as error:
+            log_event(
+                logger,
+                logging.ERROR,
+                "webhook.run.failed",
+                issue_number=run_request.issue_number,
+                error=str(error),
+            )
+        finally:
+            reset_request_id(token)
+            with self._lock:
+                self._running.discard(run_key)
+                pending_request = self._rerun_after_current.pop(run_key, None)
+                if pending_request is not None and not self._closed:
+                    self._running.add(run_key)
+                    self._executor.submit(self._run, run_key, pending_request)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            timers = list(self._timers.values())
+            self._timers.clear()
+            self._rerun_after_current.clear()
+        for timer in timers:
+            timer.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class WebhookDispatcher:
+    def __init__(
+        self,
+        *,
+        secret: str,
+        event_filter: IssueEventFilter,
+        coalescer: WebhookRunCoalescer,
+    ) -> None:
+        self.secret = secret
+        self.event_filter = event_filter
+        self.coalescer = coalescer
+
+    def close(self) -> None:
+        self.coalescer.close()
+
+
+def start_webhook_dispatcher_from_env(
+    run_workflow: Callable[[RunWorkflowRequest], object],
+) -> WebhookDispatcher | None:
+    secret = os.getenv("GITHUB_WEBHOOK_SECRET")
+    if not secret:
+        return None
+
+    raw_trigger_label = os.getenv("GITHUB_WEBHOOK_TRIGGER_LABEL", "").strip().lower()
+    dispatcher = WebhookDispatcher(
+        secret=secret,
+        event_filter=IssueEventFilter(
+            trigger_actions=_parse_csv(
+                os.getenv("GITHUB_WEBHOOK_ACTIONS", DEFAULT_TRIGGER_ACTIONS)
+            ),
+            trigger_label=raw_trigger_label or None,
+            dry_run=os.getenv("GITHUB_WEBHOOK_DRY_RUN", "false").strip().lower() == "true",
+        ),
+        coalescer=WebhookRunCoalescer(
+            run_workflow,
+            debounce_seconds=float(
+                os.getenv("GITHUB_WEBHOOK_DEBOUNCE_SECONDS", str(DEFAULT_DEBOUNCE_SECONDS))
+            ),
+            max_concurrent_runs=int(
+                os.getenv("GITHUB_WEBHOOK_MAX_CONCURRENT_RUNS", str(DEFAULT_MAX_CONCURRENT_RUNS))
+            ),
+        ),
+    )
+    log_event(
+        logger,
+        logging.INFO,
+        "webhook.dispatcher_started",
+        trigger_actions=sorted(dispatcher.event_filter.trigger_actions),
+        trigger_label=dispatcher.event_filter.trigger_label,
+        debounce_seconds=dispatcher.coalescer.debounce_seconds,
+    )
+    return dispatcher
@@ -1,30 +1,24 @@
 import os
-from functools import partial
 from pathlib import Path
 
 from application.issue_flow import IssueFlowConfig, IssueFlowDependencies
 from domain.payload import parse_payload
-from infrastructure.ai.crew_runner import run_crew
+from infrastructure.ai.crew_cache import build_crew_output_cache
+from infrastructure.ai.crew_runner import build_crew_session
 from infrastructure.github.github_client import GitHubClient
+from infrastructure.github.issue_loader import build_get_issue, issue_snapshot_loader
 from infrastructure.http.mappers import to_issue_flow_config
 from infrastructure.http.schemas import RunWorkflowRequest
 from infrastructure.observability.logging_utils import register_sensitive_values
 from infrastructure.observability.workflow_observer import (
+    observe_applied_file_changes,
     observe_generated_change_set,
     observe_workflow_step,
 )
 from infrastructure.repo.file_writer import apply_files
-from infrastructure.repo.operations import (
-    clone_repo,
-    git_setup,
-    publish_changes,
-    remote_branch_exists,
-    repo_tree_summary,
-)
-
-
-WORKDIR = Path("/work")
-REPODIR = WORKDIR / "repo"
+from infrastructure.repo.operations import publish_changes
+from infrastructure.repo.preflight import build_preflight_checks
+from infrastructure.repo.workflow_mode import build_repository_dependencies
 
 
 def _required_env(name: str) -> str:
@@ -51,32 +45,40 @@ def _build_github_client(payload: RunWorkflowRequest) -> GitHubClient:
 def build_issue_flow_config_from_request(
     payload: RunWorkflowRequest,
     *,
-    repository_directory: Path = REPODIR,
+    repository_directory: Path,
 ) -> IssueFlowConfig:
-    _register_runtime_secrets()
     return to_issue_flow_config(payload, repository_directory=repository_directory)
 
 
 def build_issue_flow_dependencies(payload: RunWorkflowRequest) -> IssueFlowDependencies:
+    _register_runtime_secrets()
     github_token = _required_env("GITHUB_TOKEN")
     git_author_name = os.getenv("GIT_AUTHOR_NAME", "AI Bot")
     git_author_email = os.getenv("GIT_AUTHOR_EMAIL", "ai-bot@example.com")
     github_client = _build_github_client(payload)
+    crew_session = build_crew_session()
+    get_issue = build_get_issue(github_client, base_branch=payload.base_branch)
     return IssueFlowDependencies(
-        get_issue=github_client.get_issue,
+        get_issue=get_issue,
         create_pr=github_client.create_pr,
-        clone_repo=partial(clone_repo, github_token=github_token),
-        git_setup=partial(
-            git_setup,
-            git_author_name=git_author_name,
-            git_author_email=git_author_email,
-        ),
-        repo_tree_summary=repo_tree_summary,
-        run_crew=run_crew,
+        run_crew=crew_session.run,
+        repair_crew_output=crew_session.repair,
         parse_payload=parse_payload,
         apply_files=apply_files,
         publish_changes=publish_changes,
-        remote_branch_exists=remote_branch_exists,
         observe_change_set=observe_generated_change_set,
+        observe_file_changes=observe_applied_file_changes,
         observe_step=observe_workflow_step,
+        preflight_checks=build_preflight_checks(
+            github_client,
+            issue_snapshot=issue_snapshot_loader(get_issue),
+        ),
+        crew_output_cache=build_crew_output_cache(),
+        **build_repository_dependencies(
+            github_client,
+            github_token=github_token,
+            base_branch=payload.base_branch,
+            git_author_name=git_author_name,
+            git_author_email=git_author_email,
+        ),
     )
@@ -13,6 +13,7 @@ from infrastructure.observability.workflow_observer import (
     is_contract_violation_error,
     log_contract_violation,
 )
+from infrastructure.repo.workspace import get_workspace_manager
 
 
 logger = logging.getLogger(__name__)
@@ -20,13 +21,18 @@ logger = logging.getLogger(__name__)
 
 def execute_workflow(payload: RunWorkflowRequest) -> RunWorkflowResponse:
     try:
-        flow_config = build_issue_flow_config_from_request(payload)
+        # Dependencias (e variaveis de ambiente obrigatorias) sao resolvidas antes de esperar workspace.
         flow_dependencies = build_issue_flow_dependencies(payload)
-        result = run_issue_flow(
-            flow_config,
-            flow_dependencies,
-            raise_on_error=False,
-        )
+        with get_workspace_manager().acquire() as repository_directory:
+            flow_config = build_issue_flow_config_from_request(
+                payload,
+                repository_directory=repository_directory,
+            )
+            result = run_issue_flow(
+                flow_config,
+                flow_dependencies,
+                raise_on_error=False,
+            )
     except Exception as error:
         error_message = str(error)
         if is_contract_violation_error(error_message):
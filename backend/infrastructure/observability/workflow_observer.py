@@ -1,6 +1,6 @@
 import logging
 
-from domain.models import ChangeSet
+from domain.models import ChangeSet, FileChangeStat
 from domain.payload import CONTRACT_ERROR_PREFIX
 from infrastructure.observability.logging_utils import log_event
 
@@ -41,6 +41,26 @@ def observe_generated_change_set(change_set: ChangeSet) -> None:
     )
 
 
+def observe_applied_file_changes(file_changes: list[FileChangeStat]) -> None:
+    status_counts = {"created": 0, "modified": 0, "unchanged": 0}
+    for file_change in file_changes:
+        status_counts[file_change.status] += 1
+    log_event(
+        logger,
+        logging.INFO,
+        "workflow.change_set.applied",
+        files_count=len(file_changes),
+        created_count=status_counts["created"],
+        modified_count=status_counts["modified"],
+        unchanged_count=status_counts["unchanged"],
+        written_bytes=sum(
+            file_change.size_bytes
+            for file_change in file_changes
+            if file_change.status != "unchanged"
+        ),
+    )
+
+
 def is_contract_violation_error(error_message: str) -> bool:
     return error_message.startswith(CONTRACT_ERROR_PREFIX)
 
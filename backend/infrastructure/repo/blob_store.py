@@ -0,0 +1,42 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+
+_BATCH_SIZE = 500
+
+
+class BlobStore:
+    # Valores JSON indexados por blob SHA: blobs inalterados entre commits nao sao reprocessados.
+    def __init__(self, database_path: Path) -> None:
+        self.connection = sqlite3.connect(database_path, timeout=30)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (blob_sha TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+    def load(self, blob_shas: list[str]) -> dict[str, Any]:
+        loaded: dict[str, Any] = {}
+        for offset in range(0, len(blob_shas), _BATCH_SIZE):
+            batch = blob_shas[offset : offset + _BATCH_SIZE]
+            placeholders = ",".join("?" for _ in batch)
+            rows = self.connection.execute(
+                f"SELECT blob_sha, value FROM blobs WHERE blob_sha IN ({placeholders})",
+                batch,
+            )
+            for blob_sha, raw_value in rows:
+                loaded[blob_sha] = json.loads(raw_value)
+        return loaded
+
+    def save(self, values_by_blob_sha: dict[str, Any]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO blobs (blob_sha, value) VALUES (?, ?)",
+                [
+                    (blob_sha, json.dumps(value, separators=(",", ":")))
+                    for blob_sha, value in values_by_blob_sha.items()
+                ],
+            )
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,136 @@
+import logging
+import os
+import re
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+from domain.models import ChangePreview, ChangeSet, FileDiffStat
+from infrastructure.observability.logging_utils import log_event, safe_message
+from infrastructure.repo.operations import run, run_capture
+from infrastructure.repo.plumbing_publish import list_head_blobs
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIFF_MAX_BYTES = 256 * 1024
+_BASE_DIRNAME = "a"
+_TARGET_DIRNAME = "b"
+# Cabecalho de arquivo so no inicio de linha: linhas de hunk sempre comecam com " ", "+" ou "-",
+# entao "diff --git " dentro do conteudo de um arquivo nao vira fronteira.
+_FILE_DIFF_BOUNDARY_PATTERN = re.compile(r"^(?=diff --git )", re.MULTILINE)
+
+
+def resolve_diff_max_bytes() -> int:
+    return int(os.getenv("DRY_RUN_DIFF_MAX_BYTES", str(DEFAULT_DIFF_MAX_BYTES)))
+
+
+def _git_diff_no_index(preview_dir: Path, *options: str) -> str:
+    # --no-index compara os dois diretorios com o xdiff do git; exit code 1 = ha diferencas.
+    command = ["git", "diff", "--no-index", "--no-color", *options, _BASE_DIRNAME, _TARGET_DIRNAME]
+    result = run_capture(command, cwd=preview_dir)
+    if result.returncode not in (0, 1):
+        raise RuntimeError(
+            safe_message(f"Command failed (exit_code={result.returncode}): {' '.join(command)}")
+        )
+    return result.stdout
+
+
+def _parse_numstat(raw_numstat: str) -> list[FileDiffStat]:
+    # Formato -z: "<adds>\t<dels>\t\0<origem>\0<destino>\0" (origem /dev/null para arquivo novo).
+    fields = raw_numstat.split("\0")
+    file_stats = []
+    for index in range(0, len(fields) - 2, 3):
+        additions, deletions, _ = fields[index].split("\t")
+        source_path, target_path = fields[index + 1], fields[index + 2]
+        file_stats.append(
+            FileDiffStat(
+                path=target_path.removeprefix(f"{_TARGET_DIRNAME}/"),
+                status="created" if source_path == "/dev/null" else "modified",
+                # Binarios aparecem como "-": sem contagem de linhas.
+                additions=int(additions) if additions.isdigit() else 0,
+                deletions=int(deletions) if deletions.isdigit() else 0,
+            )
+        )
+    return file_stats
+
+
+def _cap_diff(diff: str, max_bytes: int) -> tuple[str, bool]:
+    if len(diff.encode("utf-8")) <= max_bytes:
+        return diff, False
+
+    # Corta em fronteira de arquivo para nao entregar hunks pela metade.
+    file_diffs = [file_diff for file_diff in _FILE_DIFF_BOUNDARY_PATTERN.split(diff) if file_diff]
+    kept_diffs: list[str] = []
+    used_bytes = 0
+    for file_diff in file_diffs:
+        file_diff_bytes = len(file_diff.encode("utf-8"))
+        if used_bytes + file_diff_bytes > max_bytes:
+            break
+        kept_diffs.append(file_diff)
+        used_bytes += file_diff_bytes
+    if not kept_diffs:
+        kept_diffs.append(
+            file_diffs[0].encode("utf-8")[:max_bytes].decode("utf-8", errors="ignore") + "\n"
+        )
+    kept_diffs.append(f"... (diff truncated: {len(kept_diffs)} of {len(file_diffs)} files shown)\n")
+    return "".join(kept_diffs), True
+
+
+def build_change_preview(
+    files_map: dict[str, str],
+    write_base_files: Callable[[Path], None],
+) -> ChangePreview:
+    with tempfile.TemporaryDirectory(prefix="change-preview-") as raw_preview_dir:
+        preview_dir = Path(raw_preview_dir)
+        base_dir = preview_dir / _BASE_DIRNAME
+        target_dir = preview_dir / _TARGET_DIRNAME
+        base_dir.mkdir()
+        write_base_files(base_dir)
+        for rel_path, content in files_map.items():
+            target_file_path = target_dir / rel_path
+            target_file_path.parent.mkdir(parents=True, exist_ok=True)
+            target_file_path.write_bytes(content.encode("utf-8"))
+        target_dir.mkdir(exist_ok=True)
+
+        file_stats = _parse_numstat(_git_diff_no_index(preview_dir, "-z", "--numstat"))
+        raw_diff = _git_diff_no_index(preview_dir, "--no-prefix") if file_stats else ""
+
+    diff, truncated = _cap_diff(raw_diff, resolve_diff_max_bytes())
+    log_event(
+        logger,
+        logging.INFO,
+        "repo.change_preview.built",
+        files_count=len(file_stats),
+        additions=sum(file_stat.additions for file_stat in file_stats),
+        deletions=sum(file_stat.deletions for file_stat in file_stats),
+        diff_bytes=len(raw_diff.encode("utf-8")),
+        truncated=truncated or None,
+    )
+    return ChangePreview(diff=diff, files=tuple(file_stats), truncated=truncated)
+
+
+def checkout_head_files(repo_dir: Path, paths: list[str], base_dir: Path) -> None:
+    # Extrai so os arquivos tocados da base (inclusive fora do sparse checkout) sem mexer no index.
+    existing_paths = sorted(list_head_blobs(repo_dir, paths))
+    if not existing_paths:
+        return
+    run(
+        [
+            "git",
+            "checkout-index",
+            "--ignore-skip-worktree-bits",
+            f"--prefix={base_dir}/",
+            "--",
+            *existing_paths,
+        ],
+        cwd=repo_dir,
+    )
+
+
+def preview_change_set(repo_dir: Path, change_set: ChangeSet) -> ChangePreview:
+    return build_change_preview(
+        change_set.files,
+        partial(checkout_head_files, repo_dir, sorted(change_set.files)),
+    )
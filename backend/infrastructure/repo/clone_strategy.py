@@ -0,0 +1,46 @@
+import os
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+from domain.payload.path_policy import ALLOWED_FILE_ROOTS
+from infrastructure.repo.mirror_cache import clone_repo_from_mirror, resolve_mirror_root
+from infrastructure.repo.operations import clone_repo, clone_repo_sparse
+
+
+CLONE_STRATEGY_FULL = "full"
+CLONE_STRATEGY_MIRROR = "mirror"
+CLONE_STRATEGY_SPARSE = "sparse"
+DEFAULT_CLONE_STRATEGY = CLONE_STRATEGY_MIRROR
+
+
+def resolve_clone_strategy() -> str:
+    return os.getenv("REPO_CLONE_STRATEGY", DEFAULT_CLONE_STRATEGY).strip().lower()
+
+
+def resolve_sparse_paths() -> list[str]:
+    # Raizes permitidas pela path policy + diretorios extras de contexto para a IA.
+    raw_context_paths = os.getenv("REPO_SPARSE_CONTEXT_PATHS", "")
+    context_paths = [path.strip().strip("/") for path in raw_context_paths.split(",")]
+    sparse_paths = set(ALLOWED_FILE_ROOTS)
+    sparse_paths.update(path for path in context_paths if path)
+    return sorted(sparse_paths)
+
+
+def build_clone_repo(*, github_token: str) -> Callable[[str, str, Path], None]:
+    strategy = resolve_clone_strategy()
+    if strategy == CLONE_STRATEGY_FULL:
+        return partial(clone_repo, github_token=github_token)
+    if strategy == CLONE_STRATEGY_MIRROR:
+        return partial(
+            clone_repo_from_mirror,
+            github_token=github_token,
+            mirror_root=resolve_mirror_root(),
+        )
+    if strategy == CLONE_STRATEGY_SPARSE:
+        return partial(
+            clone_repo_sparse,
+            github_token=github_token,
+            sparse_paths=resolve_sparse_paths(),
+        )
+    raise RuntimeError(f"Unsupported REPO_CLONE_STRATEGY: {strategy}")
@@ -1,8 +1,100 @@
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from domain.models import FileChangeStat
+from domain.payload.errors import contract_error
 
-def apply_files(repo_dir: Path, files_map: dict[str, str]) -> None:
-    for rel_path, content in files_map.items():
-        target_file_path = repo_dir / rel_path
-        target_file_path.parent.mkdir(parents=True, exist_ok=True)
-        target_file_path.write_text(content, encoding="utf-8")
+
+# Abaixo disso a escrita sequencial e mais barata que subir o pool de threads.
+_MIN_FILES_FOR_THREAD_POOL = 8
+_MAX_WRITE_WORKERS = 8
+_NEW_FILE_MODE = 0o644
+
+
+def _content_digest(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def read_repository_file(repo_dir: Path, rel_path: str) -> str | None:
+    # Conteudo atual no checkout, base para aplicar patches do payload (preserva CRLF).
+    try:
+        return (repo_dir / rel_path).read_bytes().decode("utf-8")
+    except FileNotFoundError:
+        return None
+    except (IsADirectoryError, NotADirectoryError) as error:
+        raise contract_error(
+            f"patch for '{rel_path}' targets a path that is not a regular file; "
+            "send its FULL content in 'files' instead"
+        ) from error
+    except UnicodeDecodeError as error:
+        raise contract_error(
+            f"patch for '{rel_path}' targets a file that is not UTF-8 text; "
+            "send its FULL content in 'files' instead"
+        ) from error
+
+
+def classify_file_change(repo_dir: Path, rel_path: str, data: bytes) -> FileChangeStat:
+    target_file_path = repo_dir / rel_path
+    try:
+        existing_size = target_file_path.stat().st_size
+    except FileNotFoundError:
+        return FileChangeStat(path=rel_path, status="created", size_bytes=len(data))
+
+    # Tamanho diferente ja decide; so compara hash quando o tamanho coincide.
+    if existing_size == len(data) and _content_digest(target_file_path.read_bytes()) == _content_digest(data):
+        return FileChangeStat(path=rel_path, status="unchanged", size_bytes=len(data))
+    return FileChangeStat(path=rel_path, status="modified", size_bytes=len(data))
+
+
+def classify_file_changes(repo_dir: Path, files_map: dict[str, str]) -> list[FileChangeStat]:
+    return [
+        classify_file_change(repo_dir, rel_path, content.encode("utf-8"))
+        for rel_path, content in files_map.items()
+    ]
+
+
+def _write_atomically(target_file_path: Path, data: bytes) -> None:
+    target_file_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        file_mode = target_file_path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        file_mode = _NEW_FILE_MODE
+
+    # Temp file no mesmo diretorio + rename: leitores nunca veem conteudo parcial.
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=target_file_path.parent,
+        prefix=f".{target_file_path.name}.",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as temporary_file:
+            temporary_file.write(data)
+        os.chmod(temporary_path, file_mode)
+        os.replace(temporary_path, target_file_path)
+    except BaseException:
+        Path(temporary_path).unlink(missing_ok=True)
+        raise
+
+
+def _apply_file(repo_dir: Path, rel_path: str, content: str) -> FileChangeStat:
+    data = content.encode("utf-8")
+    file_change = classify_file_change(repo_dir, rel_path, data)
+    if file_change.status != "unchanged":
+        _write_atomically(repo_dir / rel_path, data)
+    return file_change
+
+
+def apply_files(repo_dir: Path, files_map: dict[str, str]) -> list[FileChangeStat]:
+    if len(files_map) < _MIN_FILES_FOR_THREAD_POOL:
+        return [_apply_file(repo_dir, rel_path, content) for rel_path, content in files_map.items()]
+
+    with ThreadPoolExecutor(max_workers=min(_MAX_WRITE_WORKERS, len(files_map))) as executor:
+        return list(
+            executor.map(
+                lambda file_item: _apply_file(repo_dir, *file_item),
+                files_map.items(),
+            )
+        )
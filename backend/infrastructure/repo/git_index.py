@@ -0,0 +1,43 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from infrastructure.repo.operations import run_output
+
+
+DEFAULT_REPO_CACHE_DIR = Path("/work/cache")
+REGULAR_FILE_MODES = {"100644", "100755"}
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    path: str
+    blob_sha: str
+    mode: str
+
+    @property
+    def is_regular_file(self) -> bool:
+        return self.mode in REGULAR_FILE_MODES
+
+
+def resolve_repo_cache_dir(name: str) -> Path:
+    cache_dir = Path(os.getenv("REPO_CACHE_DIR", str(DEFAULT_REPO_CACHE_DIR))) / name
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def head_commit_sha(repo_dir: Path) -> str:
+    return run_output(["git", "rev-parse", "HEAD"], cwd=repo_dir).strip()
+
+
+def list_index_entries(repo_dir: Path) -> list[IndexEntry]:
+    # O index ja respeita .gitignore e, em sparse checkout, inclui os paths fora do cone.
+    raw_output = run_output(["git", "ls-files", "--stage", "-z"], cwd=repo_dir)
+    entries = []
+    for record in raw_output.split("\0"):
+        if not record:
+            continue
+        metadata, _, path = record.partition("\t")
+        mode, blob_sha, _stage = metadata.split(" ")
+        entries.append(IndexEntry(path=path, blob_sha=blob_sha, mode=mode))
+    return entries
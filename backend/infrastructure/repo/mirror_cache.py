@@ -0,0 +1,185 @@
+import fcntl
+import logging
+import os
+import shutil
+import threading
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+
+from infrastructure.observability.logging_utils import log_event
+from infrastructure.repo.operations import build_clone_url, run
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIRROR_ROOT = Path("/work/mirrors")
+DEFAULT_REFRESH_INTERVAL_SECONDS = 300.0
+
+
+def resolve_mirror_root() -> Path:
+    return Path(os.getenv("REPO_MIRROR_DIR", str(DEFAULT_MIRROR_ROOT)))
+
+
+def _mirror_paths(owner: str, repo: str, mirror_root: Path) -> tuple[Path, Path]:
+    owner_dir = mirror_root / owner
+    return owner_dir / f"{repo}.git", owner_dir / f"{repo}.lock"
+
+
+@contextmanager
+def _mirror_lock(lock_path: Path) -> Iterator[None]:
+    # flock serializa fetch/clone do mesmo mirror entre threads e processos.
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _refresh_mirror(mirror_dir: Path, clone_url: str) -> None:
+    if (mirror_dir / "HEAD").exists():
+        run(["git", "remote", "set-url", "origin", clone_url], cwd=mirror_dir)
+        run(["git", "fetch", "--prune", "origin"], cwd=mirror_dir)
+        return
+
+    if mirror_dir.exists():
+        shutil.rmtree(mirror_dir)
+    run(["git", "clone", "--bare", clone_url, str(mirror_dir)])
+    # Bare clone nao configura refspec de fetch; espelha apenas branches (sem refs/pull/*).
+    run(
+        ["git", "config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*"],
+        cwd=mirror_dir,
+    )
+
+
+def ensure_mirror(owner: str, repo: str, *, github_token: str, mirror_root: Path) -> Path:
+    mirror_dir, lock_path = _mirror_paths(owner, repo, mirror_root)
+    clone_url = build_clone_url(owner, repo, github_token=github_token)
+    with _mirror_lock(lock_path):
+        _refresh_mirror(mirror_dir, clone_url)
+    log_event(logger, logging.INFO, "repo.mirror.refreshed", owner=owner, repo=repo)
+    return mirror_dir
+
+
+def clone_repo_from_mirror(
+    owner: str,
+    repo: str,
+    repo_dir: Path,
+    *,
+    github_token: str,
+    mirror_root: Path,
+) -> None:
+    mirror_dir, lock_path = _mirror_paths(owner, repo, mirror_root)
+    clone_url = build_clone_url(owner, repo, github_token=github_token)
+    if repo_dir.exists():
+        shutil.rmtree(repo_dir)
+
+    with _mirror_lock(lock_path):
+        _refresh_mirror(mirror_dir, clone_url)
+        # Clone local usa hardlinks para os objetos: sem rede e seguro contra gc do mirror.
+        run(["git", "clone", str(mirror_dir), str(repo_dir)])
+
+    run(["git", "remote", "set-url", "origin", clone_url], cwd=repo_dir)
+    log_event(
+        logger,
+        logging.INFO,
+        "repo.mirror.workspace_ready",
+        owner=owner,
+        repo=repo,
+        repo_dir=str(repo_dir),
+    )
+
+
+class MirrorRefresher:
+    def __init__(
+        self,
+        repositories: Sequence[tuple[str, str]],
+        *,
+        github_token: str,
+        mirror_root: Path,
+        interval_seconds: float = DEFAULT_REFRESH_INTERVAL_SECONDS,
+    ) -> None:
+        self.repositories = list(repositories)
+        self.github_token = github_token
+        self.mirror_root = mirror_root
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run,
+            name="repo-mirror-refresher",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds)
+            self._thread = None
+
+    def refresh_all(self) -> None:
+        for owner, repo in self.repositories:
+            if self._stop_event.is_set():
+                return
+            try:
+                ensure_mirror(
+                    owner,
+                    repo,
+                    github_token=self.github_token,
+                    mirror_root=self.mirror_root,
+                )
+            except Exception as error:
+                log_event(
+                    logger,
+                    logging.WARNING,
+                    "repo.mirror.refresh_failed",
+                    owner=owner,
+                    repo=repo,
+                    error=str(error),
+                )
+
+    def _run(self) -> None:
+        self.refresh_all()
+        while not self._stop_event.wait(self.interval_seconds):
+            self.refresh_all()
+
+
+def _parse_hot_repositories(raw_value: str) -> list[tuple[str, str]]:
+    repositories = []
+    for entry in raw_value.split(","):
+        owner, _, repo = entry.strip().partition("/")
+        if owner and repo:
+            repositories.append((owner, repo))
+    return repositories
+
+
+def start_mirror_refresher_from_env() -> MirrorRefresher | None:
+    repositories = _parse_hot_repositories(os.getenv("REPO_MIRROR_HOT_REPOS", ""))
+    github_token = os.getenv("GITHUB_TOKEN")
+    if not repositories or not github_token:
+        return None
+
+    refresher = MirrorRefresher(
+        repositories,
+        github_token=github_token,
+        mirror_root=resolve_mirror_root(),
+        interval_seconds=float(
+            os.getenv("REPO_MIRROR_REFRESH_SECONDS", str(DEFAULT_REFRESH_INTERVAL_SECONDS))
+        ),
+    )
+    refresher.start()
+    log_event(
+        logger,
+        logging.INFO,
+        "repo.mirror.refresher_started",
+        repositories=[f"{owner}/{repo}" for owner, repo in repositories],
+        interval_seconds=refresher.interval_seconds,
+    )
+    return refresher
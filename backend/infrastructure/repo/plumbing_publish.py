@@ -0,0 +1,113 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable
+
+from domain.models import ChangeSet, FileChangeStat
+from infrastructure.repo.operations import run, run_output
+
+
+PUBLISH_MODE_PLUMBING = "plumbing"
+PUBLISH_MODE_WORKTREE = "worktree"
+DEFAULT_PUBLISH_MODE = PUBLISH_MODE_PLUMBING
+DEFAULT_FILE_MODE = "100644"
+
+
+def list_head_blobs(repo_dir: Path, paths: list[str]) -> dict[str, tuple[str, str]]:
+    # Modo (ex.: 100755) e blob SHA dos arquivos que ja existem na base.
+    raw_output = run_output(["git", "ls-tree", "-z", "HEAD", "--", *paths], cwd=repo_dir)
+    existing_blobs = {}
+    for record in raw_output.split("\0"):
+        if not record:
+            continue
+        metadata, _, path = record.partition("\t")
+        mode, object_type, object_sha = metadata.split(" ")
+        if object_type == "blob":
+            existing_blobs[path] = (mode, object_sha)
+    return existing_blobs
+
+
+def git_blob_sha(data: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def classify_against_head(
+    files_map: dict[str, str],
+    existing_blobs: dict[str, tuple[str, str]],
+) -> list[FileChangeStat]:
+    # Compara pelo blob SHA da base: funciona mesmo com arquivos fora do sparse checkout.
+    file_changes = []
+    for path in sorted(files_map):
+        data = files_map[path].encode("utf-8")
+        if path not in existing_blobs:
+            status = "created"
+        elif existing_blobs[path][1] == git_blob_sha(data):
+            status = "unchanged"
+        else:
+            status = "modified"
+        file_changes.append(FileChangeStat(path=path, status=status, size_bytes=len(data)))
+    return file_changes
+
+
+def _data_block(content: str) -> str:
+    return f"data {len(content.encode('utf-8'))}\n{content}\n"
+
+
+def build_fast_import_stream(
+    *,
+    branch: str,
+    committer_ident: str,
+    commit_message: str,
+    parent_commit: str,
+    files_map: dict[str, str],
+    file_modes: dict[str, str],
+) -> str:
+    stream_parts = [
+        f"commit refs/heads/{branch}\n",
+        f"committer {committer_ident}\n",
+        _data_block(commit_message),
+        f"from {parent_commit}\n",
+    ]
+    for path in sorted(files_map):
+        mode = file_modes.get(path, DEFAULT_FILE_MODE)
+        stream_parts.append(f"M {mode} inline {path}\n")
+        stream_parts.append(_data_block(files_map[path]))
+    stream_parts.append("\ndone\n")
+    return "".join(stream_parts)
+
+
+def commit_change_set(repo_dir: Path, change_set: ChangeSet) -> list[FileChangeStat]:
+    # Monta o commit direto no object store (fast-import) sem escrever nem escanear o working tree.
+    if not change_set.files:
+        return []
+    existing_blobs = list_head_blobs(repo_dir, sorted(change_set.files))
+    file_changes = classify_against_head(change_set.files, existing_blobs)
+    changed_paths = {
+        file_change.path for file_change in file_changes if file_change.status != "unchanged"
+    }
+    if not changed_paths:
+        # Nada difere da base: nao cria commit vazio nem faz push.
+        return file_changes
+
+    parent_commit = run_output(["git", "rev-parse", "HEAD"], cwd=repo_dir).strip()
+    committer_ident = run_output(["git", "var", "GIT_COMMITTER_IDENT"], cwd=repo_dir).strip()
+    fast_import_stream = build_fast_import_stream(
+        branch=change_set.branch,
+        committer_ident=committer_ident,
+        commit_message=change_set.commit,
+        parent_commit=parent_commit,
+        files_map={path: change_set.files[path] for path in changed_paths},
+        file_modes={path: mode for path, (mode, _blob_sha) in existing_blobs.items()},
+    )
+    run(["git", "fast-import", "--quiet", "--done"], cwd=repo_dir, input_text=fast_import_stream)
+    run(["git", "push", "-u", "origin", change_set.branch], cwd=repo_dir)
+    return file_changes
+
+
+def build_commit_change_set() -> Callable[[Path, ChangeSet], list[FileChangeStat]] | None:
+    publish_mode = os.getenv("REPO_PUBLISH_MODE", DEFAULT_PUBLISH_MODE).strip().lower()
+    if publish_mode == PUBLISH_MODE_PLUMBING:
+        return commit_change_set
+    if publish_mode == PUBLISH_MODE_WORKTREE:
+        return None
+    raise RuntimeError(f"Unsupported REPO_PUBLISH_MODE: {publish_mode}")
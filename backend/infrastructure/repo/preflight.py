@@ -0,0 +1,137 @@
+import tempfile
+import threading
+from typing import Callable
+
+from application.issue_flow import IssueData, IssueFlowConfig, PreflightCheckResult
+from domain.payload.branch_policy import GENERATED_BRANCH_NAMESPACE, issue_branch_prefix
+from infrastructure.github.github_client import GitHubClient
+
+
+class GitHubPreflight:
+    def __init__(
+        self,
+        client: GitHubClient,
+        *,
+        issue_snapshot: Callable[[int], IssueData] | None = None,
+    ) -> None:
+        self.client = client
+        # Loader GraphQL: base e branches da issue saem do mesmo snapshot do load_issue.
+        self.issue_snapshot = issue_snapshot
+        self._lock = threading.Lock()
+        self._repository_access: tuple[dict[str, object], list[str] | None] | None = None
+
+    def _load_repository_access(self) -> tuple[dict[str, object], list[str] | None]:
+        # Escopos e permissoes vem da mesma chamada: busca uma vez para as duas verificacoes.
+        with self._lock:
+            if self._repository_access is None:
+                self._repository_access = self.client.get_repository_access()
+            return self._repository_access
+
+    def check_token_scopes(self, _config: IssueFlowConfig) -> PreflightCheckResult:
+        repository, scopes = self._load_repository_access()
+        if scopes is None:
+            return PreflightCheckResult(
+                name="token_scopes",
+                passed=True,
+                detail="fine-grained or app token: scopes checked through repo permissions",
+            )
+        if "repo" in scopes or ("public_repo" in scopes and not repository.get("private")):
+            return PreflightCheckResult(name="token_scopes", passed=True, detail=",".join(scopes))
+        return PreflightCheckResult(
+            name="token_scopes",
+            passed=False,
+            detail=f"token is missing the 'repo' scope (granted: {','.join(scopes) or 'none'})",
+        )
+
+    def check_repository_access(self, config: IssueFlowConfig) -> PreflightCheckResult:
+        repository, _scopes = self._load_repository_access()
+        permissions = repository.get("permissions") or {}
+        if config.dry_run:
+            return PreflightCheckResult(name="repository_access", passed=True, detail="read")
+        if repository.get("archived"):
+            return PreflightCheckResult(
+                name="repository_access",
+                passed=False,
+                detail="repository is archived",
+            )
+        if not permissions.get("push"):
+            return PreflightCheckResult(
+                name="repository_access",
+                passed=False,
+                detail="token cannot push to the repository",
+            )
+        return PreflightCheckResult(name="repository_access", passed=True, detail="push")
+
+    def check_base_branch(self, config: IssueFlowConfig) -> PreflightCheckResult:
+        if self.issue_snapshot is not None:
+            issue_data = self.issue_snapshot(config.issue_number)
+            base_branch_exists = issue_data.get("base_branch_exists", False)
+            default_branch = issue_data.get("default_branch")
+        else:
+            base_branch_exists = self.client.get_branch_head(config.base_branch) is not None
+            default_branch = None
+        if not base_branch_exists:
+            detail = f"base branch '{config.base_branch}' not found"
+            if default_branch:
+                detail += f" (repository default branch: '{default_branch}')"
+            return PreflightCheckResult(name="base_branch", passed=False, detail=detail)
+        return PreflightCheckResult(name="base_branch", passed=True, detail=config.base_branch)
+
+    def check_branch_namespace(self, config: IssueFlowConfig) -> PreflightCheckResult:
+        if self.issue_snapshot is not None:
+            issue_data = self.issue_snapshot(config.issue_number)
+            namespace_blocked = issue_data.get("branch_namespace_blocked", False)
+            existing_branches = issue_data.get("issue_branches")
+        else:
+            namespace_blocked = self.client.get_branch_head(GENERATED_BRANCH_NAMESPACE) is not None
+            existing_branches = None
+        # Uma branch chamada exatamente `feature` impede criar qualquer `feature/...` (conflito de ref).
+        if namespace_blocked:
+            return PreflightCheckResult(
+                name="branch_namespace",
+                passed=False,
+                detail=(
+                    f"branch '{GENERATED_BRANCH_NAMESPACE}' exists and blocks "
+                    f"'{GENERATED_BRANCH_NAMESPACE}/...' branches"
+                ),
+            )
+        # Branches de execucoes anteriores nao bloqueiam: o publish escolhe um sufixo livre.
+        if existing_branches is None:
+            existing_branches = self.client.list_branches_with_prefix(
+                issue_branch_prefix(config.issue_number)
+            )
+        return PreflightCheckResult(
+            name="branch_namespace",
+            passed=True,
+            detail=f"existing_issue_branches={len(existing_branches)}",
+        )
+
+
+def check_workspace_writable(config: IssueFlowConfig) -> PreflightCheckResult:
+    workspace_directory = config.repository_directory.parent
+    try:
+        with tempfile.NamedTemporaryFile(dir=workspace_directory, prefix=".preflight-") as probe:
+            probe.write(b"ok")
+            probe.flush()
+    except OSError as error:
+        return PreflightCheckResult(
+            name="workspace_writable",
+            passed=False,
+            detail=f"{workspace_directory}: {error.strerror or error}",
+        )
+    return PreflightCheckResult(name="workspace_writable", passed=True, detail=str(workspace_directory))
+
+
+def build_preflight_checks(
+    github_client: GitHubClient,
+    *,
+    issue_snapshot: Callable[[int], IssueData] | None = None,
+) -> tuple[Callable[[IssueFlowConfig], PreflightCheckResult], ...]:
+    github_preflight = GitHubPreflight(github_client, issue_snapshot=issue_snapshot)
+    return (
+        github_preflight.check_token_scopes,
+        github_preflight.check_repository_access,
+        github_preflight.check_base_branch,
+        github_preflight.check_branch_namespace,
+        check_workspace_writable,
+    )
@@ -0,0 +1,163 @@
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Sequence
+
+
+_READ_CHUNK_BYTES = 64 * 1024
+# Espera pelos pipes apos a saida do filho quando nao ha prazo (ou apos o SIGKILL do grupo).
+_PIPE_DRAIN_GRACE_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class ProcessResult:
+    returncode: int
+    stdout: str
+    stderr: str
+    timed_out: bool
+    stdout_truncated: bool
+    stderr_truncated: bool
+    wall_time_ms: float
+    cpu_user_ms: float
+    cpu_system_ms: float
+    max_rss_kb: int
+
+
+class _BoundedBuffer:
+    # Mantem apenas os ultimos max_bytes (a cauda e o que importa em erros de git).
+    def __init__(self, max_bytes: int | None) -> None:
+        self.max_bytes = max_bytes
+        self.chunks: deque[bytes] = deque()
+        self.size = 0
+        self.truncated = False
+
+    def append(self, chunk: bytes) -> None:
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        if self.max_bytes is None:
+            return
+        while self.size > self.max_bytes and self.chunks:
+            overflow = self.size - self.max_bytes
+            first_chunk = self.chunks[0]
+            self.truncated = True
+            if len(first_chunk) <= overflow:
+                self.chunks.popleft()
+                self.size -= len(first_chunk)
+            else:
+                self.chunks[0] = first_chunk[overflow:]
+                self.size -= overflow
+
+    def text(self) -> str:
+        return b"".join(self.chunks).decode("utf-8", errors="replace")
+
+
+def _pump_output(stream: BinaryIO, buffer: _BoundedBuffer) -> None:
+    with stream:
+        for chunk in iter(lambda: stream.read(_READ_CHUNK_BYTES), b""):
+            buffer.append(chunk)
+
+
+def _feed_input(stream: BinaryIO, input_bytes: bytes) -> None:
+    try:
+        with stream:
+            stream.write(input_bytes)
+    except BrokenPipeError:
+        pass
+
+
+def _kill_process_group(process: subprocess.Popen[bytes], timed_out: threading.Event) -> None:
+    timed_out.set()
+    try:
+        # Mata o grupo inteiro: git delega para filhos (ex.: git-remote-https) que seguram os pipes.
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _join_until(threads: list[threading.Thread], deadline: float) -> bool:
+    for thread in threads:
+        thread.join(max(deadline - time.perf_counter(), 0))
+    return not any(thread.is_alive() for thread in threads)
+
+
+def execute_process(
+    command: Sequence[str],
+    *,
+    cwd: Path | None,
+    input_text: str | None,
+    timeout_seconds: float | None,
+    max_output_bytes: int | None,
+) -> ProcessResult:
+    start_time = time.perf_counter()
+    process = subprocess.Popen(
+        list(command),
+        cwd=cwd,
+        stdin=subprocess.PIPE if input_text is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+    )
+    stdout_buffer = _BoundedBuffer(max_output_bytes)
+    stderr_buffer = _BoundedBuffer(max_output_bytes)
+    io_threads = [
+        threading.Thread(target=_pump_output, args=(process.stdout, stdout_buffer), daemon=True),
+        threading.Thread(target=_pump_output, args=(process.stderr, stderr_buffer), daemon=True),
+    ]
+    if input_text is not None:
+        io_threads.append(
+            threading.Thread(
+                target=_feed_input,
+                args=(process.stdin, input_text.encode("utf-8")),
+                daemon=True,
+            )
+        )
+    for io_thread in io_threads:
+        io_thread.start()
+
+    timed_out = threading.Event()
+    deadline_timer = None
+    if timeout_seconds is not None:
+        deadline_timer = threading.Timer(
+            timeout_seconds,
+            _kill_process_group,
+            args=(process, timed_out),
+        )
+        deadline_timer.daemon = True
+        deadline_timer.start()
+
+    # wait4 devolve o rusage do filho (CPU e pico de RSS) junto com o status de saida.
+    _, wait_status, resource_usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(wait_status)
+    # O filho saiu, mas netos (ssh, credential helper, git gc --auto) podem segurar os pipes:
+    # o prazo continua valendo sobre a leitura; estourado, o grupo inteiro e morto.
+    if timeout_seconds is not None:
+        drain_deadline = start_time + timeout_seconds
+    else:
+        drain_deadline = time.perf_counter() + _PIPE_DRAIN_GRACE_SECONDS
+    if not _join_until(io_threads, drain_deadline):
+        _kill_process_group(
+            process,
+            timed_out if timeout_seconds is not None else threading.Event(),
+        )
+        # Sem o grupo, os pipes fecham; neto que saiu do grupo (setsid) fica para as threads daemon.
+        _join_until(io_threads, time.perf_counter() + _PIPE_DRAIN_GRACE_SECONDS)
+    if deadline_timer is not None:
+        deadline_timer.cancel()
+
+    return ProcessResult(
+        returncode=process.returncode,
+        stdout=stdout_buffer.text(),
+        stderr=stderr_buffer.text(),
+        timed_out=timed_out.is_set(),
+        stdout_truncated=stdout_buffer.truncated,
+        stderr_truncated=stderr_buffer.truncated,
+        wall_time_ms=(time.perf_counter() - start_time) * 1000,
+        cpu_user_ms=resource_usage.ru_utime * 1000,
+        cpu_system_ms=resource_usage.ru_stime * 1000,
+        max_rss_kb=resource_usage.ru_maxrss,
+    )
@@ -0,0 +1,45 @@
+import logging
+import threading
+from pathlib import Path
+
+from infrastructure.observability.logging_utils import log_event
+from infrastructure.repo.operations import run_output
+
+
+logger = logging.getLogger(__name__)
+
+_HEADS_PREFIX = "refs/heads/"
+
+
+def list_remote_heads(repo_dir: Path) -> frozenset[str]:
+    raw_output = run_output(["git", "ls-remote", "--heads", "origin"], cwd=repo_dir)
+    heads = set()
+    for line in raw_output.splitlines():
+        _object_sha, _, ref_name = line.partition("\t")
+        if ref_name.startswith(_HEADS_PREFIX):
+            heads.add(ref_name.removeprefix(_HEADS_PREFIX))
+    return frozenset(heads)
+
+
+class RemoteRefSnapshot:
+    # Uma unica chamada ls-remote por repositorio; consultas seguintes sao respondidas em memoria.
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._heads_by_repo_dir: dict[Path, set[str]] = {}
+
+    def _heads(self, repo_dir: Path) -> set[str]:
+        with self._lock:
+            heads = self._heads_by_repo_dir.get(repo_dir)
+            if heads is None:
+                heads = set(list_remote_heads(repo_dir))
+                self._heads_by_repo_dir[repo_dir] = heads
+                log_event(
+                    logger,
+                    logging.INFO,
+                    "repo.remote_refs.snapshot",
+                    heads_count=len(heads),
+                )
+            return heads
+
+    def branch_exists(self, branch: str, repo_dir: Path) -> bool:
+        return branch in self._heads(repo_dir)
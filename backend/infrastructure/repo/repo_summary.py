@@ -0,0 +1,20 @@
+import os
+from pathlib import Path
+from typing import Callable
+
+from infrastructure.repo.symbol_outline import repo_outline_summary
+from infrastructure.repo.tree_summary import repo_tree_summary
+
+
+SUMMARY_MODE_PATHS = "paths"
+SUMMARY_MODE_OUTLINE = "outline"
+DEFAULT_SUMMARY_MODE = SUMMARY_MODE_OUTLINE
+
+
+def build_repo_tree_summary() -> Callable[[Path], str]:
+    summary_mode = os.getenv("REPO_TREE_SUMMARY_MODE", DEFAULT_SUMMARY_MODE).strip().lower()
+    if summary_mode == SUMMARY_MODE_PATHS:
+        return repo_tree_summary
+    if summary_mode == SUMMARY_MODE_OUTLINE:
+        return repo_outline_summary
+    raise RuntimeError(f"Unsupported REPO_TREE_SUMMARY_MODE: {summary_mode}")
@@ -0,0 +1,241 @@
+import json
+import logging
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from domain.tokens import estimate_tokens
+from infrastructure.observability.logging_utils import log_event
+from infrastructure.repo.blob_store import BlobStore
+from infrastructure.repo.git_index import (
+    IndexEntry,
+    head_commit_sha,
+    list_index_entries,
+    resolve_repo_cache_dir,
+)
+from infrastructure.storage.atomic_file import write_cache_file
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTEXT_TOKEN_BUDGET = 3000
+DEFAULT_CONTEXT_TOP_K = 8
+DEFAULT_MAX_FILE_BYTES = 200_000
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_PATH_TERM_WEIGHT = 3
+_SNIPPET_WINDOW_LINES = 30
+_SNIPPET_STEP_LINES = 10
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+_CAMEL_CASE_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    path: str
+    score: float
+
+
+def tokenize(text: str) -> list[str]:
+    terms = []
+    for word in _WORD_PATTERN.findall(text):
+        lowered_word = word.lower()
+        if len(lowered_word) > 1:
+            terms.append(lowered_word)
+        # Quebra identificadores camelCase/PascalCase em partes pesquisaveis.
+        parts = _CAMEL_CASE_PATTERN.findall(word)
+        if len(parts) > 1:
+            terms.extend(part.lower() for part in parts if len(part) > 1)
+    return terms
+
+
+def _read_text_file(file_path: Path, max_file_bytes: int) -> str | None:
+    try:
+        if file_path.stat().st_size > max_file_bytes:
+            return None
+        raw_content = file_path.read_bytes()
+    except OSError:
+        return None
+    if b"\0" in raw_content[:8192]:
+        return None
+    return raw_content.decode("utf-8", errors="replace")
+
+
+def _content_terms_by_blob(
+    repo_dir: Path,
+    entries: list[IndexEntry],
+    max_file_bytes: int,
+) -> dict[str, dict[str, int]]:
+    # Frequencias de termos por blob SHA: so blobs novos sao tokenizados.
+    store = BlobStore(resolve_repo_cache_dir("search-index") / "blob_terms.sqlite3")
+    try:
+        unique_blob_shas = sorted({entry.blob_sha for entry in entries})
+        terms_by_blob_sha = store.load(unique_blob_shas)
+        new_terms_by_blob_sha: dict[str, dict[str, int]] = {}
+        for entry in entries:
+            if entry.blob_sha in terms_by_blob_sha or entry.blob_sha in new_terms_by_blob_sha:
+                continue
+            # Em sparse checkout, arquivos fora do cone nao existem em disco: indexa so o path.
+            content = _read_text_file(repo_dir / entry.path, max_file_bytes)
+            if content is None:
+                continue
+            new_terms_by_blob_sha[entry.blob_sha] = dict(Counter(tokenize(content)))
+        if new_terms_by_blob_sha:
+            store.save(new_terms_by_blob_sha)
+        terms_by_blob_sha.update(new_terms_by_blob_sha)
+    finally:
+        store.close()
+
+    log_event(
+        logger,
+        logging.INFO,
+        "repo.search_index.blobs",
+        blobs_count=len(unique_blob_shas),
+        tokenized_count=len(new_terms_by_blob_sha),
+    )
+    return terms_by_blob_sha
+
+
+def _build_commit_index(repo_dir: Path, max_file_bytes: int) -> dict[str, object]:
+    entries = [entry for entry in list_index_entries(repo_dir) if entry.is_regular_file]
+    terms_by_blob_sha = _content_terms_by_blob(repo_dir, entries, max_file_bytes)
+
+    postings: dict[str, dict[str, int]] = {}
+    document_lengths: dict[str, int] = {}
+    for entry in entries:
+        document_terms = Counter(terms_by_blob_sha.get(entry.blob_sha, {}))
+        for path_term in tokenize(entry.path):
+            document_terms[path_term] += _PATH_TERM_WEIGHT
+        document_lengths[entry.path] = sum(document_terms.values())
+        for term, frequency in document_terms.items():
+            postings.setdefault(term, {})[entry.path] = frequency
+    return {"postings": postings, "document_lengths": document_lengths}
+
+
+def build_path_index(paths: list[str]) -> dict[str, object]:
+    # Indice so de paths: usado quando o conteudo dos arquivos nao esta disponivel localmente.
+    postings: dict[str, dict[str, int]] = {}
+    document_lengths: dict[str, int] = {}
+    for path in paths:
+        document_terms = Counter(tokenize(path))
+        document_lengths[path] = sum(document_terms.values())
+        for term, frequency in document_terms.items():
+            postings.setdefault(term, {})[path] = frequency
+    return {"postings": postings, "document_lengths": document_lengths}
+
+
+def load_commit_index(repo_dir: Path, max_file_bytes: int) -> dict[str, object]:
+    commit_sha = head_commit_sha(repo_dir)
+    cache_file = resolve_repo_cache_dir("search-index") / f"{commit_sha}-{max_file_bytes}.json"
+    if cache_file.exists():
+        return json.loads(cache_file.read_text(encoding="utf-8"))
+
+    commit_index = _build_commit_index(repo_dir, max_file_bytes)
+    write_cache_file(cache_file, json.dumps(commit_index, separators=(",", ":")))
+    return commit_index
+
+
+def rank_documents(
+    commit_index: dict[str, object],
+    query_terms: list[str],
+    top_k: int,
+) -> list[SearchHit]:
+    postings: dict[str, dict[str, int]] = commit_index["postings"]  # type: ignore[assignment]
+    document_lengths: dict[str, int] = commit_index["document_lengths"]  # type: ignore[assignment]
+    documents_count = len(document_lengths)
+    if not documents_count:
+        return []
+    average_length = sum(document_lengths.values()) / documents_count
+
+    scores: dict[str, float] = {}
+    for term in set(query_terms):
+        term_postings = postings.get(term)
+        if not term_postings:
+            continue
+        inverse_frequency = math.log(
+            1 + (documents_count - len(term_postings) + 0.5) / (len(term_postings) + 0.5)
+        )
+        for path, frequency in term_postings.items():
+            length_ratio = document_lengths[path] / average_length if average_length else 1.0
+            normalized_frequency = (frequency * (_BM25_K1 + 1)) / (
+                frequency + _BM25_K1 * (1 - _BM25_B + _BM25_B * length_ratio)
+            )
+            scores[path] = scores.get(path, 0.0) + inverse_frequency * normalized_frequency
+
+    ranked_paths = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return [SearchHit(path=path, score=score) for path, score in ranked_paths[:top_k]]
+
+
+def _best_snippet(content: str, query_terms: set[str]) -> tuple[int, list[str]]:
+    lines = content.splitlines()
+    best_start, best_hits = 0, -1
+    for window_start in range(0, max(len(lines) - _SNIPPET_WINDOW_LINES, 0) + 1, _SNIPPET_STEP_LINES):
+        window = lines[window_start : window_start + _SNIPPET_WINDOW_LINES]
+        window_hits = sum(1 for term in tokenize("\n".join(window)) if term in query_terms)
+        if window_hits > best_hits:
+            best_start, best_hits = window_start, window_hits
+    return best_start, lines[best_start : best_start + _SNIPPET_WINDOW_LINES]
+
+
+def format_context(
+    repo_dir: Path,
+    hits: list[SearchHit],
+    query_terms: list[str],
+    token_budget: int,
+    max_file_bytes: int,
+) -> str:
+    query_term_set = set(query_terms)
+    sections = []
+    used_tokens = 0
+    for hit in hits:
+        header = f"### {hit.path} (score {hit.score:.2f})"
+        content = _read_text_file(repo_dir / hit.path, max_file_bytes)
+        if content is None:
+            section = header
+        else:
+            snippet_start, snippet_lines = _best_snippet(content, query_term_set)
+            snippet_end = snippet_start + len(snippet_lines)
+            section = (
+                f"{header}\nlines {snippet_start + 1}-{snippet_end}:\n"
+                + "\n".join(snippet_lines)
+            )
+        section_tokens = estimate_tokens(section + "\n\n")
+        if used_tokens + section_tokens > token_budget:
+            # Sem espaco para o trecho: ainda vale listar o path relevante.
+            section = header
+            section_tokens = estimate_tokens(section + "\n\n")
+            if used_tokens + section_tokens > token_budget:
+                break
+        sections.append(section)
+        used_tokens += section_tokens
+    return "\n\n".join(sections)
+
+
+def resolve_context_limits() -> tuple[int, int, int]:
+    token_budget = int(os.getenv("REPO_CONTEXT_TOKEN_BUDGET", str(DEFAULT_CONTEXT_TOKEN_BUDGET)))
+    top_k = int(os.getenv("REPO_CONTEXT_TOP_K", str(DEFAULT_CONTEXT_TOP_K)))
+    max_file_bytes = int(os.getenv("REPO_SEARCH_MAX_FILE_BYTES", str(DEFAULT_MAX_FILE_BYTES)))
+    return token_budget, top_k, max_file_bytes
+
+
+def retrieve_repo_context(repo_dir: Path, issue_title: str, issue_body: str) -> str:
+    token_budget, top_k, max_file_bytes = resolve_context_limits()
+    if token_budget <= 0 or top_k <= 0:
+        return ""
+
+    query_terms = tokenize(f"{issue_title}\n{issue_body}")
+    commit_index = load_commit_index(repo_dir, max_file_bytes)
+    hits = rank_documents(commit_index, query_terms, top_k)
+    repository_context = format_context(repo_dir, hits, query_terms, token_budget, max_file_bytes)
+    log_event(
+        logger,
+        logging.INFO,
+        "repo.context.retrieved",
+        hits_count=len(hits),
+        paths=[hit.path for hit in hits],
+        context_tokens=estimate_tokens(repository_context),
+    )
+    return repository_context
@@ -0,0 +1,250 @@
+import ast
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from domain.tokens import estimate_tokens
+from infrastructure.observability.logging_utils import log_event
+from infrastructure.repo.blob_store import BlobStore
+from infrastructure.repo.git_index import (
+    IndexEntry,
+    head_commit_sha,
+    list_index_entries,
+    resolve_repo_cache_dir,
+)
+from infrastructure.repo.tree_summary import order_paths, resolve_tree_token_budget
+from infrastructure.storage.atomic_file import write_cache_file
+
+
+logger = logging.getLogger(__name__)
+
+_MAX_OUTLINE_FILE_BYTES = 500_000
+_CHUNK_SIZE = 256
+# Abaixo disso o custo de subir o process pool supera o ganho do parse paralelo.
+_MIN_FILES_FOR_PROCESS_POOL = 32
+_TYPESCRIPT_ROOT = "frontend/src/"
+_TYPESCRIPT_SUFFIXES = (".ts", ".tsx")
+_TS_EXPORT_PATTERN = re.compile(
+    r"^export\s+(?:declare\s+)?(?:default\s+)?(?:abstract\s+)?(?:async\s+)?"
+    r"(function\*?|class|const|let|var|interface|type|enum)\s+([A-Za-z_$][\w$]*)",
+    re.MULTILINE,
+)
+_TS_EXPORT_LIST_PATTERN = re.compile(r"^export\s+(?:type\s+)?\{([^}]*)\}", re.MULTILINE)
+_TS_DEFAULT_EXPORT_PATTERN = re.compile(r"^export\s+default\s+([A-Za-z_$][\w$]*)\s*;?$", re.MULTILINE)
+
+# Pool unico do processo, criado sob demanda e encerrado no shutdown da API.
+_outline_pool: ProcessPoolExecutor | None = None
+_outline_pool_lock = threading.Lock()
+
+
+def is_outline_candidate(path: str) -> bool:
+    if path.endswith(".py"):
+        return True
+    return path.startswith(_TYPESCRIPT_ROOT) and path.endswith(_TYPESCRIPT_SUFFIXES)
+
+
+def _is_public_symbol(name: str) -> bool:
+    return not name.startswith("_") or (name.startswith("__") and name.endswith("__"))
+
+
+def _function_signature(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    signature = f"{prefix} {node.name}({ast.unparse(node.args)})"
+    if node.returns is not None:
+        signature += f" -> {ast.unparse(node.returns)}"
+    return signature
+
+
+def outline_python(source: str) -> list[str]:
+    try:
+        module = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    outline = []
+    for node in module.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        if not _is_public_symbol(node.name):
+            continue
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            outline.append(_function_signature(node))
+        else:
+            bases = ", ".join(ast.unparse(base) for base in node.bases)
+            outline.append(f"class {node.name}({bases})" if bases else f"class {node.name}")
+            for class_node in node.body:
+                if isinstance(
+                    class_node, (ast.FunctionDef, ast.AsyncFunctionDef)
+                ) and _is_public_symbol(class_node.name):
+                    outline.append(f"  {_function_signature(class_node)}")
+    return outline
+
+
+def outline_typescript(source: str) -> list[str]:
+    outline = [f"export {kind} {name}" for kind, name in _TS_EXPORT_PATTERN.findall(source)]
+    for exported_names in _TS_EXPORT_LIST_PATTERN.findall(source):
+        names = [name.strip() for name in exported_names.split(",") if name.strip()]
+        outline.extend(f"export {name}" for name in names)
+    outline.extend(
+        f"export default {name}" for name in _TS_DEFAULT_EXPORT_PATTERN.findall(source)
+    )
+    return outline
+
+
+def outline_file(path: str, file_path: str) -> list[str]:
+    # Executado nos workers do process pool: le o arquivo localmente para nao serializar conteudo.
+    try:
+        if os.path.getsize(file_path) > _MAX_OUTLINE_FILE_BYTES:
+            return []
+        with open(file_path, encoding="utf-8", errors="replace") as source_file:
+            source = source_file.read()
+    except OSError:
+        return []
+    if path.endswith(".py"):
+        return outline_python(source)
+    return outline_typescript(source)
+
+
+def _compute_outlines(
+    repo_dir: Path,
+    entries: list[IndexEntry],
+    executor: ProcessPoolExecutor | None,
+) -> dict[str, list[str]]:
+    paths = [entry.path for entry in entries]
+    file_paths = [str(repo_dir / entry.path) for entry in entries]
+    if executor is None:
+        outlines = list(map(outline_file, paths, file_paths))
+    else:
+        outlines = list(executor.map(outline_file, paths, file_paths, chunksize=16))
+    return {entry.blob_sha: outline for entry, outline in zip(entries, outlines)}
+
+
+def _get_outline_pool() -> ProcessPoolExecutor:
+    global _outline_pool
+    with _outline_pool_lock:
+        if _outline_pool is None:
+            # forkserver: o processo da API tem varias threads (event loop, timers, workflows);
+            # fork herdaria locks presos (logging, sqlite, asyncio) e travaria os workers.
+            mp_context = multiprocessing.get_context("forkserver")
+            mp_context.set_forkserver_preload([__name__])
+            max_workers = int(os.getenv("REPO_OUTLINE_WORKERS", "0")) or None
+            _outline_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context)
+        return _outline_pool
+
+
+def shutdown_outline_pool() -> None:
+    global _outline_pool
+    with _outline_pool_lock:
+        outline_pool, _outline_pool = _outline_pool, None
+    if outline_pool is not None:
+        outline_pool.shutdown(cancel_futures=True)
+
+
+class _OutlineLoader:
+    def __init__(self, repo_dir: Path) -> None:
+        self.repo_dir = repo_dir
+        # Outlines por blob SHA: so arquivos alterados desde o ultimo commit sao parseados.
+        self.store = BlobStore(resolve_repo_cache_dir("symbol-outline") / "outlines.sqlite3")
+
+    def _executor_for(self, files_count: int) -> ProcessPoolExecutor | None:
+        if files_count < _MIN_FILES_FOR_PROCESS_POOL:
+            return None
+        return _get_outline_pool()
+
+    def load(self, entries: list[IndexEntry]) -> dict[str, list[str]]:
+        candidate_entries = [
+            entry
+            for entry in entries
+            if entry.is_regular_file
+            and is_outline_candidate(entry.path)
+            and (self.repo_dir / entry.path).exists()
+        ]
+        outlines_by_blob_sha = self.store.load(
+            sorted({entry.blob_sha for entry in candidate_entries})
+        )
+        missing_entries = list(
+            {
+                entry.blob_sha: entry
+                for entry in candidate_entries
+                if entry.blob_sha not in outlines_by_blob_sha
+            }.values()
+        )
+        if missing_entries:
+            new_outlines = _compute_outlines(
+                self.repo_dir,
+                missing_entries,
+                self._executor_for(len(missing_entries)),
+            )
+            self.store.save(new_outlines)
+            outlines_by_blob_sha.update(new_outlines)
+        return outlines_by_blob_sha
+
+    def close(self) -> None:
+        self.store.close()
+
+
+def build_outline_summary(repo_dir: Path, entries: list[IndexEntry], token_budget: int) -> str:
+    entries_by_path = {entry.path: entry for entry in entries}
+    ordered_entries = [entries_by_path[path] for path in order_paths(list(entries_by_path))]
+
+    loader = _OutlineLoader(repo_dir)
+    lines: list[str] = []
+    used_tokens = 0
+    listed_count = 0
+    budget_exhausted = False
+    try:
+        # Processa em blocos na ordem do resumo: so parseia o que ainda cabe no orcamento.
+        for offset in range(0, len(ordered_entries), _CHUNK_SIZE):
+            chunk = ordered_entries[offset : offset + _CHUNK_SIZE]
+            outlines_by_blob_sha = loader.load(chunk)
+            for entry in chunk:
+                entry_lines = [entry.path]
+                entry_lines.extend(
+                    f"  {symbol}" for symbol in outlines_by_blob_sha.get(entry.blob_sha, [])
+                )
+                entry_tokens = estimate_tokens("\n".join(entry_lines) + "\n")
+                if used_tokens + entry_tokens > token_budget:
+                    # Sem espaco para o outline completo: tenta listar so o path.
+                    entry_lines = [entry.path]
+                    entry_tokens = estimate_tokens(entry.path + "\n")
+                if used_tokens + entry_tokens > token_budget:
+                    budget_exhausted = True
+                    break
+                lines.extend(entry_lines)
+                used_tokens += entry_tokens
+                listed_count += 1
+            if budget_exhausted:
+                break
+    finally:
+        loader.close()
+
+    omitted_count = len(ordered_entries) - listed_count
+    if omitted_count:
+        lines.append(f"... ({omitted_count} more files not listed)")
+    return "\n".join(lines)
+
+
+def repo_outline_summary(repo_dir: Path) -> str:
+    token_budget = resolve_tree_token_budget()
+    commit_sha = head_commit_sha(repo_dir)
+    cache_file = resolve_repo_cache_dir("tree-summary") / f"{commit_sha}-outline-{token_budget}.txt"
+    if cache_file.exists():
+        log_event(logger, logging.INFO, "repo.outline_summary.cache_hit", commit=commit_sha)
+        return cache_file.read_text(encoding="utf-8")
+
+    entries = list_index_entries(repo_dir)
+    summary = build_outline_summary(repo_dir, entries, token_budget)
+    write_cache_file(cache_file, summary)
+    log_event(
+        logger,
+        logging.INFO,
+        "repo.outline_summary.built",
+        commit=commit_sha,
+        files_count=len(entries),
+        token_budget=token_budget,
+    )
+    return summary
@@ -0,0 +1,67 @@
+import logging
+import os
+from pathlib import Path, PurePosixPath
+
+from domain.tokens import estimate_tokens
+from infrastructure.observability.logging_utils import log_event
+from infrastructure.repo.git_index import (
+    head_commit_sha,
+    list_index_entries,
+    resolve_repo_cache_dir,
+)
+from infrastructure.storage.atomic_file import write_cache_file
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TREE_TOKEN_BUDGET = 2000
+
+
+def resolve_tree_token_budget() -> int:
+    return int(os.getenv("REPO_TREE_TOKEN_BUDGET", str(DEFAULT_TREE_TOKEN_BUDGET)))
+
+
+def order_paths(paths: list[str]) -> list[str]:
+    # Ordem deterministica em largura: raiz primeiro, depois niveis mais profundos.
+    return sorted(paths, key=lambda path: (len(PurePosixPath(path).parts), path))
+
+
+def fit_lines_to_budget(lines: list[str], token_budget: int) -> tuple[list[str], int]:
+    selected_lines = []
+    used_tokens = 0
+    for line in lines:
+        line_tokens = estimate_tokens(line + "\n")
+        if used_tokens + line_tokens > token_budget:
+            break
+        selected_lines.append(line)
+        used_tokens += line_tokens
+    return selected_lines, len(lines) - len(selected_lines)
+
+
+def build_tree_summary(paths: list[str], token_budget: int) -> str:
+    selected_paths, omitted_count = fit_lines_to_budget(order_paths(paths), token_budget)
+    if omitted_count:
+        selected_paths.append(f"... ({omitted_count} more files not listed)")
+    return "\n".join(selected_paths)
+
+
+def repo_tree_summary(repo_dir: Path) -> str:
+    token_budget = resolve_tree_token_budget()
+    commit_sha = head_commit_sha(repo_dir)
+    cache_file = resolve_repo_cache_dir("tree-summary") / f"{commit_sha}-{token_budget}.txt"
+    if cache_file.exists():
+        log_event(logger, logging.INFO, "repo.tree_summary.cache_hit", commit=commit_sha)
+        return cache_file.read_text(encoding="utf-8")
+
+    paths = [entry.path for entry in list_index_entries(repo_dir)]
+    summary = build_tree_summary(paths, token_budget)
+    write_cache_file(cache_file, summary)
+    log_event(
+        logger,
+        logging.INFO,
+        "repo.tree_summary.built",
+        commit=commit_sha,
+        files_count=len(paths),
+        token_budget=token_budget,
+    )
+    return summary
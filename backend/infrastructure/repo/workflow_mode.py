@@ -0,0 +1,71 @@
+import os
+from functools import partial
+from typing import Callable
+
+from infrastructure.github.git_data_repository import GitDataRepository
+from infrastructure.github.github_client import GitHubClient
+from infrastructure.repo.change_preview import preview_change_set
+from infrastructure.repo.clone_strategy import build_clone_repo
+from infrastructure.repo.file_writer import read_repository_file
+from infrastructure.repo.git_index import head_commit_sha
+from infrastructure.repo.operations import git_setup
+from infrastructure.repo.plumbing_publish import build_commit_change_set
+from infrastructure.repo.remote_refs import RemoteRefSnapshot
+from infrastructure.repo.repo_summary import build_repo_tree_summary
+from infrastructure.repo.search_index import retrieve_repo_context
+
+
+WORKFLOW_MODE_CLONE = "clone"
+WORKFLOW_MODE_API = "api"
+DEFAULT_WORKFLOW_MODE = WORKFLOW_MODE_CLONE
+
+
+def resolve_workflow_mode() -> str:
+    return os.getenv("REPO_WORKFLOW_MODE", DEFAULT_WORKFLOW_MODE).strip().lower()
+
+
+def build_repository_dependencies(
+    github_client: GitHubClient,
+    *,
+    github_token: str,
+    base_branch: str,
+    git_author_name: str,
+    git_author_email: str,
+) -> dict[str, Callable[..., object] | None]:
+    # Conjunto de callables que tocam o repositorio alvo, conforme REPO_WORKFLOW_MODE.
+    workflow_mode = resolve_workflow_mode()
+    if workflow_mode == WORKFLOW_MODE_CLONE:
+        return {
+            "clone_repo": build_clone_repo(github_token=github_token),
+            "git_setup": partial(
+                git_setup,
+                git_author_name=git_author_name,
+                git_author_email=git_author_email,
+            ),
+            "repo_tree_summary": build_repo_tree_summary(),
+            "retrieve_repo_context": retrieve_repo_context,
+            "commit_change_set": build_commit_change_set(),
+            "remote_branch_exists": RemoteRefSnapshot().branch_exists,
+            "preview_change_set": preview_change_set,
+            "repository_revision": head_commit_sha,
+            "read_repository_file": read_repository_file,
+        }
+    if workflow_mode == WORKFLOW_MODE_API:
+        git_data_repository = GitDataRepository(
+            github_client,
+            base_branch=base_branch,
+            git_author_name=git_author_name,
+            git_author_email=git_author_email,
+        )
+        return {
+            "clone_repo": git_data_repository.prepare,
+            "git_setup": git_data_repository.git_setup,
+            "repo_tree_summary": git_data_repository.tree_summary,
+            "retrieve_repo_context": git_data_repository.retrieve_context,
+            "commit_change_set": git_data_repository.commit_change_set,
+            "remote_branch_exists": git_data_repository.branch_exists,
+            "preview_change_set": git_data_repository.preview_change_set,
+            "repository_revision": git_data_repository.base_commit_sha,
+            "read_repository_file": git_data_repository.read_file,
+        }
+    raise RuntimeError(f"Unsupported REPO_WORKFLOW_MODE: {workflow_mode}")
@@ -0,0 +1,203 @@
+import fcntl
+import logging
+import os
+import shutil
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from infrastructure.observability.logging_utils import log_event
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKSPACE_ROOT = Path("/work/workspaces")
+DEFAULT_POOL_SIZE = 4
+DEFAULT_DISK_QUOTA_MB = 10 * 1024
+DEFAULT_ACQUIRE_TIMEOUT_SECONDS = 600.0
+_REPOSITORY_DIRNAME = "repo"
+_BUSY_POLL_SECONDS = 1.0
+
+
+@dataclass
+class _WorkspaceSlot:
+    path: Path
+    in_use: bool = False
+    last_used: float = 0.0
+    size_bytes: int = 0
+    lock_fd: int | None = None
+
+    @property
+    def repository_directory(self) -> Path:
+        return self.path / _REPOSITORY_DIRNAME
+
+
+def _directory_size(path: Path) -> int:
+    total_bytes = 0
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        try:
+            entries = list(os.scandir(current))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                else:
+                    total_bytes += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+    return total_bytes
+
+
+class WorkspaceManager:
+    def __init__(
+        self,
+        root: Path,
+        *,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        disk_quota_bytes: int = DEFAULT_DISK_QUOTA_MB * 1024 * 1024,
+        acquire_timeout_seconds: float = DEFAULT_ACQUIRE_TIMEOUT_SECONDS,
+    ) -> None:
+        if pool_size < 1:
+            raise RuntimeError("WORKSPACE_POOL_SIZE must be at least 1")
+        self.root = root
+        self.disk_quota_bytes = disk_quota_bytes
+        self.acquire_timeout_seconds = acquire_timeout_seconds
+        self._condition = threading.Condition()
+        self._slots = [
+            _WorkspaceSlot(path=root / f"ws-{index:02d}") for index in range(pool_size)
+        ]
+        self._prepare_root()
+
+    def _prepare_root(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        for slot in self._slots:
+            slot.path.mkdir(exist_ok=True)
+            slot.size_bytes = _directory_size(slot.path)
+            slot.last_used = slot.path.stat().st_mtime
+
+    def _try_lock_slot(self, slot: _WorkspaceSlot) -> bool:
+        # flock nao bloqueante protege o slot contra outro processo (CLI + API no mesmo volume).
+        lock_fd = os.open(slot.path.with_suffix(".lock"), os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(lock_fd)
+            return False
+        slot.lock_fd = lock_fd
+        return True
+
+    def _unlock_slot(self, slot: _WorkspaceSlot) -> None:
+        if slot.lock_fd is None:
+            return
+        fcntl.flock(slot.lock_fd, fcntl.LOCK_UN)
+        os.close(slot.lock_fd)
+        slot.lock_fd = None
+
+    def _take_slot(self) -> _WorkspaceSlot:
+        deadline = time.monotonic() + self.acquire_timeout_seconds
+        with self._condition:
+            while True:
+                # Reaproveita o workspace usado mais recentemente; os antigos ficam para o GC.
+                idle_slots = sorted(
+                    (slot for slot in self._slots if not slot.in_use),
+                    key=lambda candidate: candidate.last_used,
+                    reverse=True,
+                )
+                for slot in idle_slots:
+                    if self._try_lock_slot(slot):
+                        slot.in_use = True
+                        return slot
+                remaining_seconds = deadline - time.monotonic()
+                if remaining_seconds <= 0:
+                    raise RuntimeError(
+                        "No workspace available: all "
+                        f"{len(self._slots)} workspaces are busy"
+                    )
+                self._condition.wait(timeout=min(remaining_seconds, _BUSY_POLL_SECONDS))
+
+    def _release_slot(self, slot: _WorkspaceSlot) -> None:
+        size_bytes = _directory_size(slot.path)
+        log_event(
+            logger,
+            logging.INFO,
+            "repo.workspace.released",
+            workspace=str(slot.path),
+            size_bytes=size_bytes,
+        )
+        with self._condition:
+            slot.size_bytes = size_bytes
+            slot.last_used = time.time()
+            slot.in_use = False
+            self._unlock_slot(slot)
+            eviction_slots = self._reserve_eviction_slots_locked()
+            self._condition.notify()
+        # A remocao em disco roda fora do lock: acquire/release concorrentes nao esperam o rmtree.
+        if eviction_slots:
+            self._evict_slots(eviction_slots)
+
+    def _reserve_eviction_slots_locked(self) -> list[_WorkspaceSlot]:
+        # Escolhe os slots ociosos mais antigos ate caber na cota; cada um fica reservado
+        # (in_use + flock) ate o fim da remocao, entao nenhum run o recebe nesse meio tempo.
+        total_bytes = sum(slot.size_bytes for slot in self._slots)
+        idle_slots = sorted(
+            (slot for slot in self._slots if not slot.in_use and slot.size_bytes > 0),
+            key=lambda candidate: candidate.last_used,
+        )
+        eviction_slots = []
+        for slot in idle_slots:
+            if total_bytes <= self.disk_quota_bytes:
+                break
+            if not self._try_lock_slot(slot):
+                continue
+            slot.in_use = True
+            total_bytes -= slot.size_bytes
+            eviction_slots.append(slot)
+        return eviction_slots
+
+    def _evict_slots(self, eviction_slots: list[_WorkspaceSlot]) -> None:
+        for slot in eviction_slots:
+            shutil.rmtree(slot.repository_directory, ignore_errors=True)
+            log_event(
+                logger,
+                logging.INFO,
+                "repo.workspace.evicted",
+                workspace=str(slot.path),
+                freed_bytes=slot.size_bytes,
+            )
+        with self._condition:
+            for slot in eviction_slots:
+                slot.size_bytes = 0
+                slot.in_use = False
+                self._unlock_slot(slot)
+            self._condition.notify(len(eviction_slots))
+
+    @contextmanager
+    def acquire(self) -> Iterator[Path]:
+        slot = self._take_slot()
+        log_event(logger, logging.INFO, "repo.workspace.acquired", workspace=str(slot.path))
+        try:
+            yield slot.repository_directory
+        finally:
+            self._release_slot(slot)
+
+
+@lru_cache(maxsize=1)
+def get_workspace_manager() -> WorkspaceManager:
+    return WorkspaceManager(
+        Path(os.getenv("WORKSPACE_ROOT", str(DEFAULT_WORKSPACE_ROOT))),
+        pool_size=int(os.getenv("WORKSPACE_POOL_SIZE", str(DEFAULT_POOL_SIZE))),
+        disk_quota_bytes=int(os.getenv("WORKSPACE_DISK_QUOTA_MB", str(DEFAULT_DISK_QUOTA_MB)))
+        * 1024
+        * 1024,
+        acquire_timeout_seconds=float(
+            os.getenv("WORKSPACE_ACQUIRE_TIMEOUT_SECONDS", str(DEFAULT_ACQUIRE_TIMEOUT_SECONDS))
+        ),
+    )
@@ -0,0 +1,22 @@
+import os
+import tempfile
+from pathlib import Path
+
+
+def write_cache_file(cache_file: Path, content: str) -> None:
+    # Escrita atomica: leitores concorrentes nunca veem arquivo parcial. Temp file unico por
+    # escrita (mkstemp): threads do mesmo processo gravando a mesma chave nao se sobrescrevem.
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=cache_file.parent,
+        prefix=f".{cache_file.name}.",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as temporary_file:
+            temporary_file.write(content.encode("utf-8"))
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+        os.replace(temporary_path, cache_file)
+    except BaseException:
+        Path(temporary_path).unlink(missing_ok=True)
+        raise
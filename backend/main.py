@@ -1,7 +1,5 @@
 import logging
 import os
-from functools import partial
-from pathlib import Path
 from dotenv import load_dotenv
 from application.issue_flow import (
     IssueFlowConfig,
@@ -9,16 +7,15 @@ from application.issue_flow import (
     run_issue_flow,
 )
 from infrastructure.github.github_client import GitHubClient
-from infrastructure.ai.crew_runner import run_crew
+from infrastructure.github.issue_loader import build_get_issue, issue_snapshot_loader
+from infrastructure.ai.crew_cache import build_crew_output_cache
+from infrastructure.ai.crew_runner import build_crew_session
 from domain.payload import parse_payload
 from infrastructure.repo.file_writer import apply_files
-from infrastructure.repo.operations import (
-    clone_repo,
-    git_setup,
-    publish_changes,
-    remote_branch_exists,
-    repo_tree_summary,
-)
+from infrastructure.repo.operations import publish_changes
+from infrastructure.repo.preflight import build_preflight_checks
+from infrastructure.repo.workflow_mode import build_repository_dependencies
+from infrastructure.repo.workspace import get_workspace_manager
 from infrastructure.observability.logging_utils import (
     configure_logging,
     log_event,
@@ -27,6 +24,7 @@ from infrastructure.observability.logging_utils import (
 from infrastructure.observability.workflow_observer import (
     is_contract_violation_error,
     log_contract_violation,
+    observe_applied_file_changes,
     observe_generated_change_set,
     observe_workflow_step,
 )
@@ -36,9 +34,6 @@ load_dotenv()
 configure_logging()
 logger = logging.getLogger(__name__)
 
-WORKDIR = Path("/work")
-REPODIR = WORKDIR / "repo"
-
 
 def required_env(name: str) -> str:
     value = os.getenv(name)
@@ -56,38 +51,48 @@ def main() -> None:
     issue_number = int(required_env("ISSUE_NUMBER"))
     git_author_name = os.getenv("GIT_AUTHOR_NAME", "AI Bot")
     git_author_email = os.getenv("GIT_AUTHOR_EMAIL", "ai-bot@example.com")
+    base_branch = os.getenv("GH_BASE_BRANCH", "main")
     register_sensitive_values(github_token, openai_api_key)
 
     github_client = GitHubClient(token=github_token, owner=owner, repo=repo)
-    flow_config = IssueFlowConfig(
-        issue_number=issue_number,
-        repository_owner=owner,
-        repository_name=repo,
-        base_branch=os.getenv("GH_BASE_BRANCH", "main"),
-        repository_directory=REPODIR,
-        dry_run=False,
-    )
-
+    crew_session = build_crew_session()
+    get_issue = build_get_issue(github_client, base_branch=base_branch)
     flow_dependencies = IssueFlowDependencies(
-        get_issue=github_client.get_issue,
+        get_issue=get_issue,
         create_pr=github_client.create_pr,
-        clone_repo=partial(clone_repo, github_token=github_token),
-        git_setup=partial(
-            git_setup,
-            git_author_name=git_author_name,
-            git_author_email=git_author_email,
-        ),
-        repo_tree_summary=repo_tree_summary,
-        run_crew=run_crew,
+        run_crew=crew_session.run,
+        repair_crew_output=crew_session.repair,
         parse_payload=parse_payload,
         apply_files=apply_files,
         publish_changes=publish_changes,
-        remote_branch_exists=remote_branch_exists,
         observe_change_set=observe_generated_change_set,
+        observe_file_changes=observe_applied_file_changes,
         observe_step=observe_workflow_step,
+        preflight_checks=build_preflight_checks(
+            github_client,
+            issue_snapshot=issue_snapshot_loader(get_issue),
+        ),
+        crew_output_cache=build_crew_output_cache(),
+        **build_repository_dependencies(
+            github_client,
+            github_token=github_token,
+            base_branch=base_branch,
+            git_author_name=git_author_name,
+            git_author_email=git_author_email,
+        ),
     )
     try:
-        result = run_issue_flow(flow_config, flow_dependencies)
+        with get_workspace_manager().acquire() as repository_directory:
+            flow_config = IssueFlowConfig(
+                issue_number=issue_number,
+                repository_owner=owner,
+                repository_name=repo,
+                base_branch=base_branch,
+                repository_directory=repository_directory,
+                dry_run=False,
+                bypass_crew_cache=os.getenv("CREW_CACHE_BYPASS", "false").strip().lower() == "true",
+            )
+            result = run_issue_flow(flow_config, flow_dependencies)
     except Exception as error:
         error_message = str(error)
         if is_contract_violation_error(error_message):
@@ -0,0 +1,182 @@
+import base64
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import urlsplit
+
+
+# Fake local da Git Data API (refs, commits, trees, blobs) para exercitar REPO_WORKFLOW_MODE=api
+# sem rede: arvores ficam achatadas (path -> entrada), como a resposta de trees?recursive=1.
+class FakeGitHubState:
+    def __init__(self, owner: str, repo: str) -> None:
+        self.prefix = f"/repos/{owner}/{repo}/git/"
+        self.lock = threading.Lock()
+        self.blobs: dict[str, bytes] = {}
+        self.trees: dict[str, dict[str, dict[str, Any]]] = {}
+        self.commits: dict[str, dict[str, Any]] = {}
+        self.refs: dict[str, str] = {}
+        self.requests: list[tuple[str, str]] = []
+
+    @staticmethod
+    def _object_sha(kind: str, payload: bytes) -> str:
+        # Mesmo hash de objeto do git ("<tipo> <tamanho>\0"): blob SHA bate com git hash-object.
+        header = f"{kind} {len(payload)}\0".encode("ascii")
+        return hashlib.sha1(header + payload).hexdigest()
+
+    def add_blob(self, data: bytes) -> str:
+        blob_sha = self._object_sha("blob", data)
+        self.blobs[blob_sha] = data
+        return blob_sha
+
+    def add_tree(self, entries: dict[str, dict[str, Any]]) -> str:
+        tree_sha = self._object_sha("tree", json.dumps(entries, sort_keys=True).encode("utf-8"))
+        self.trees[tree_sha] = entries
+        return tree_sha
+
+    def add_commit(
+        self,
+        tree_sha: str,
+        parents: list[str],
+        message: str,
+        author: Any = None,
+    ) -> str:
+        commit = {"tree": tree_sha, "parents": parents, "message": message, "author": author}
+        commit_sha = self._object_sha("commit", json.dumps(commit, sort_keys=True).encode("utf-8"))
+        self.commits[commit_sha] = commit
+        return commit_sha
+
+    def seed_branch(self, branch: str, files: dict[str, bytes], message: str = "initial") -> str:
+        entries = {
+            path: {"path": path, "mode": "100644", "type": "blob", "sha": self.add_blob(data)}
+            for path, data in files.items()
+        }
+        commit_sha = self.add_commit(self.add_tree(entries), [], message)
+        self.refs[f"refs/heads/{branch}"] = commit_sha
+        return commit_sha
+
+    def tree_files(self, tree_sha: str) -> dict[str, bytes]:
+        return {path: self.blobs[entry["sha"]] for path, entry in self.trees[tree_sha].items()}
+
+    def handle(self, method: str, path: str, body: Any) -> tuple[int, Any]:
+        if not path.startswith(self.prefix):
+            return 404, {"message": "Not Found"}
+        resource = path.removeprefix(self.prefix)
+        with self.lock:
+            self.requests.append((method, resource))
+            if method == "GET":
+                return self._get(resource)
+            if method == "POST":
+                return self._post(resource, body)
+        return 405, {"message": "Method Not Allowed"}
+
+    def _get(self, resource: str) -> tuple[int, Any]:
+        kind, _, name = resource.partition("/")
+        if kind == "ref" and f"refs/{name}" in self.refs:
+            return 200, {"ref": f"refs/{name}", "object": {"sha": self.refs[f"refs/{name}"]}}
+        if kind == "matching-refs":
+            return 200, [
+                {"ref": ref, "object": {"sha": sha}}
+                for ref, sha in sorted(self.refs.items())
+                if ref.startswith(f"refs/{name}")
+            ]
+        if kind == "commits" and name in self.commits:
+            commit = self.commits[name]
+            return 200, {
+                "sha": name,
+                "tree": {"sha": commit["tree"]},
+                "parents": [{"sha": parent} for parent in commit["parents"]],
+                "message": commit["message"],
+            }
+        if kind == "trees" and name in self.trees:
+            tree_entries = [
+                {**entry, "size": len(self.blobs[entry["sha"]])}
+                for entry in self.trees[name].values()
+            ]
+            return 200, {"sha": name, "tree": tree_entries, "truncated": False}
+        if kind == "blobs" and name in self.blobs:
+            content = base64.b64encode(self.blobs[name]).decode("ascii")
+            return 200, {"sha": name, "content": content, "encoding": "base64"}
+        return 404, {"message": "Not Found"}
+
+    def _post(self, resource: str, body: dict[str, Any]) -> tuple[int, Any]:
+        if resource == "blobs":
+            return 201, {"sha": self.add_blob(base64.b64decode(body["content"]))}
+        if resource == "trees":
+            entries = dict(self.trees.get(body.get("base_tree"), {}))
+            for entry in body["tree"]:
+                if entry["sha"] not in self.blobs:
+                    return 422, {"message": f"blob {entry['sha']} not found"}
+                entries[entry["path"]] = {
+                    key: entry[key] for key in ("path", "mode", "type", "sha")
+                }
+            return 201, {"sha": self.add_tree(entries)}
+        if resource == "commits":
+            if body["tree"] not in self.trees or any(
+                parent not in self.commits for parent in body["parents"]
+            ):
+                return 422, {"message": "tree or parent not found"}
+            commit_sha = self.add_commit(
+                body["tree"], body["parents"], body["message"], body.get("author")
+            )
+            return 201, {"sha": commit_sha}
+        if resource == "refs":
+            if body["ref"] in self.refs:
+                return 422, {"message": "Reference already exists"}
+            if body["sha"] not in self.commits:
+                return 422, {"message": "Object does not exist"}
+            self.refs[body["ref"]] = body["sha"]
+            return 201, {"ref": body["ref"], "object": {"sha": body["sha"]}}
+        return 404, {"message": "Not Found"}
+
+
+def _build_handler(state: FakeGitHubState) -> type[BaseHTTPRequestHandler]:
+    class FakeGitHubHandler(BaseHTTPRequestHandler):
+        def _respond(self, method: str) -> None:
+            content_length = int(self.headers.get("Content-Length") or 0)
+            raw_body = self.rfile.read(content_length) if content_length else b""
+            status_code, payload = state.handle(
+                method,
+                urlsplit(self.path).path,
+                json.loads(raw_body) if raw_body else None,
+            )
+            response_body = json.dumps(payload).encode("utf-8")
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(response_body)))
+            self.end_headers()
+            self.wfile.write(response_body)
+
+        def do_GET(self) -> None:
+            self._respond("GET")
+
+        def do_POST(self) -> None:
+            self._respond("POST")
+
+        def log_message(self, *_args: Any) -> None:
+            return None
+
+    return FakeGitHubHandler
+
+
+class FakeGitHubServer:
+    # Sobe em 127.0.0.1 numa porta livre; usar api_url em GitHubClient(api_url=...)
+    # ou GITHUB_API_URL.
+    def __init__(self, owner: str, repo: str) -> None:
+        self.state = FakeGitHubState(owner, repo)
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _build_handler(self.state))
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def api_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeGitHubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
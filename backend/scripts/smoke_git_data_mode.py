@@ -0,0 +1,141 @@
+import tempfile
+from pathlib import Path
+
+from domain.models import ChangeSet
+from infrastructure.github.git_data_repository import GitDataRepository
+from infrastructure.github.github_client import GitHubClient
+from scripts.fake_github import FakeGitHubServer
+
+
+# Smoke do modo sem clone contra o fake local: listagem da arvore, blob sob demanda e a
+# sequencia blob -> tree -> commit -> ref. Rodar de backend/: python -m scripts.smoke_git_data_mode
+OWNER = "acme"
+REPO = "service"
+BASE_BRANCH = "main"
+BASE_FILES = {
+    "backend/app.py": b"def health():\n    return 'ok'\n",
+    "backend/util.py": b"VALUE = 1\n",
+    "frontend/src/App.tsx": b"export const App = () => null;\n",
+}
+
+
+def _check(condition: bool, message: str) -> None:
+    if not condition:
+        raise SystemExit(f"FAIL: {message}")
+    print(f"ok: {message}")
+
+
+def main() -> None:
+    with FakeGitHubServer(OWNER, REPO) as server, tempfile.TemporaryDirectory() as raw_work_dir:
+        state = server.state
+        base_commit_sha = state.seed_branch(BASE_BRANCH, BASE_FILES)
+        repository = GitDataRepository(
+            GitHubClient(token="fake-token", owner=OWNER, repo=REPO, api_url=server.api_url),
+            base_branch=BASE_BRANCH,
+            git_author_name="Smoke Bot",
+            git_author_email="smoke@example.com",
+        )
+        repo_dir = Path(raw_work_dir) / "repo"
+
+        repository.prepare(OWNER, REPO, repo_dir)
+        _check(
+            state.requests[:3]
+            == [
+                ("GET", f"ref/heads/{BASE_BRANCH}"),
+                ("GET", f"commits/{base_commit_sha}"),
+                ("GET", f"trees/{state.commits[base_commit_sha]['tree']}"),
+            ],
+            "prepare reads ref, commit and recursive tree only",
+        )
+        _check(
+            not any(resource.startswith("blobs/") for _method, resource in state.requests),
+            "prepare fetches no blobs",
+        )
+        tree_summary = repository.tree_summary(repo_dir)
+        _check(
+            all(path in tree_summary for path in BASE_FILES),
+            "tree summary lists every base file",
+        )
+
+        _check(
+            repository.read_file(repo_dir, "backend/app.py")
+            == BASE_FILES["backend/app.py"].decode(),
+            "read_file fetches the base blob",
+        )
+        _check(
+            repository.read_file(repo_dir, "backend/missing.py") is None,
+            "missing file reads as None",
+        )
+
+        branch = "feature/issue-1-smoke"
+        _check(not repository.branch_exists(branch, repo_dir), "new branch does not exist yet")
+        change_set = ChangeSet(
+            files={
+                "backend/app.py": "def health():\n    return 'healthy'\n",
+                "backend/new.py": "NEW = True\n",
+                "backend/util.py": BASE_FILES["backend/util.py"].decode(),
+            },
+            branch=branch,
+            commit="feat: smoke change",
+            pr_title="Smoke",
+            pr_body="Smoke",
+        )
+        preview = repository.preview_change_set(repo_dir, change_set)
+        _check(
+            {file_stat.path for file_stat in preview.files} == {"backend/app.py", "backend/new.py"},
+            "dry-run preview diffs only the changed files",
+        )
+
+        published_from = len(state.requests)
+        file_changes = repository.commit_change_set(repo_dir, change_set)
+        _check(
+            {file_change.path: file_change.status for file_change in file_changes}
+            == {
+                "backend/app.py": "modified",
+                "backend/new.py": "created",
+                "backend/util.py": "unchanged",
+            },
+            "unchanged file is classified without uploading a blob",
+        )
+        _check(
+            [
+                resource
+                for method, resource in state.requests[published_from:]
+                if method == "POST"
+            ]
+            == ["blobs", "blobs", "trees", "commits", "refs"],
+            "publish sequence is blob, blob, tree, commit, ref",
+        )
+
+        head_commit = state.commits[state.refs[f"refs/heads/{branch}"]]
+        _check(head_commit["parents"] == [base_commit_sha], "commit parent is the base head")
+        _check(
+            head_commit["author"] == {"name": "Smoke Bot", "email": "smoke@example.com"},
+            "commit author is set",
+        )
+        _check(
+            state.tree_files(head_commit["tree"])
+            == {
+                **BASE_FILES,
+                "backend/app.py": change_set.files["backend/app.py"].encode(),
+                "backend/new.py": b"NEW = True\n",
+            },
+            "new tree keeps base files and applies the change set",
+        )
+        _check(repository.branch_exists(branch, repo_dir), "published branch is visible")
+        _check(
+            state.refs[f"refs/heads/{BASE_BRANCH}"] == base_commit_sha,
+            "base branch is untouched",
+        )
+
+        try:
+            repository.commit_change_set(repo_dir, change_set)
+        except RuntimeError as error:
+            _check("422" in str(error), "publishing onto an existing ref fails with 422")
+        else:
+            raise SystemExit("FAIL: publishing onto an existing ref should fail")
+    print("git data mode smoke passed")
+
+
+if __name__ == "__main__":
+    main()
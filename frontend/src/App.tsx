@@ -6,7 +6,7 @@ import type { RunWorkflowResponse, WorkflowRuntimeEvent } from './types/workflow
 const FLOW_STEPS = [
   {
     title: 'Carregar issue no GitHub',
-    description: 'Busca título e descrição da issue informada para iniciar o contexto.',
+    description: 'Busca título e descrição da issue enquanto o pre-flight valida token, repo, branch e workspace.',
   },
   {
     title: 'Preparar repositório e Git',
@@ -64,19 +64,23 @@ const AGENT_CARDS = [
 ]
 
 const STEP_INDEX_BY_KEY: Record<string, number> = {
+  preflight: 0,
   load_issue: 0,
   prepare_repo: 1,
   run_crew: 2,
   validate_payload: 3,
+  repair_payload: 3,
   publish_branch: 4,
   finalize: 5,
 }
 
 const STEP_LABEL_BY_KEY: Record<string, string> = {
+  preflight: 'Pre-flight (token, repo, branch, workspace)',
   load_issue: 'Carregar issue',
   prepare_repo: 'Preparar repositório e git',
   run_crew: 'Executar crew multiagente',
   validate_payload: 'Validar payload/contrato',
+  repair_payload: 'Reparar payload (Git Integrator)',
   publish_branch: 'Aplicar arquivos e publicar branch',
   finalize: 'Criar PR/finalização',
 }
@@ -87,9 +91,10 @@ type FormState = {
   issueNumber: string
   baseBranch: string
   dryRun: boolean
+  bypassCrewCache: boolean
 }
 
-type FormErrors = Partial<Record<keyof Omit<FormState, 'dryRun'>, string>>
+type FormErrors = Partial<Record<keyof Omit<FormState, 'dryRun' | 'bypassCrewCache'>, string>>
 type TimelinePhase = 'idle' | 'running' | 'success' | 'error'
 type AgentExecutionSummary = {
   lastAction: string
@@ -102,6 +107,7 @@ const INITIAL_FORM: FormState = {
   issueNumber: '',
   baseBranch: 'main',
   dryRun: false,
+  bypassCrewCache: false,
 }
 
 const WORKFLOW_ERROR_FALLBACK =
@@ -426,6 +432,7 @@ function App() {
           issue_number: Number(form.issueNumber),
           base_branch: form.baseBranch.trim(),
           dry_run: form.dryRun,
+          bypass_crew_cache: form.bypassCrewCache,
         },
         generatedRequestId,
       )
@@ -598,6 +605,17 @@ function App() {
               />
               <span>Dry run (não publicar alterações)</span>
             </label>
+            <label className="checkbox-row">
+              <input
+                type="checkbox"
+                name="bypass_crew_cache"
+                checked={form.bypassCrewCache}
+                onChange={(event) => {
+                  setForm((previous) => ({ ...previous, bypassCrewCache: event.target.checked }))
+                }}
+              />
+              <span>Ignorar cache do crew (gerar de novo)</span>
+            </label>
 
             <div className="button-row">
               <button type="submit" className="button button-primary" disabled={isSubmitting}>
@@ -677,6 +695,24 @@ function App() {
             </p>
           ) : null}
 
+          {workflowResult?.status === 'dry_run' && workflowResult.diffstat ? (
+            <div className="result-diff">
+              <ul className="result-diffstat">
+                {workflowResult.diffstat.map((entry) => (
+                  <li key={entry.path}>
+                    <code>{entry.path}</code> ({entry.status}){' '}
+                    <span className="result-diffstat__add">+{entry.additions}</span>{' '}
+                    <span className="result-diffstat__del">-{entry.deletions}</span>
+                  </li>
+                ))}
+              </ul>
+              {workflowResult.diff ? <pre className="result-diff__patch">{workflowResult.diff}</pre> : null}
+              {workflowResult.diff_truncated ? (
+                <p className="result-note">Diff truncado pelo limite do backend (DRY_RUN_DIFF_MAX_BYTES).</p>
+              ) : null}
+            </div>
+          ) : null}
+
           {requestError ? (
             <p className="result-note result-note--error">
               <strong>Error detail:</strong> {requestError || WORKFLOW_ERROR_FALLBACK}
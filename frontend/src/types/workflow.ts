@@ -4,6 +4,14 @@ export type RunWorkflowRequest = {
   issue_number: number
   base_branch?: string
   dry_run?: boolean
+  bypass_crew_cache?: boolean
+}
+
+export type DiffStatEntry = {
+  path: string
+  status: string
+  additions: number
+  deletions: number
 }
 
 export type RunWorkflowResponse = {
@@ -13,6 +21,9 @@ export type RunWorkflowResponse = {
   commit?: string | null
   pr_title?: string | null
   pr_url?: string | null
+  diff?: string | null
+  diffstat?: DiffStatEntry[] | null
+  diff_truncated?: boolean
 }
 
 export type RunWorkflowExecution = {